@@ -10,12 +10,22 @@ from flask import Flask, request, jsonify, send_from_directory
 from werkzeug.utils import secure_filename
 from werkzeug.security import generate_password_hash
 import os
+import json
+import base64
 import uuid
+from datetime import date, datetime
 import sqlite3
 import logging
-from translator import get_translation_service, translate_field, pre_translate_all_fields
+from translator import get_translation_service, translate_field, translate_fields_batch
+from translation_queue import enqueue_translation, get_translation_queue
 from auth import auth_bp
 from config import Config
+from migrations import ensure_schema
+import media as media_utils
+from lookups import get_lookups, invalidate_lookups
+from media_store import get_media_store
+from upload_sessions import UploadSessionError, get_upload_sessions
+from video_queue import enqueue_video, get_video_queue, is_video
 from flask_cors import CORS
 
 # Setup logging
@@ -27,7 +37,8 @@ CORS(app, resources={
     r"/*": {
         "origins": ["http://localhost:5173", "http://127.0.0.1:5173"],
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"]
+        "allow_headers": ["Content-Type", "Authorization"],
+        "expose_headers": ["X-Next-Cursor"]
     }
 })
 app.config['SECRET_KEY'] = Config.SECRET_KEY
@@ -41,15 +52,280 @@ def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def unique_upload_name(filename):
+    """Generate unique filename to avoid conflicts: '<name>_<8 hex chars><ext>'"""
+    name, ext = os.path.splitext(secure_filename(filename))
+    return f"{name}_{uuid.uuid4().hex[:8]}{ext}"
+
 app.register_blueprint(auth_bp)
 
+# Apply pending schema migrations once at start-up; an up-to-date database
+# costs a single PRAGMA read
+ensure_schema()
+
+# Keyset pagination and field projection shared by the list endpoints.
+# Without ?limit= or ?after= the endpoints keep returning the full list.
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+def parse_page_args():
+    """Read ?limit= and ?after= from the request
+    
+    The cursor is opaque to clients (see encode_cursor); it carries the sort value
+    of the last row, with its JSON type and NULL kept apart from '', and its id.
+    Raises ValueError if malformed. Returns (limit, (sort_value, id)), with None
+    for the cursor when ?after= is absent.
+    """
+    after = request.args.get('after')
+    limit = request.args.get('limit')
+    if limit is not None:
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    elif after is not None:
+        limit = DEFAULT_PAGE_SIZE
+    
+    cursor = None
+    if after is not None:
+        cursor = decode_cursor(after)
+    return limit, cursor
+
+def encode_cursor(sort_value, row_id):
+    """Opaque ?after= cursor: URL-safe base64 of the JSON [sort_value, id]"""
+    payload = json.dumps([sort_value, row_id], ensure_ascii=False, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(after):
+    """Inverse of encode_cursor. Raises ValueError if malformed."""
+    payload = base64.urlsafe_b64decode(after + '=' * (-len(after) % 4))
+    cursor = json.loads(payload.decode('utf-8'))
+    if (not isinstance(cursor, list) or len(cursor) != 2
+            or type(cursor[1]) is not int
+            or not (cursor[0] is None or type(cursor[0]) in (str, int, float))):
+        raise ValueError(f'Invalid cursor: {after}')
+    return cursor[0], cursor[1]
+
+def parse_fields():
+    """Read ?fields=a,b,c from the request; None means all fields"""
+    fields = request.args.get('fields')
+    if not fields:
+        return None
+    return {field.strip() for field in fields.split(',') if field.strip()}
+
+_table_columns = {}
+
+def table_columns(conn, table):
+    """Column names of a table or view, read once from the schema"""
+    if table not in _table_columns:
+        _table_columns[table] = tuple(row['name'] for row in conn.execute(f'PRAGMA table_info({table})'))
+    return _table_columns[table]
+
+def select_list(columns, fields, required=('id',), alias=None):
+    """SELECT list for ?fields=: the requested columns out of the whitelisted ones,
+    plus those the handler needs (id, sort key); '*' without ?fields=
+    
+    Unknown field names are ignored, as in the response projection.
+    """
+    if not fields:
+        return '*'
+    prefix = f'{alias}.' if alias else ''
+    return ', '.join(prefix + column for column in columns if column in fields or column in required)
+
+def list_response(rows, limit, cursor_for, fields=None):
+    """Serialize a page of rows, adding X-Next-Cursor when more rows may follow"""
+    if fields:
+        rows_out = [{key: value for key, value in row.items() if key in fields} for row in rows]
+    else:
+        rows_out = rows
+    response = jsonify(rows_out)
+    if limit and len(rows) == limit:
+        response.headers['X-Next-Cursor'] = cursor_for(rows[-1])
+    return response
+
+def id_cursor(row):
+    return encode_cursor(row['id'], row['id'])
+
+def id_keyset(column, cursor, conditions, params):
+    """Append the ascending primary-key keyset condition for an ?after= cursor"""
+    if cursor:
+        conditions.append(f'{column} > ?')
+        params.append(cursor[1])
+
+def build_list_query(base_query, conditions, order_by, limit):
+    query = base_query
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(conditions)
+    query += f' ORDER BY {order_by}'
+    if limit:
+        query += f' LIMIT {int(limit)}'
+    return query
+
+def bad_page_args():
+    return jsonify({'error': 'Invalid pagination parameters: use ?limit=<n>&after=<cursor>'}), 400
+
+# Server-side filtering and sorting of the list endpoints. Only the filters and
+# sort keys whitelisted per endpoint are accepted; each one compiles to a fixed,
+# parameterized condition on an indexed column.
+def parse_bool(value):
+    value = value.lower()
+    if value in ('true', '1', 'yes'):
+        return True
+    if value in ('false', '0', 'no'):
+        return False
+    raise ValueError(value)
+
+def parse_date(value):
+    """Validate a 'YYYY-MM-DD' date, returned as is since dates are stored as text"""
+    datetime.strptime(value, '%Y-%m-%d')
+    return value
+
+def birth_limit(years):
+    """Birth date of a child turning `years` old today, as 'YYYY-MM-DD'"""
+    today = date.today()
+    try:
+        return today.replace(year=today.year - years).isoformat()
+    except ValueError:  # 29 February
+        return today.replace(year=today.year - years, day=28).isoformat()
+
+def apply_filters(filters, conditions, params):
+    """Append the conditions of the whitelisted ?<filter>= arguments
+    
+    filters maps each accepted argument to (condition, parse): condition is an
+    SQL snippet with one '?' for the parsed value, or a callable returning the
+    snippet for a value it consumes itself (e.g. a boolean). Raises ValueError
+    if a value does not parse.
+    """
+    for name, (condition, parse) in filters.items():
+        raw = request.args.get(name)
+        if raw is None or raw == '':
+            continue
+        value = parse(raw)
+        if callable(condition):
+            conditions.append(condition(value))
+        else:
+            conditions.append(condition)
+            params.append(value)
+
+def parse_sort(sorts, default):
+    """Read ?sort=<key> (ascending) or ?sort=-<key> (descending)
+    
+    sorts maps each accepted key to (column, row field, inverted): the row field
+    is the column as it appears in the result, used for the cursor, and inverted
+    keys order the column the other way (age sorts by birth date). Returns
+    (column, row field, descending). Raises ValueError on an unknown key.
+    """
+    sort = request.args.get('sort') or default
+    descending = sort.startswith('-')
+    column, field, inverted = sorts[sort.lstrip('-')]
+    return column, field, descending != inverted
+
+def sort_keyset(column, descending, cursor, conditions, params, id_column):
+    """Append the keyset condition that resumes ORDER BY column, id after an ?after= cursor
+    
+    NULL sorts first ascending and last descending, as SQLite orders it.
+    """
+    if not cursor:
+        return
+    value, row_id = cursor
+    op = '<' if descending else '>'
+    if column == id_column:
+        conditions.append(f'{id_column} {op} ?')
+        params.append(row_id)
+    elif value is None:
+        condition = f'({column} IS NULL AND {id_column} {op} ?)'
+        if not descending:
+            condition = f'({condition} OR {column} IS NOT NULL)'
+        conditions.append(condition)
+        params.append(row_id)
+    else:
+        condition = f'({column} {op} ? OR ({column} = ? AND {id_column} {op} ?)'
+        condition += f' OR {column} IS NULL)' if descending else ')'
+        conditions.append(condition)
+        params.extend([value, value, row_id])
+
+def sort_order(column, descending, id_column):
+    direction = ' DESC' if descending else ''
+    if column == id_column:
+        return f'{id_column}{direction}'
+    return f'{column}{direction}, {id_column}{direction}'
+
+def sort_cursor(field):
+    """Cursor function for rows sorted by field"""
+    if field == 'id':
+        return id_cursor
+    return lambda row: encode_cursor(row[field], row['id'])
+
+def bad_filter_args():
+    return jsonify({'error': 'Invalid filter or sort parameters'}), 400
+
+# Localized list responses: with ?lang=<code> the translatable fields are
+# replaced by their stored translations, read with one bulk lookup per list
+def parse_lang():
+    """Read ?lang= from the request; None means the original texts. Raises ValueError if unsupported."""
+    lang = request.args.get('lang')
+    if not lang:
+        return None
+    if lang not in get_translation_service().SUPPORTED_LANGUAGES:
+        raise ValueError(lang)
+    return lang
+
+def localize_rows(rows, entity_type, lang):
+    """Replace the translatable fields of rows with their translations in lang
+    
+    Fields that have not been translated yet keep their original text.
+    """
+    if not lang or not rows:
+        return rows
+    service = get_translation_service()
+    # Only the fields the rows carry (?fields= may have left some out)
+    field_names = [field_name for field_name in service.SUPPORTED_FIELDS[entity_type] if field_name in rows[0]]
+    if not field_names:
+        return rows
+    translations = service.get_cached_translations_many(entity_type, [row['id'] for row in rows], field_names, lang)
+    for row in rows:
+        for field_name in field_names:
+            translated = translations.get((row['id'], field_name))
+            if translated is not None:
+                row[field_name] = translated
+    return rows
+
+def bad_lang():
+    return jsonify({'error': 'Unsupported language: use ?lang=en, it or ta'}), 400
+
 # GET endpoints for all main tables
+# Every users column except the password hash
+USER_COLUMNS = ('id', 'username', 'role', 'photo', 'email', 'phone', 'full_name', 'bio', 'ui_language')
+
+USER_FILTERS = {
+    'role': ('role = ?', str),
+}
+# sort key: (column, row field, inverted)
+USER_SORTS = {
+    'id': ('id', 'id', False),
+    'username': ('username', 'username', False),
+    'full_name': ('full_name', 'full_name', False),
+    'role': ('role', 'role', False),
+}
+
 @app.route('/users', methods=['GET'])
 def get_users():
+    try:
+        limit, cursor = parse_page_args()
+    except ValueError:
+        return bad_page_args()
+    
+    conditions, params = [], []
+    try:
+        apply_filters(USER_FILTERS, conditions, params)
+        sort_column, sort_field, descending = parse_sort(USER_SORTS, 'id')
+    except (KeyError, ValueError):
+        return bad_filter_args()
+    sort_keyset(sort_column, descending, cursor, conditions, params, 'id')
+    fields = parse_fields()
     conn = get_db_connection()
-    users = conn.execute('SELECT * FROM users').fetchall()
+    columns = select_list(USER_COLUMNS, fields or USER_COLUMNS, ('id', sort_field))
+    users = conn.execute(build_list_query(f'SELECT {columns} FROM users', conditions,
+                                          sort_order(sort_column, descending, 'id'), limit), params).fetchall()
     conn.close()
-    return jsonify([dict(u) for u in users])
+    return list_response([dict(u) for u in users], limit, sort_cursor(sort_field), fields)
 
 # CRUD endpoints for Users
 @app.route('/users', methods=['POST'])
@@ -78,6 +354,7 @@ def create_user():
         print(f"Created user with ID: {user_id}")
         
         conn.commit()
+        invalidate_lookups()
         
         # Return the created user (without password)
         new_user = cursor.execute('SELECT id, username, role, email, phone, photo, full_name FROM users WHERE id = ?', (user_id,)).fetchone()
@@ -159,6 +436,7 @@ def update_user(user_id):
             return jsonify({'error': 'User not found'}), 404
         
         conn.commit()
+        invalidate_lookups()
         
         # Return the updated user (without password)
         updated_user = cursor.execute('SELECT id, username, role, email, phone, photo, full_name, bio, ui_language FROM users WHERE id = ?', (user_id,)).fetchone()
@@ -189,6 +467,7 @@ def delete_user(user_id):
             return jsonify({'error': 'User not found'}), 404
         
         conn.commit()
+        invalidate_lookups()
         conn.close()
         
         print(f"User with ID {user_id} deleted successfully")
@@ -200,6 +479,11 @@ def delete_user(user_id):
 
 @app.route('/missions', methods=['GET'])
 def get_missions():
+    try:
+        lang = parse_lang()
+    except ValueError:
+        return bad_lang()
+    
     conn = get_db_connection()
     # Join with users table to get referent information
     missions = conn.execute('''
@@ -208,7 +492,32 @@ def get_missions():
         LEFT JOIN users u ON m.referent_id = u.id
     ''').fetchall()
     conn.close()
-    return jsonify([dict(m) for m in missions])
+    return jsonify(localize_rows([dict(m) for m in missions], 'mission', lang))
+
+def enriched_child(row):
+    """Dict of a children_enriched row; SQLite has no boolean type, JSON wants one"""
+    child = dict(row)
+    if 'is_sponsored' in child:
+        child['is_sponsored'] = bool(child['is_sponsored'])
+    return child
+
+CHILDREN_FILTERS = {
+    'mission_id': ('c.mission_id = ?', int),
+    'sponsor_id': ('c.sponsor_id = ?', int),
+    'gender': ('c.gender = ?', str),
+    'sponsored': (lambda sponsored: 'c.sponsor_id IS NOT NULL' if sponsored else 'c.sponsor_id IS NULL', parse_bool),
+    # Age bounds become birth date bounds, so they use the birth index
+    'age_min': ('c.birth <= ?', lambda age: birth_limit(int(age))),
+    'age_max': ('c.birth > ?', lambda age: birth_limit(int(age) + 1)),
+    'birth_from': ('c.birth >= ?', parse_date),
+    'birth_to': ('c.birth <= ?', parse_date),
+}
+CHILDREN_SORTS = {
+    'id': ('c.id', 'id', False),
+    'name': ('c.name', 'name', False),
+    'birth': ('c.birth', 'birth', False),
+    'age': ('c.birth', 'birth', True),
+}
 
 @app.route('/children', methods=['GET'])
 def get_children():
@@ -216,70 +525,105 @@ def get_children():
     # For now, we'll add user_id and role as query parameters for testing
     user_id = request.args.get('user_id', type=int)
     user_role = request.args.get('user_role', 'admin')  # Default to admin for testing
-    
-    conn = get_db_connection()
-    
-    # Base query with all joins
-    base_query = '''
-        SELECT c.*, 
-               m.name as mission_name, 
-               u.username as referent_username,
-               u.email as referent_email,
-               s.username as sponsor_username,
-               s.email as sponsor_email
-        FROM children c
-        LEFT JOIN missions m ON c.mission_id = m.id
-        LEFT JOIN users u ON m.referent_id = u.id
-        LEFT JOIN users s ON c.sponsor_id = s.id
-    '''
+    try:
+        limit, cursor = parse_page_args()
+    except ValueError:
+        return bad_page_args()
+    try:
+        lang = parse_lang()
+    except ValueError:
+        return bad_lang()
     
     # Apply role-based filtering
+    conditions, params = [], []
     if user_role == 'sponsor' and user_id:
         # Sponsors see only children they sponsor
-        query = base_query + '''
-            WHERE s.id = ?
-        '''
-        children = conn.execute(query, (user_id,)).fetchall()
+        conditions.append('c.sponsor_id = ?')
+        params.append(user_id)
     elif user_role == 'localReferent' and user_id:
         # Referents see only children in their missions
-        query = base_query + '''
-            WHERE u.id = ?
-        '''
-        children = conn.execute(query, (user_id,)).fetchall()
-    else:
-        # Admins see all children
-        children = conn.execute(base_query).fetchall()
+        conditions.append('c.referent_id = ?')
+        params.append(user_id)
+    # Admins see all children
     
-    conn.close()
+    try:
+        apply_filters(CHILDREN_FILTERS, conditions, params)
+        sort_column, sort_field, descending = parse_sort(CHILDREN_SORTS, 'id')
+    except (KeyError, ValueError):
+        return bad_filter_args()
+    sort_keyset(sort_column, descending, cursor, conditions, params, 'c.id')
     
-    # Calculate age in years for each child
-    from datetime import datetime
-    children_list = []
-    for child in children:
-        child_dict = dict(child)
-        if child_dict['birth']:
-            birth_date = datetime.strptime(child_dict['birth'], '%Y-%m-%d')
-            today = datetime.now()
-            age = today.year - birth_date.year
-            if today.month < birth_date.month or (today.month == birth_date.month and today.day < birth_date.day):
-                age -= 1
-            child_dict['age'] = max(0, age)
-        else:
-            child_dict['age'] = 0
-        
-        # Add sponsorship status
-        child_dict['is_sponsored'] = child_dict['sponsor_id'] is not None
-        
-        children_list.append(child_dict)
+    # Mission, referent, sponsor, age and sponsorship come from the view
+    fields = parse_fields()
+    conn = get_db_connection()
+    columns = select_list(table_columns(conn, 'children_enriched'), fields, ('id', sort_field), 'c')
+    children = conn.execute(build_list_query(f'SELECT {columns} FROM children_enriched c', conditions,
+                                             sort_order(sort_column, descending, 'c.id'), limit), params).fetchall()
+    conn.close()
     
-    return jsonify(children_list)
+    children_list = [enriched_child(child) for child in children]
+    localize_rows(children_list, 'children', lang)
+    return list_response(children_list, limit, sort_cursor(sort_field), fields)
 
 @app.route('/sponsors', methods=['GET'])
 def get_sponsors():
+    try:
+        limit, cursor = parse_page_args()
+    except ValueError:
+        return bad_page_args()
+    
+    conditions, params = [], []
+    id_keyset('id', cursor, conditions, params)
+    fields = parse_fields()
     conn = get_db_connection()
-    sponsors = conn.execute('SELECT * FROM sponsors').fetchall()
+    columns = select_list(table_columns(conn, 'sponsors'), fields)
+    sponsors = conn.execute(build_list_query(f'SELECT {columns} FROM sponsors', conditions, 'id', limit), params).fetchall()
     conn.close()
-    return jsonify([dict(s) for s in sponsors])
+    return list_response([dict(s) for s in sponsors], limit, id_cursor, fields)
+
+# Reference data for form dropdowns: id/label pairs for users by role, missions
+# and children, cached in memory until a write invalidates it. The version is
+# also the ETag, so an unchanged payload is revalidated with a 304.
+@app.route('/lookups', methods=['GET'])
+def get_lookups_endpoint():
+    version, payload = get_lookups()
+    response = jsonify(payload)
+    response.set_etag(version)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+def fetch_news_media(conn, news_ids):
+    """Return {news_id: [media, ...]} for all given news ids in a single query"""
+    # The ids are passed as one JSON array parameter, so the query does not
+    # hit SQLite's bound-parameter limit however many news rows are requested
+    # SELECT * so the video renditions (web_path, poster_path) come along once the
+    # video queue has added them
+    rows = conn.execute('''
+        SELECT *
+        FROM news_media
+        WHERE news_id IN (SELECT value FROM json_each(?))
+        ORDER BY news_id, media_order
+    ''', (json.dumps(news_ids),)).fetchall()
+    
+    media_by_news = {}
+    for row in rows:
+        media = dict(row)
+        media.pop('id', None)
+        media_by_news.setdefault(media.pop('news_id'), []).append(media)
+    return media_by_news
+
+NEWS_FILTERS = {
+    'child_id': ('n.child_id = ?', int),
+    'mission_id': ('n.mission_id = ?', int),
+    'created_by': ('n.created_by = ?', int),
+    'date_from': ('n.date >= ?', parse_date),
+    'date_to': ('n.date <= ?', parse_date),
+}
+NEWS_SORTS = {
+    'id': ('n.id', 'id', False),
+    'created_at': ('n.created_at', 'created_at', False),
+    'date': ('n.date', 'date', False),
+}
 
 @app.route('/news', methods=['GET'])
 def get_news():
@@ -287,73 +631,334 @@ def get_news():
     # For now, we'll add user_id and role as query parameters for testing
     user_id = request.args.get('user_id', type=int)
     user_role = request.args.get('user_role', 'admin')  # Default to admin for testing
+    fields = parse_fields()
+    try:
+        limit, cursor = parse_page_args()
+    except ValueError:
+        return bad_page_args()
+    try:
+        lang = parse_lang()
+    except ValueError:
+        return bad_lang()
+    
+    # Apply role-based filtering
+    conditions, params = [], []
+    if user_role == 'sponsor' and user_id:
+        # Sponsors see only news about children they sponsor
+        conditions.append('n.child_id IN (SELECT child_id FROM sponsor_children WHERE sponsor_id = ?)')
+        params.append(user_id)
+    elif user_role == 'referent' and user_id:
+        # Referents see only news from children of their missions
+        conditions.append('n.mission_referent_id = ?')
+        params.append(user_id)
+    # Admins see all news
+    
+    # Newest first by default; rows without created_at sort last
+    try:
+        apply_filters(NEWS_FILTERS, conditions, params)
+        sort_column, sort_field, descending = parse_sort(NEWS_SORTS, '-created_at')
+    except (KeyError, ValueError):
+        return bad_filter_args()
+    sort_keyset(sort_column, descending, cursor, conditions, params, 'n.id')
     
+    # Child, mission, referent (through child -> mission -> referent) and the
+    # creator / updater details come from the view
     conn = get_db_connection()
+    columns = select_list(table_columns(conn, 'news_enriched'), fields, ('id', sort_field), 'n')
+    query = build_list_query(f'SELECT {columns} FROM news_enriched n', conditions,
+                             sort_order(sort_column, descending, 'n.id'), limit)
+    news = conn.execute(query, params).fetchall()
+    
+    # Get media files for all news items in one batched query (skipped if not requested)
+    result = [dict(item) for item in news]
+    if fields is None or 'media' in fields:
+        media_by_news = fetch_news_media(conn, [news_dict['id'] for news_dict in result])
+        for news_dict in result:
+            news_dict['media'] = media_by_news.get(news_dict['id'], [])
     
-    # Base query with all joins to get referent, child information, and creator details
-    # Referent is dynamically retrieved through child->mission->referent chain for maximum consistency
-    base_query = '''
-        SELECT n.*, 
-               ref.username as referent_username,
-               ref.email as referent_email,
-               c.name as child_name,
-               m.name as mission_name,
-               creator.username as created_by_username,
-               creator.email as created_by_email,
-               creator.role as created_by_role,
-               updater.username as updated_by_username,
-               updater.email as updated_by_email,
-               updater.role as updated_by_role
+    conn.close()
+    localize_rows(result, 'news', lang)
+    return list_response(result, limit, sort_cursor(sort_field), fields)
+
+# Detail endpoints: one entity with its relations embedded, read by primary key
+# with a fixed number of indexed queries whatever the size of the tables
+RECENT_NEWS_LIMIT = 5
+DETAIL_MEDIA_LIMIT = 50
+DETAIL_CHILDREN_LIMIT = 100
+
+def pop_embedded(row, prefix, fields):
+    """Move the '<prefix>__<field>' columns of row into a nested dict (None if all are NULL)"""
+    embedded = {field: row.pop(f'{prefix}__{field}') for field in fields}
+    return embedded if any(value is not None for value in embedded.values()) else None
+
+def person_info(info):
+    """Add a display name to an embedded user (full name, falling back to the username)"""
+    if info is not None:
+        info['name'] = info.pop('full_name') or info['username']
+    return info
+
+def fetch_recent_news(conn, condition, params, limit=RECENT_NEWS_LIMIT):
+    """Latest news matching condition (on n = news, c = children), newest first"""
+    rows = conn.execute(f'''
+        SELECT n.id, n.title, n.content, n.date, n.created_at, n.child_id, c.name as child_name
         FROM news n
         LEFT JOIN children c ON n.child_id = c.id
+        WHERE {condition}
+        ORDER BY n.created_at DESC, n.id DESC
+        LIMIT ?
+    ''', [*params, limit]).fetchall()
+    return [dict(row) for row in rows]
+
+@app.route('/children/<int:child_id>', methods=['GET'])
+def get_child(child_id):
+    try:
+        lang = parse_lang()
+    except ValueError:
+        return bad_lang()
+    
+    conn = get_db_connection()
+    child = conn.execute('''
+        SELECT c.*,
+               m.id as mission__id, m.name as mission__name,
+               m.description as mission__description, m.photo as mission__photo,
+               u.id as referent__id, u.username as referent__username, u.full_name as referent__full_name,
+               u.email as referent__email, u.phone as referent__phone,
+               s.id as sponsor__id, s.username as sponsor__username, s.full_name as sponsor__full_name,
+               s.email as sponsor__email, s.phone as sponsor__phone,
+               (SELECT MAX(id) FROM children WHERE id < c.id) as previous_id,
+               (SELECT MIN(id) FROM children WHERE id > c.id) as next_id
+        FROM children_enriched c
         LEFT JOIN missions m ON c.mission_id = m.id
-        LEFT JOIN users ref ON m.referent_id = ref.id
-        LEFT JOIN users creator ON n.created_by = creator.id
-        LEFT JOIN users updater ON n.updated_by = updater.id
-    '''
+        LEFT JOIN users u ON c.referent_id = u.id
+        LEFT JOIN users s ON c.sponsor_id = s.id
+        WHERE c.id = ?
+    ''', (child_id,)).fetchone()
+    if child is None:
+        conn.close()
+        return jsonify({'error': 'Child not found'}), 404
     
-    # Apply role-based filtering
-    if user_role == 'sponsor' and user_id:
-        # Sponsors see only news about children they sponsor
-        query = base_query + '''
-            WHERE c.id IN (
-                SELECT child_id FROM sponsor_children WHERE sponsor_id = ?
-            )
-            ORDER BY n.created_at DESC
-        '''
-        news = conn.execute(query, (user_id,)).fetchall()
-    elif user_role == 'referent' and user_id:
-        # Referents see only news from children of their missions
-        query = base_query + '''
-            WHERE m.referent_id = ?
-            ORDER BY n.created_at DESC
-        '''
-        news = conn.execute(query, (user_id,)).fetchall()
-    else:
-        # Admins see all news
-        query = base_query + '''
-            ORDER BY n.created_at DESC
-        '''
-        news = conn.execute(query).fetchall()
-    
-    # Get media files for each news item
-    result = []
-    for item in news:
-        news_dict = dict(item)
-        
-        # Get media files for this news item
-        media_files = conn.execute('''
-            SELECT media_path, media_type, description, media_order
-            FROM news_media 
-            WHERE news_id = ? 
-            ORDER BY media_order
-        ''', (news_dict['id'],)).fetchall()
-        
-        news_dict['media'] = [dict(media) for media in media_files]
-        result.append(news_dict)
+    child = enriched_child(child)
+    child['mission_info'] = pop_embedded(child, 'mission', ('id', 'name', 'description', 'photo'))
+    child['referent_info'] = person_info(pop_embedded(child, 'referent', ('id', 'username', 'full_name', 'email', 'phone')))
+    child['sponsor_info'] = person_info(pop_embedded(child, 'sponsor', ('id', 'username', 'full_name', 'email', 'phone')))
+    
+    # Photos and videos of the news about this child, newest first
+    media = conn.execute('''
+        SELECT nm.*
+        FROM news n
+        JOIN news_media nm ON nm.news_id = n.id
+        WHERE n.child_id = ?
+        ORDER BY n.created_at DESC, n.id DESC, nm.media_order
+        LIMIT ?
+    ''', (child_id, DETAIL_MEDIA_LIMIT)).fetchall()
+    child['media'] = [{key: row[key] for key in row.keys() if key != 'id'} for row in media]
+    child['recent_news'] = fetch_recent_news(conn, 'n.child_id = ?', (child_id,))
+    conn.close()
+    
+    localize_rows([child], 'children', lang)
+    if child['mission_info']:
+        localize_rows([child['mission_info']], 'mission', lang)
+    localize_rows(child['recent_news'], 'news', lang)
+    return jsonify(child)
+
+@app.route('/news/<int:news_id>', methods=['GET'])
+def get_news_item(news_id):
+    try:
+        lang = parse_lang()
+    except ValueError:
+        return bad_lang()
+    
+    conn = get_db_connection()
+    news = conn.execute('''
+        SELECT n.*,
+               c.id as child__id, c.name as child__name, c.photo as child__photo, c.birth as child__birth,
+               c.gender as child__gender, c.description as child__description, c.sponsor_id as child__sponsor_id,
+               m.id as mission__id, m.name as mission__name, m.photo as mission__photo,
+               ref.id as referent__id, ref.username as referent__username, ref.full_name as referent__full_name,
+               ref.email as referent__email, ref.phone as referent__phone
+        FROM news_enriched n
+        LEFT JOIN children c ON n.child_id = c.id
+        LEFT JOIN missions m ON n.mission_id = m.id
+        LEFT JOIN users ref ON n.mission_referent_id = ref.id
+        WHERE n.id = ?
+    ''', (news_id,)).fetchone()
+    if news is None:
+        conn.close()
+        return jsonify({'error': 'News not found'}), 404
+    
+    news = dict(news)
+    news['child_info'] = pop_embedded(news, 'child', ('id', 'name', 'photo', 'birth', 'gender', 'description', 'sponsor_id'))
+    news['mission_info'] = pop_embedded(news, 'mission', ('id', 'name', 'photo'))
+    news['referent_info'] = person_info(pop_embedded(news, 'referent', ('id', 'username', 'full_name', 'email', 'phone')))
+    news['media'] = fetch_news_media(conn, [news_id]).get(news_id, [])
+    # Other news about the same child
+    news['recent_news'] = fetch_recent_news(conn, 'n.child_id = ? AND n.id != ?', (news['child_id'], news_id)) \
+        if news['child_id'] is not None else []
+    conn.close()
+    
+    localize_rows([news], 'news', lang)
+    if news['child_info']:
+        localize_rows([news['child_info']], 'children', lang)
+    localize_rows(news['recent_news'], 'news', lang)
+    return jsonify(news)
+
+@app.route('/missions/<int:mission_id>', methods=['GET'])
+def get_mission(mission_id):
+    try:
+        lang = parse_lang()
+    except ValueError:
+        return bad_lang()
+    
+    conn = get_db_connection()
+    mission = conn.execute('''
+        SELECT m.*, u.username as referent_username, u.email as referent_email,
+               u.id as referent__id, u.username as referent__username, u.full_name as referent__full_name,
+               u.email as referent__email, u.phone as referent__phone
+        FROM missions m
+        LEFT JOIN users u ON m.referent_id = u.id
+        WHERE m.id = ?
+    ''', (mission_id,)).fetchone()
+    if mission is None:
+        conn.close()
+        return jsonify({'error': 'Mission not found'}), 404
+    
+    mission = dict(mission)
+    mission['referent_info'] = person_info(pop_embedded(mission, 'referent', ('id', 'username', 'full_name', 'email', 'phone')))
+    
+    # First children of the mission, with the total count computed in the same query
+    children = [enriched_child(row) for row in conn.execute('''
+        SELECT id, name, photo, birth, gender, sponsor_id, age, is_sponsored, COUNT(*) OVER () as total
+        FROM children_enriched
+        WHERE mission_id = ?
+        ORDER BY id
+        LIMIT ?
+    ''', (mission_id, DETAIL_CHILDREN_LIMIT)).fetchall()]
+    mission['children_count'] = children[0]['total'] if children else 0
+    for child in children:
+        del child['total']
+    mission['children'] = children
+    
+    mission['recent_news'] = fetch_recent_news(conn, 'c.mission_id = ?', (mission_id,))
+    media_by_news = fetch_news_media(conn, [news['id'] for news in mission['recent_news']])
+    mission['media'] = [media for news in mission['recent_news'] for media in media_by_news.get(news['id'], [])]
+    conn.close()
+    
+    localize_rows([mission], 'mission', lang)
+    localize_rows(mission['children'], 'children', lang)
+    localize_rows(mission['recent_news'], 'news', lang)
+    return jsonify(mission)
+
+# Full-text search over the FTS5 indexes of migration 7: original texts and
+# every stored translation, ranked by bm25 (titles and names weigh double)
+SEARCH_PAGE_SIZE = 20
+MAX_SEARCH_PAGE_SIZE = 100
+
+# result type: (fts table, bm25 weights, translations entity_type, summary query)
+SEARCH_TYPES = {
+    'news': ('news_fts', '2.0, 1.0', 'news', '''
+        SELECT n.id, n.title, n.content, n.date, n.child_id, c.name as child_name
+        FROM news n LEFT JOIN children c ON n.child_id = c.id
+        WHERE n.id IN (SELECT value FROM json_each(?))
+    '''),
+    'children': ('children_fts', '2.0, 1.0', 'children', '''
+        SELECT c.id, c.name, c.description, c.photo, c.mission_id, m.name as mission_name
+        FROM children c LEFT JOIN missions m ON c.mission_id = m.id
+        WHERE c.id IN (SELECT value FROM json_each(?))
+    '''),
+    'missions': ('missions_fts', '2.0, 1.0', 'mission', '''
+        SELECT id, name, description, photo
+        FROM missions
+        WHERE id IN (SELECT value FROM json_each(?))
+    '''),
+}
+SEARCH_LOCALIZED_AS = {'news': 'news', 'children': 'children', 'missions': 'mission'}
+
+def fts_match_query(text):
+    """FTS5 query matching every word of text as a prefix (Tamil words carry their suffixes)"""
+    terms = []
+    for word in text.split():
+        word = word.replace('"', '""')
+        # One-letter prefixes would expand to most of the vocabulary
+        terms.append(f'"{word}"*' if len(word) > 1 else f'"{word}"')
+    return ' '.join(terms)
+
+@app.route('/search', methods=['GET'])
+def search():
+    text = request.args.get('q', '').strip()
+    if not text:
+        return jsonify({'error': 'Missing search query: use ?q=<text>'}), 400
+    types = request.args.get('types')
+    types = [t.strip() for t in types.split(',') if t.strip()] if types else list(SEARCH_TYPES)
+    if any(t not in SEARCH_TYPES for t in types):
+        return jsonify({'error': f"Unsupported search type: use ?types= with {', '.join(SEARCH_TYPES)}"}), 400
+    try:
+        limit = max(1, min(int(request.args.get('limit', SEARCH_PAGE_SIZE)), MAX_SEARCH_PAGE_SIZE))
+        # The cursor is the number of results already returned: bm25 ranks are not a stable key
+        offset = max(0, int(request.args.get('after', 0)))
+    except ValueError:
+        return bad_page_args()
+    try:
+        lang = parse_lang()
+    except ValueError:
+        return bad_lang()
+    
+    # Each index only contributes its best offset + limit matches, so the merge
+    # below never groups more rows than that per index
+    match = fts_match_query(text)
+    branches, params = [], []
+    for result_type in types:
+        fts, weights, translated_type, _ = SEARCH_TYPES[result_type]
+        branches.append(f"SELECT * FROM (SELECT '{result_type}' as type, rowid as id, bm25({fts}, {weights}) as rank "
+                        f"FROM {fts} WHERE {fts} MATCH ? ORDER BY rank LIMIT ?)")
+        # Translations outlive their entity, so orphans are skipped before the
+        # branch limit and cannot push live matches out of the page
+        branches.append(f"SELECT * FROM (SELECT '{result_type}', entity_id, bm25(translations_fts) as rank "
+                        f"FROM translations_fts WHERE translations_fts MATCH ? AND entity_type = ? "
+                        f"AND entity_id IN (SELECT id FROM {result_type}) ORDER BY rank LIMIT ?)")
+        params.extend([match, offset + limit, match, translated_type, offset + limit])
+    
+    conn = get_db_connection()
+    try:
+        hits = conn.execute(f'''
+            SELECT type, id, MIN(rank) as rank
+            FROM ({' UNION ALL '.join(branches)})
+            GROUP BY type, id
+            ORDER BY rank, type, id
+            LIMIT ? OFFSET ?
+        ''', params + [limit, offset]).fetchall()
+    except sqlite3.OperationalError:
+        conn.close()
+        return jsonify({'error': 'Invalid search query'}), 400
     
+    # One summary query per result type present in the page
+    summaries = {}
+    for result_type in {hit['type'] for hit in hits}:
+        ids = [hit['id'] for hit in hits if hit['type'] == result_type]
+        rows = [dict(row) for row in conn.execute(SEARCH_TYPES[result_type][3], (json.dumps(ids),)).fetchall()]
+        localize_rows(rows, SEARCH_LOCALIZED_AS[result_type], lang)
+        summaries.update({(result_type, row['id']): row for row in rows})
     conn.close()
-    return jsonify(result)
+    
+    results = []
+    for hit in hits:
+        summary = summaries.get((hit['type'], hit['id']))
+        if summary is not None:  # stale index entry of a deleted row
+            results.append({'type': hit['type'], 'rank': hit['rank'], **summary})
+    response = jsonify(results)
+    if len(hits) == limit:
+        response.headers['X-Next-Cursor'] = str(offset + limit)
+    return response
+
+
+def queue_news_videos(media_files):
+    """Queue the video processing of the videos attached to a news post"""
+    for media in media_files:
+        media_path = media.get('path') or media.get('media_path')
+        if media_path and is_video(media_path):
+            try:
+                enqueue_video(media_path)
+            except Exception as e:
+                print(f"Warning: Could not queue video processing for {media_path}: {e}")
 
 
 # CRUD endpoints for News
@@ -416,26 +1021,29 @@ def create_news():
         
         conn.commit()
         
-        # Pre-translate news fields for multilingual support
+        # Queue transcoding of the videos (renditions already made are applied at once)
+        queue_news_videos(media_files)
+        
+        # Queue pre-translation of news fields for multilingual support
+        translation_job_id = None
         if news_id:
             try:
-                print(f"Pre-translating news fields for news ID: {news_id}")
                 news_data = {
                     'title': data['title'],
                     'content': data['content']
                 }
                 # Use UI language as source language (fallback to 'en' if not provided)
                 source_language = data.get('ui_language', 'en')
-                print(f"Using source language: {source_language}")
-                pre_translate_all_fields('news', news_id, news_data, source_language)
-                print("Pre-translation completed successfully")
+                translation_job_id = enqueue_translation('news', news_id, news_data, source_language)
+                print(f"Queued pre-translation job {translation_job_id} for news ID: {news_id}")
             except Exception as translate_error:
-                print(f"Warning: Pre-translation failed: {translate_error}")
+                print(f"Warning: Could not queue pre-translation: {translate_error}")
                 # Non interrompiamo il processo se la traduzione fallisce
         
         conn.close()
         print("News created successfully")
-        return jsonify({'message': 'News created successfully', 'id': news_id}), 201
+        return jsonify({'message': 'News created successfully', 'id': news_id,
+                        'translation_job_id': translation_job_id}), 201
     except Exception as e:
         print(f"Error creating news: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -486,14 +1094,6 @@ def update_news(news_id):
         for file_path in files_to_delete:
             cursor.execute('DELETE FROM news_media WHERE news_id = ? AND media_path = ?', 
                            (news_id, file_path))
-            # Also delete physical file
-            try:
-                import os
-                upload_folder = 'uploads'
-                os.remove(os.path.join(upload_folder, file_path))
-                print(f"Deleted orphaned file: {file_path}")
-            except OSError as e:
-                print(f"Could not delete file {file_path}: {e}")
         
         # Add only truly new media files or update existing ones
         for i, media in enumerate(media_files):
@@ -546,20 +1146,24 @@ def update_news(news_id):
         
         conn.commit()
         
+        # Queue transcoding of the videos (renditions already made are applied at once)
+        queue_news_videos(media_files)
+        
+        # Also release the stored files, now that the rows are gone (the media store
+        # writes through its own connection; the blob goes when no other file uses it)
+        for file_path in files_to_delete:
+            try:
+                get_video_queue().release_renditions(file_path)
+                get_media_store().release(file_path)
+                media_utils.delete_variants(get_media_store().upload_folder, file_path)
+                print(f"Deleted orphaned file: {file_path}")
+            except OSError as e:
+                print(f"Could not delete file {file_path}: {e}")
+        
         # Re-translate news fields for multilingual support when content is updated
         try:
-            print(f"Re-translating news fields for news ID: {news_id}")
-            
             # Clear old translations for this news item
-            service = get_translation_service()
-            conn_trans = sqlite3.connect(service.db_path)
-            cursor_trans = conn_trans.cursor()
-            cursor_trans.execute('''
-                DELETE FROM translations 
-                WHERE entity_type = 'news' AND entity_id = ?
-            ''', (news_id,))
-            conn_trans.commit()
-            conn_trans.close()
+            get_translation_service().delete_entity_translations('news', news_id)
             print(f"Cleared old translations for news ID: {news_id}")
             
             news_data = {
@@ -568,18 +1172,18 @@ def update_news(news_id):
             }
             # Use UI language as source language (fallback to 'en' if not provided)
             source_language = data.get('ui_language', 'en')
-            print(f"Using source language: {source_language}")
-            pre_translate_all_fields('news', news_id, news_data, source_language)
-            print("News update pre-translation completed successfully")
+            translation_job_id = enqueue_translation('news', news_id, news_data, source_language)
+            print(f"Queued re-translation job {translation_job_id} for news ID: {news_id}")
         except Exception as translate_error:
-            print(f"Warning: News update pre-translation failed: {translate_error}")
+            translation_job_id = None
+            print(f"Warning: Could not queue news update re-translation: {translate_error}")
             # Non interrompiamo il processo se la traduzione fallisce
         
         # Commit all changes at the end
         conn.commit()
         print(f"All changes committed successfully for news ID: {news_id}")
         conn.close()
-        return jsonify({'message': 'News updated successfully'})
+        return jsonify({'message': 'News updated successfully', 'translation_job_id': translation_job_id})
     except Exception as e:
         print(f"Error in update_news: {str(e)}")
         import traceback
@@ -620,8 +1224,10 @@ def create_child():
         
         child_id = cursor.lastrowid
         conn.commit()
+        invalidate_lookups()
         
-        # Pre-translate children fields for multilingual support if child was created successfully
+        # Queue pre-translation of children fields for multilingual support if child was created successfully
+        translation_job_id = None
         if child_id and (data.get('name') or data.get('description')):
             try:
                 # Get the source language from the request or detect from user preference
@@ -633,14 +1239,15 @@ def create_child():
                 if data.get('description'):
                     child_data['description'] = data['description']
                     
-                pre_translate_all_fields('children', child_id, child_data, source_language)
-                logger.info(f"Pre-translated children fields for new child {child_id}")
+                translation_job_id = enqueue_translation('children', child_id, child_data, source_language)
+                logger.info(f"Queued pre-translation job {translation_job_id} for new child {child_id}")
             except Exception as translation_error:
-                logger.warning(f"Translation failed for new child {child_id}: {translation_error}")
+                logger.warning(f"Could not queue translation for new child {child_id}: {translation_error}")
                 # Continue without failing the creation
         
         conn.close()
-        return jsonify({'message': 'Child created successfully', 'id': child_id}), 201
+        return jsonify({'message': 'Child created successfully', 'id': child_id,
+                        'translation_job_id': translation_job_id}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -664,11 +1271,13 @@ def update_child(child_id):
         ''', (data['name'], data['gender'], data.get('birth_date'),
               data.get('photo'), data.get('description'), data['mission_id'], data.get('sponsor_id'), child_id))
         conn.commit()
+        invalidate_lookups()
         
         # Get the source language from the request or detect from user preference
         source_language = data.get('source_language', 'en')
         
-        # Pre-translate children fields for multilingual support
+        # Queue pre-translation of children fields for multilingual support
+        translation_job_id = None
         if data.get('name') or data.get('description'):
             try:
                 child_data = {}
@@ -677,14 +1286,14 @@ def update_child(child_id):
                 if data.get('description'):
                     child_data['description'] = data['description']
                     
-                pre_translate_all_fields('children', child_id, child_data, source_language)
-                logger.info(f"Pre-translated children fields for child {child_id}")
+                translation_job_id = enqueue_translation('children', child_id, child_data, source_language)
+                logger.info(f"Queued pre-translation job {translation_job_id} for child {child_id}")
             except Exception as translation_error:
-                logger.warning(f"Translation failed for child {child_id}: {translation_error}")
+                logger.warning(f"Could not queue translation for child {child_id}: {translation_error}")
                 # Continue without failing the update
         
         conn.close()
-        return jsonify({'message': 'Child updated successfully'})
+        return jsonify({'message': 'Child updated successfully', 'translation_job_id': translation_job_id})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -694,6 +1303,7 @@ def delete_child(child_id):
         conn = get_db_connection()
         conn.execute('DELETE FROM children WHERE id = ?', (child_id,))
         conn.commit()
+        invalidate_lookups()
         conn.close()
         return jsonify({'message': 'Child deleted successfully'})
     except Exception as e:
@@ -715,25 +1325,26 @@ def create_mission():
         
         mission_id = cursor.lastrowid
         conn.commit()
+        invalidate_lookups()
         
-        # Pre-translate mission description for multilingual support
+        # Queue pre-translation of mission description for multilingual support
+        translation_job_id = None
         if mission_id and data.get('description'):
             try:
-                print(f"Pre-translating mission description for mission ID: {mission_id}")
                 mission_data = {
                     'description': data['description']
                 }
                 # Use UI language as source language (fallback to 'en' if not provided)
                 source_language = data.get('ui_language', 'en')
-                print(f"Using source language: {source_language}")
-                pre_translate_all_fields('mission', mission_id, mission_data, source_language)
-                print("Mission pre-translation completed successfully")
+                translation_job_id = enqueue_translation('mission', mission_id, mission_data, source_language)
+                print(f"Queued pre-translation job {translation_job_id} for mission ID: {mission_id}")
             except Exception as translate_error:
-                print(f"Warning: Mission pre-translation failed: {translate_error}")
+                print(f"Warning: Could not queue mission pre-translation: {translate_error}")
                 # Non interrompiamo il processo se la traduzione fallisce
         
         conn.close()
-        return jsonify({'message': 'Mission created successfully', 'id': mission_id}), 201
+        return jsonify({'message': 'Mission created successfully', 'id': mission_id,
+                        'translation_job_id': translation_job_id}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -760,8 +1371,7 @@ def update_mission(mission_id):
                     # Generate unique filename
                     filename = secure_filename(photo_file.filename)
                     unique_filename = f"{uuid.uuid4()}_{filename}"
-                    photo_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-                    photo_file.save(photo_path)
+                    get_media_store().put(photo_file.stream, unique_filename)
                     photo_filename = unique_filename
                     print(f"Mission photo saved: {photo_filename}")
                 else:
@@ -780,22 +1390,14 @@ def update_mission(mission_id):
         ''', (data['name'], data.get('description'), 
               data.get('referent_id'), photo_filename or mission['photo'], mission_id))
         conn.commit()
+        invalidate_lookups()
         
-        # Re-translate mission description if updated
+        # Queue re-translation of mission description if updated
+        translation_job_id = None
         if data.get('description'):
             try:
-                print(f"Re-translating updated mission description for mission ID: {mission_id}")
-                
                 # Clear old translations for this mission item
-                service = get_translation_service()
-                conn_trans = sqlite3.connect(service.db_path)
-                cursor_trans = conn_trans.cursor()
-                cursor_trans.execute('''
-                    DELETE FROM translations 
-                    WHERE entity_type = 'mission' AND entity_id = ?
-                ''', (mission_id,))
-                conn_trans.commit()
-                conn_trans.close()
+                get_translation_service().delete_entity_translations('mission', mission_id)
                 print(f"Cleared old translations for mission ID: {mission_id}")
                 
                 mission_data = {
@@ -803,15 +1405,14 @@ def update_mission(mission_id):
                 }
                 # Use UI language as source language (fallback to 'en' if not provided)
                 source_language = data.get('ui_language', 'en')
-                print(f"Using source language: {source_language}")
-                pre_translate_all_fields('mission', mission_id, mission_data, source_language)
-                print("Mission update pre-translation completed successfully")
+                translation_job_id = enqueue_translation('mission', mission_id, mission_data, source_language)
+                print(f"Queued re-translation job {translation_job_id} for mission ID: {mission_id}")
             except Exception as translate_error:
-                print(f"Warning: Mission update pre-translation failed: {translate_error}")
+                print(f"Warning: Could not queue mission update re-translation: {translate_error}")
                 # Non interrompiamo il processo se la traduzione fallisce
         
         conn.close()
-        return jsonify({'message': 'Mission updated successfully'})
+        return jsonify({'message': 'Mission updated successfully', 'translation_job_id': translation_job_id})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -821,12 +1422,23 @@ def delete_mission(mission_id):
         conn = get_db_connection()
         conn.execute('DELETE FROM missions WHERE id = ?', (mission_id,))
         conn.commit()
+        invalidate_lookups()
         conn.close()
         return jsonify({'message': 'Mission deleted successfully'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+def queue_uploaded_video(filename):
+    """Start processing an uploaded video right away, before it is attached to a news post"""
+    if not is_video(filename):
+        return None
+    try:
+        return enqueue_video(filename)
+    except Exception as e:
+        print(f"Warning: Could not queue video processing for {filename}: {e}")
+        return None
+
 # File upload endpoint
 @app.route('/upload', methods=['POST'])
 def upload_file():
@@ -850,25 +1462,19 @@ def upload_file():
         print(f"Uploading file: {file.filename}, Size: {file_size} bytes, Type: {file.content_type}")
         
         if file and allowed_file(file.filename):
-            # Generate unique filename to avoid conflicts
-            filename = secure_filename(file.filename)
-            name, ext = os.path.splitext(filename)
-            unique_filename = f"{name}_{uuid.uuid4().hex[:8]}{ext}"
-            
-            # Create uploads directory if it doesn't exist
-            upload_dir = os.path.join(app.config['UPLOAD_FOLDER'])
-            os.makedirs(upload_dir, exist_ok=True)
+            unique_filename = unique_upload_name(file.filename)
             
-            # Save the file
-            file_path = os.path.join(upload_dir, unique_filename)
-            file.save(file_path)
+            # Store by content hash: identical bytes are kept only once
+            blob_hash, deduplicated = get_media_store().put(file.stream, unique_filename)
             
-            print(f"File saved successfully: {file_path}")
+            print(f"File saved successfully: {unique_filename} (blob {blob_hash[:12]}, deduplicated: {deduplicated})")
             
             return jsonify({
                 'message': 'File uploaded successfully',
                 'filename': unique_filename,
-                'url': f'/uploads/{unique_filename}'
+                'url': f'/uploads/{unique_filename}',
+                'deduplicated': deduplicated,
+                'video_job_id': queue_uploaded_video(unique_filename)
             })
         
         return jsonify({'error': f'File type not allowed. Allowed types: {", ".join(ALLOWED_EXTENSIONS)}'}), 400
@@ -877,30 +1483,135 @@ def upload_file():
         print(f"Upload error: {str(e)}")
         return jsonify({'error': f'Upload failed: {str(e)}'}), 500
 
+# Resumable chunked uploads for large files:
+#   POST   /upload/sessions                 {filename, size}     -> {upload_id, offset, chunk_size}
+#   GET    /upload/sessions/<id>                                 -> current offset, to resume
+#   PUT    /upload/sessions/<id>?offset=<n> raw chunk bytes      -> new offset
+#          (optional header X-Chunk-SHA256 with the hex SHA-256 of the chunk)
+#   POST   /upload/sessions/<id>/finalize   {sha256}             -> same response as /upload
+#   DELETE /upload/sessions/<id>                                 -> abort
+def upload_session_error(e):
+    body = {'error': str(e)}
+    if e.offset is not None:
+        body['offset'] = e.offset
+    return jsonify(body), e.status
+
+def upload_session_response(session):
+    return {
+        'upload_id': session['id'],
+        'filename': session['filename'],
+        'size': session['total_size'],
+        'offset': session['offset'],
+        'chunk_size': Config.UPLOAD_CHUNK_SIZE
+    }
+
+@app.route('/upload/sessions', methods=['POST'])
+def create_upload_session():
+    data = request.get_json() or {}
+    filename = secure_filename(data.get('filename') or '')
+    if not filename:
+        return jsonify({'error': 'filename is required'}), 400
+    if not allowed_file(filename):
+        return jsonify({'error': f'File type not allowed. Allowed types: {", ".join(ALLOWED_EXTENSIONS)}'}), 400
+    size = data.get('size')
+    if size is not None and (not isinstance(size, int) or isinstance(size, bool)):
+        return jsonify({'error': 'size must be an integer'}), 400
+    
+    try:
+        session = get_upload_sessions().create(filename, size)
+    except UploadSessionError as e:
+        return upload_session_error(e)
+    return jsonify(upload_session_response(session)), 201
+
+@app.route('/upload/sessions/<upload_id>', methods=['GET'])
+def get_upload_session(upload_id):
+    session = get_upload_sessions().get(upload_id)
+    if session is None:
+        return jsonify({'error': 'Upload session not found'}), 404
+    return jsonify(upload_session_response(session))
+
+@app.route('/upload/sessions/<upload_id>', methods=['PUT'])
+def append_upload_chunk(upload_id):
+    offset = request.args.get('offset', request.headers.get('Upload-Offset'))
+    if offset is None or not str(offset).isdigit():
+        return jsonify({'error': 'offset is required: use ?offset=<bytes already sent>'}), 400
+    
+    try:
+        # request.stream is read in bounded blocks, the chunk is never buffered whole
+        new_offset = get_upload_sessions().append(
+            upload_id, int(offset), request.stream, request.headers.get('X-Chunk-SHA256')
+        )
+    except UploadSessionError as e:
+        return upload_session_error(e)
+    return jsonify({'upload_id': upload_id, 'offset': new_offset})
+
+@app.route('/upload/sessions/<upload_id>/finalize', methods=['POST'])
+def finalize_upload_session(upload_id):
+    data = request.get_json(silent=True) or {}
+    sessions = get_upload_sessions()
+    session = sessions.get(upload_id)
+    if session is None:
+        return jsonify({'error': 'Upload session not found'}), 404
+    
+    unique_filename = unique_upload_name(session['filename'])
+    try:
+        blob_hash, deduplicated, size = sessions.finalize(upload_id, unique_filename, data.get('sha256'))
+    except UploadSessionError as e:
+        return upload_session_error(e)
+    
+    print(f"File saved successfully: {unique_filename} ({size} bytes, blob {blob_hash[:12]}, deduplicated: {deduplicated})")
+    return jsonify({
+        'message': 'File uploaded successfully',
+        'filename': unique_filename,
+        'url': f'/uploads/{unique_filename}',
+        'deduplicated': deduplicated,
+        'video_job_id': queue_uploaded_video(unique_filename)
+    })
+
+@app.route('/upload/sessions/<upload_id>', methods=['DELETE'])
+def abort_upload_session(upload_id):
+    if not get_upload_sessions().abort(upload_id):
+        return jsonify({'error': 'Upload session not found'}), 404
+    return jsonify({'message': 'Upload session aborted'})
+
 # Serve uploaded files
+# Responses are conditional (strong content-hash ETag, 304) and range-aware (206),
+# and uuid-suffixed uploads are cacheable forever.
+# Images accept ?w=<width> for a resized copy (WebP when the client accepts it)
+def send_media(path, mimetype, name, etag=None):
+    response = send_from_directory(os.path.dirname(path), os.path.basename(path), mimetype=mimetype,
+                                   etag=etag or media_utils.content_etag(path), conditional=True)
+    response.headers['Accept-Ranges'] = 'bytes'
+    if media_utils.is_immutable(name):
+        response.headers['Cache-Control'] = media_utils.IMMUTABLE_CACHE_CONTROL
+    else:
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 @app.route('/uploads/<filename>')
 def uploaded_file(filename):
+    store = get_media_store()
+    stored = store.resolve(filename) if secure_filename(filename) == filename else None
+    if stored is None:
+        print(f"Error serving file {filename}: not found")
+        return jsonify({'error': 'File not found'}), 404
+    path, blob_hash = stored
+    
+    width = request.args.get('w')
+    if width is not None:
+        if not width.isdigit() or int(width) <= 0:
+            return jsonify({'error': 'Invalid width: use ?w=<pixels>'}), 400
+        webp = request.args.get('format') == 'webp' or 'image/webp' in request.headers.get('Accept', '')
+        variant = media_utils.image_variant(store.upload_folder, filename, path, int(width), webp)
+        if variant:
+            variant_path, mimetype = variant
+            response = send_media(variant_path, mimetype, os.path.basename(variant_path))
+            response.headers['Vary'] = 'Accept'
+            return response
+    
     try:
-        # Get file extension to set proper content type
-        ext = filename.lower().split('.')[-1] if '.' in filename else ''
-        
-        # Set content type for videos
-        content_type = None
-        if ext in ['mp4']:
-            content_type = 'video/mp4'
-        elif ext in ['avi']:
-            content_type = 'video/x-msvideo'
-        elif ext in ['mov']:
-            content_type = 'video/quicktime'
-        elif ext in ['webm']:
-            content_type = 'video/webm'
-        elif ext in ['mkv']:
-            content_type = 'video/x-matroska'
-        
-        if content_type:
-            return send_from_directory(app.config['UPLOAD_FOLDER'], filename, mimetype=content_type)
-        else:
-            return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+        # The blob hash already is the content hash: no need to read the file again
+        return send_media(path, media_utils.mimetype_for(filename), filename, blob_hash)
             
     except Exception as e:
         print(f"Error serving file {filename}: {str(e)}")
@@ -908,6 +1619,8 @@ def uploaded_file(filename):
 
 
 # Translation endpoints: multilingual support with intelligent caching
+MAX_TRANSLATION_BATCH = 1000
+
 @app.route('/translate', methods=['POST'])
 def translate_text():
     """
@@ -957,7 +1670,7 @@ def translate_field_cached():
     
     # Auto-determina source_language
     service = get_translation_service()
-    conn = sqlite3.connect(service.db_path)
+    conn = get_db_connection(service.db_path)
     cursor = conn.cursor()
     
     # Per gli utenti, usa ui_language dalla tabella users
@@ -1002,6 +1715,48 @@ def translate_field_cached():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/translate/batch', methods=['POST'])
+def translate_fields_batched():
+    """
+    Endpoint per tradurre molti campi in una sola richiesta
+    Body: {"target_language": "ta", "items": [{"entity_type", "entity_id", "field_name", "original_text"}, ...]}
+    Gli item possono essere anche liste [entity_type, entity_id, field_name, original_text?]
+    """
+    data = request.get_json(silent=True) or {}
+    target_language = data.get('target_language', 'en')
+    raw_items = data.get('items')
+    
+    if not isinstance(raw_items, list) or not raw_items:
+        return jsonify({'error': 'items must be a non-empty list'}), 400
+    if len(raw_items) > MAX_TRANSLATION_BATCH:
+        return jsonify({'error': f'Too many items (maximum {MAX_TRANSLATION_BATCH})'}), 400
+    
+    items = []
+    for raw in raw_items:
+        if isinstance(raw, (list, tuple)) and len(raw) >= 3:
+            item = dict(zip(('entity_type', 'entity_id', 'field_name', 'original_text'), raw))
+        elif isinstance(raw, dict):
+            item = raw
+        else:
+            return jsonify({'error': 'Each item needs entity_type, entity_id and field_name'}), 400
+        try:
+            item['entity_id'] = int(item.get('entity_id'))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'entity_id must be an integer'}), 400
+        if not all([item.get('entity_type'), item.get('entity_id'), item.get('field_name')]):
+            return jsonify({'error': 'Each item needs entity_type, entity_id and field_name'}), 400
+        items.append(item)
+    
+    try:
+        translations = translate_fields_batch(items, target_language)
+        return jsonify({
+            'target_language': target_language,
+            'translations': translations
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/translate/stats', methods=['GET'])
 def translation_stats():
     """
@@ -1015,7 +1770,54 @@ def translation_stats():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/translate/jobs', methods=['GET'])
+def translation_jobs_stats():
+    """
+    Endpoint con il numero di job di traduzione per stato
+    """
+    try:
+        return jsonify(get_translation_queue().get_stats())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/translate/jobs/<int:job_id>', methods=['GET'])
+def translation_job_status(job_id):
+    """
+    Endpoint per lo stato di un job di traduzione in background
+    """
+    try:
+        job = get_translation_queue().get_job(job_id)
+        if not job:
+            return jsonify({'error': 'Translation job not found'}), 404
+        return jsonify(job)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/video/jobs', methods=['GET'])
+def video_jobs_stats():
+    """Number of video processing jobs in each status"""
+    try:
+        return jsonify(get_video_queue().get_stats())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/video/jobs/<int:job_id>', methods=['GET'])
+def video_job_status(job_id):
+    """Status of a video processing job, with its renditions once done"""
+    try:
+        job = get_video_queue().get_job(job_id)
+        if not job:
+            return jsonify({'error': 'Video job not found'}), 404
+        return jsonify(job)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 
 # Main entry point: run Flask app locally
 if __name__ == '__main__':
+    # Resume translation and video jobs left pending by a previous run (only in
+    # the debug reloader's child process, which is the one serving requests)
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        get_translation_queue().start()
+        get_video_queue().start()
     app.run(host='127.0.0.1', port=5001, debug=True)
@@ -4,6 +4,7 @@
 import sqlite3
 from flask import Blueprint, request, jsonify, session
 from werkzeug.security import generate_password_hash, check_password_hash
+from lookups import invalidate_lookups
 from models import get_db_connection
 
 auth_bp = Blueprint('auth', __name__)
@@ -26,6 +27,7 @@ def register():
         cursor.execute('''INSERT INTO users (username, password, role, email, phone, photo) VALUES (?, ?, ?, ?, ?, ?)''',
                        (username, hashed_password, role, email, phone, photo))
         conn.commit()
+        invalidate_lookups()
         return jsonify({'message': 'User registered successfully'}), 201
     except sqlite3.IntegrityError:
         return jsonify({'error': 'Username already exists'}), 409
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark for GET /news
+Seeds a throw-away database with many news posts and media, then compares
+the legacy per-row media lookup with the batched fetch used by the endpoint
+
+Usage: python benchmark_news.py [news_count] [media_per_news]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+from config import Config
+from models import init_db, get_db_connection
+
+
+def seed_database(news_count, media_per_news):
+    """Fill the current database with users, missions, children and news"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute('''INSERT INTO users (username, password, role, email)
+                      VALUES ('bench_admin', 'x', 'admin', 'admin@example.com')''')
+    admin_id = cursor.lastrowid
+    cursor.execute('''INSERT INTO users (username, password, role, email)
+                      VALUES ('bench_referent', 'x', 'referent', 'ref@example.com')''')
+    referent_id = cursor.lastrowid
+    cursor.execute('INSERT INTO missions (name, referent_id) VALUES (?, ?)', ('Bench Mission', referent_id))
+    mission_id = cursor.lastrowid
+
+    child_ids = []
+    for i in range(100):
+        cursor.execute('INSERT INTO children (name, birth, gender, mission_id) VALUES (?, ?, ?, ?)',
+                       (f'Child {i}', '2015-06-15', 'M' if i % 2 else 'F', mission_id))
+        child_ids.append(cursor.lastrowid)
+
+    content = 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 10
+    cursor.executemany('''
+        INSERT INTO news (title, content, date, child_id, created_by, created_at)
+        VALUES (?, ?, '2025-01-01', ?, ?, datetime('now', ?))
+    ''', [(f'News {i}', content, random.choice(child_ids), admin_id, f'-{i} minutes')
+          for i in range(news_count)])
+
+    news_ids = [row[0] for row in cursor.execute('SELECT id FROM news').fetchall()]
+    cursor.executemany('''
+        INSERT INTO news_media (news_id, media_type, media_path, description, media_order)
+        VALUES (?, ?, ?, '', ?)
+    ''', [(news_id, 'photo', f'photo_{news_id}_{order}.jpg', order)
+          for news_id in news_ids for order in range(media_per_news)])
+
+    conn.commit()
+    conn.close()
+
+
+def legacy_media_lookup(conn, news_ids):
+    """The original N+1 strategy: one news_media query per news row"""
+    media_by_news = {}
+    for news_id in news_ids:
+        media_files = conn.execute('''
+            SELECT *
+            FROM news_media
+            WHERE news_id = ?
+            ORDER BY media_order
+        ''', (news_id,)).fetchall()
+        # Same shape as fetch_news_media: every column except the row and news ids
+        media_by_news[news_id] = [
+            {key: media[key] for key in media.keys() if key not in ('id', 'news_id')}
+            for media in media_files
+        ]
+    return media_by_news
+
+
+def run_counted(label, func, *args):
+    """Run func on a fresh connection and report statement count and latency"""
+    conn = get_db_connection()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    started = time.perf_counter()
+    result = func(conn, *args)
+    elapsed = time.perf_counter() - started
+    conn.set_trace_callback(None)
+    conn.close()
+    print(f"   {label:<28} {len(statements):>7} queries {elapsed * 1000:>10.1f} ms")
+    return result
+
+
+def main():
+    news_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    media_per_news = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        Config.DATABASE_PATH = os.path.join(tmp_dir, 'benchmark.db')
+        init_db()
+
+        print(f"🌱 Seeding {news_count:,} news with {media_per_news} media each...")
+        seed_database(news_count, media_per_news)
+
+        # Imported late so the app picks up the benchmark database
+        import app as app_module
+
+        conn = get_db_connection()
+        news_ids = [row[0] for row in conn.execute('SELECT id FROM news ORDER BY created_at DESC').fetchall()]
+        conn.close()
+
+        print("📊 Media lookup:")
+        legacy = run_counted('legacy per-row queries', legacy_media_lookup, news_ids)
+        batched = run_counted('batched fetch_news_media', app_module.fetch_news_media, news_ids)
+        assert legacy == {news_id: batched.get(news_id, []) for news_id in news_ids}, 'Results differ'
+
+        print("🌐 GET /news (full request):")
+        client = app_module.app.test_client()
+        started = time.perf_counter()
+        response = client.get('/news')
+        elapsed = time.perf_counter() - started
+        print(f"   {'status ' + str(response.status_code):<28} {len(response.get_json()):>7} rows  {elapsed * 1000:>10.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark for bulk news translation
+Simulates importing many news posts and pre-translating their title and content
+into the other languages, comparing one remote call per segment with the
+batched TranslationService.translate_batch API
+
+Translations go through the offline LocalBackend, which waits a fixed latency
+per call, so the benchmark runs without network access and measures call
+overhead only.
+
+Usage: python benchmark_translation.py [news_count] [latency_ms]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+from config import Config
+from models import init_db
+import translator
+from translation_backends import LocalBackend
+
+
+def make_news(count):
+    return [{
+        'title': f'News {i}: progress report',
+        'content': f'Update number {i}. The child attended school every day and enjoyed the new books.'
+    } for i in range(count)]
+
+
+def run_strategy(label, strategy, news, latency_ms):
+    """Run one strategy on a fresh database so the translation memory starts empty"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        Config.DATABASE_PATH = os.path.join(tmp_dir, 'benchmark.db')
+        init_db()
+        backend = LocalBackend(latency_ms)
+        service = translator.TranslationService(Config.DATABASE_PATH, backend=backend)
+
+        started = time.perf_counter()
+        strategy(service, news)
+        elapsed = time.perf_counter() - started
+        print(f"   {label:<34} {backend.calls:>6} calls {elapsed:>9.2f} s")
+        return elapsed
+
+
+def per_segment(service, news):
+    """One remote call per field per target language"""
+    for item in news:
+        for text in (item['title'], item['content']):
+            for target in ('it', 'ta'):
+                service.translate_text(text, target, 'en')
+
+
+def per_entity(service, news):
+    """pre_translate_entity: one batch per news post and target language"""
+    for i, item in enumerate(news, start=1):
+        service.pre_translate_entity('news', i, item, 'en')
+
+
+def bulk_batch(service, news):
+    """translate_batch over the whole import, per target language"""
+    texts = [text for item in news for text in (item['title'], item['content'])]
+    for target in ('it', 'ta'):
+        service.translate_batch(texts, target, 'en')
+
+
+def main():
+    news_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    translator.logger.setLevel('WARNING')
+    news = make_news(news_count)
+
+    print(f"🌐 Translating {news_count:,} news (title + content) en -> it, ta "
+          f"with {latency_ms:.0f} ms per backend call")
+    baseline = run_strategy('per-segment translate_text', per_segment, news, latency_ms)
+    entity = run_strategy('pre_translate_entity (per post)', per_entity, news, latency_ms)
+    bulk = run_strategy('translate_batch (whole import)', bulk_batch, news, latency_ms)
+    print(f"   speedup: {baseline / entity:.1f}x per post, {baseline / bulk:.1f}x whole import")
+
+
+if __name__ == '__main__':
+    main()
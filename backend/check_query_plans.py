@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression check for the SQLite schema
+Runs the app.py endpoints (and the background queues they feed) against a copy
+of the database, records every statement they execute and runs EXPLAIN QUERY
+PLAN on each SELECT / UPDATE / DELETE.
+
+A plan step 'SCAN <table>' without an index is a full table scan. The accepted
+full scans (e.g. an admin listing every child) are kept in query_plans.json;
+the check fails when a statement does a full scan that is not listed there,
+which is what happens when a query stops using its index or a new query is
+added without one.
+
+Usage: python check_query_plans.py [--update] [database]
+  --update   rewrite query_plans.json with the current plans
+  database   database to copy (default: Config.DATABASE_PATH)
+"""
+
+import io
+import json
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+from migrations import SEARCH_INDEX_TABLES
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'query_plans.json')
+
+# Statements whose plan is checked; schema changes, PRAGMAs and plain INSERTs are skipped
+PLANNED_STATEMENT = re.compile(r'^\s*(SELECT|UPDATE|DELETE|WITH|INSERT\b.*\bSELECT\b)', re.IGNORECASE | re.DOTALL)
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])')
+VALUE_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+
+
+def normalize(sql):
+    """Replace literals with '?' so that executions with different values share one key"""
+    sql = STRING_LITERAL.sub('?', sql)
+    sql = NUMBER_LITERAL.sub('?', sql)
+    sql = VALUE_LIST.sub('(?)', sql)
+    return ' '.join(sql.split())
+
+
+def full_scans(conn, sql):
+    """Details of the plan steps that scan a whole table"""
+    scans = set()
+    for row in conn.execute('EXPLAIN QUERY PLAN ' + sql).fetchall():
+        detail = row[3]
+        if not detail.startswith('SCAN ') or ' USING ' in detail:
+            continue
+        target = detail[len('SCAN '):]
+        # Constant rows, subquery results and table-valued functions (json_each) are not tables
+        if target.startswith('(') or target.startswith('CONSTANT') or 'VIRTUAL TABLE' in target:
+            continue
+        # Nor are the FTS5 shadow tables, which FTS5 itself reads (e.g. its config)
+        if target.split()[0].split('.')[-1] in SEARCH_INDEX_TABLES:
+            continue
+        scans.add(detail)
+    return sorted(scans)
+
+
+def record_statements(db_path, upload_folder):
+    """Run the endpoints against db_path and return the expanded SQL they executed"""
+    os.environ['DATABASE_PATH'] = db_path
+    os.environ['TRANSLATION_BACKEND'] = 'local'
+
+    from config import Config
+    Config.DATABASE_PATH = db_path
+    Config.TRANSLATION_BACKEND = 'local'
+
+    import models
+    statements = []
+
+    # Every borrowed connection reports the statements it runs (the pool resets
+    # the callback when a connection is given back)
+    acquire = models.ConnectionPool.acquire
+    def traced_acquire(pool):
+        conn = acquire(pool)
+        conn.set_trace_callback(statements.append)
+        return conn
+    models.ConnectionPool.acquire = traced_acquire
+
+    models.init_db()
+
+    import media_store
+    media_store._media_store_instance = media_store.MediaStore(db_path, upload_folder)
+
+    from app import app
+    from translation_queue import get_translation_queue
+    from video_queue import get_video_queue
+    client = app.test_client()
+
+    def check(response, *expected):
+        if response.status_code not in (expected or (200,)):
+            raise RuntimeError(f'{response.request.method} {response.request.path}: '
+                               f'{response.status_code} {response.get_data(as_text=True)[:200]}')
+        return response
+
+    # Lists, for each role, paginated and localized
+    check(client.get('/lookups'))
+    for path in ('/users', '/missions', '/sponsors', '/children', '/news'):
+        check(client.get(path))
+        page = check(client.get(path, query_string={'limit': 2}))
+        if page.headers.get('X-Next-Cursor'):
+            check(client.get(path, query_string={'limit': 2, 'after': page.headers['X-Next-Cursor']}))
+    for path in ('/missions', '/children', '/news'):
+        check(client.get(path, query_string={'lang': 'ta'}))
+    check(client.get('/news', query_string={'fields': 'id,title'}))
+    for role, user_id in (('sponsor', 4), ('referent', 2), ('localReferent', 2)):
+        check(client.get('/children', query_string={'user_role': role, 'user_id': user_id}))
+        check(client.get('/news', query_string={'user_role': role, 'user_id': user_id}))
+
+    # Whitelisted filters and sort keys, first and following pages
+    for path, query in (('/children', {'mission_id': 2, 'sponsored': 'true', 'gender': 'woman'}),
+                        ('/children', {'age_min': 8, 'age_max': 12, 'sort': '-age'}),
+                        ('/children', {'sort': 'name'}), ('/children', {'sponsor_id': 4, 'birth_from': '2010-01-01'}),
+                        ('/news', {'mission_id': 1, 'date_from': '2024-01-01', 'date_to': '2025-12-31'}),
+                        ('/news', {'child_id': 1, 'sort': 'date'}), ('/news', {'created_by': 1}),
+                        ('/news', {'sort': '-date'}), ('/users', {'role': 'sponsor', 'sort': 'full_name'}),
+                        ('/users', {'sort': '-username'})):
+        page = check(client.get(path, query_string={**query, 'limit': 2}))
+        if page.headers.get('X-Next-Cursor'):
+            check(client.get(path, query_string={**query, 'limit': 2, 'after': page.headers['X-Next-Cursor']}))
+
+    # Full-text search, in the original texts and in the translations
+    for query in ({'q': 'arun'}, {'q': 'orissa', 'types': 'missions', 'lang': 'ta'}, {'q': 'பள்ளி', 'limit': 2}):
+        check(client.get('/search', query_string=query))
+
+    # Detail pages with their embedded relations
+    for path in ('/children/1', '/news/1', '/missions/1', '/missions/2'):
+        check(client.get(path), 200, 404)
+        check(client.get(path, query_string={'lang': 'ta'}), 200, 404)
+
+    # Uploads and media serving
+    upload = check(client.post('/upload', data={'file': (io.BytesIO(b'query plan check'), 'plan.png')},
+                               content_type='multipart/form-data'))
+    filename = upload.get_json()['filename']
+    check(client.get(f'/uploads/{filename}'), 200, 404)
+    check(client.get('/uploads/missing.png'), 404)
+    session = check(client.post('/upload/sessions', json={'filename': 'clip.mp4', 'size': 4}), 200, 201).get_json()
+    upload_id = session.get('upload_id') or session.get('id')
+    check(client.get(f'/upload/sessions/{upload_id}'))
+    check(client.put(f'/upload/sessions/{upload_id}', query_string={'offset': 0}, data=b'clip'))
+    check(client.post(f'/upload/sessions/{upload_id}/finalize', json={}), 200, 201)
+    aborted = check(client.post('/upload/sessions', json={'filename': 'drop.png'}), 200, 201).get_json()
+    check(client.delete(f"/upload/sessions/{aborted.get('upload_id') or aborted.get('id')}"))
+
+    # Writes
+    user = check(client.post('/users', json={'username': 'plan_check', 'password': 'x', 'role': 'sponsor'}), 200, 201)
+    user_id = user.get_json().get('id') or user.get_json().get('user', {}).get('id')
+    check(client.put(f'/users/{user_id}', json={'username': 'plan_check', 'email': 'plan@example.com'}))
+
+    mission = check(client.post('/missions', json={'name': 'Plan Mission', 'description': 'Check', 'referent_id': 2}), 200, 201)
+    mission_id = mission.get_json().get('id') or mission.get_json().get('mission_id')
+    check(client.put(f'/missions/{mission_id}', json={'name': 'Plan Mission', 'description': 'Checked', 'referent_id': 2}))
+
+    child = check(client.post('/children', json={'name': 'Plan Child', 'gender': 'F', 'birth_date': '2015-01-01',
+                                                 'description': 'Check', 'mission_id': mission_id,
+                                                 'sponsor_id': 1}), 200, 201)
+    child_id = child.get_json().get('id') or child.get_json().get('child_id')
+    check(client.put(f'/children/{child_id}', json={'name': 'Plan Child', 'gender': 'F', 'description': 'Checked',
+                                                     'mission_id': mission_id, 'sponsor_id': 1}))
+
+    news = check(client.post('/news', json={'title': 'Plan', 'content': 'Check', 'date': '2025-01-01',
+                                            'child_id': child_id, 'created_by': 1,
+                                            'media_files': [{'path': filename, 'type': 'image'},
+                                                            {'path': 'clip.mp4', 'type': 'video'}]}), 200, 201)
+    news_id = news.get_json().get('id') or news.get_json().get('news_id')
+    check(client.put(f'/news/{news_id}', json={'title': 'Plan', 'content': 'Checked', 'date': '2025-01-01',
+                                               'child_id': child_id, 'current_user_id': 1, 'media_files': []}))
+
+    # Translations and background jobs; queued jobs are drained here as well as by
+    # the workers that enqueueing may have started
+    check(client.post('/translate/field', json={'entity_type': 'news', 'entity_id': news_id, 'field_name': 'title',
+                                                'target_language': 'it', 'original_text': 'Plan'}))
+    check(client.post('/translate/batch', json={'target_language': 'ta',
+                                                'items': [['news', news_id, 'title', 'Plan'],
+                                                          ['mission', mission_id, 'description', 'Checked']]}))
+    for queue in (get_translation_queue(), get_video_queue()):
+        job = queue._claim_next_job()
+        while job:
+            queue._run_job(job)
+            job = queue._claim_next_job()
+    for path in ('/translate/stats', '/translate/jobs', '/translate/jobs/1', '/video/jobs', '/video/jobs/1'):
+        check(client.get(path), 200, 404)
+
+    check(client.delete(f'/news/{news_id}'))
+    check(client.delete(f'/children/{child_id}'))
+    check(client.delete(f'/missions/{mission_id}'))
+    check(client.delete(f'/users/{user_id}'))
+    get_translation_queue().stop()
+
+    models.ConnectionPool.acquire = acquire
+    return statements
+
+
+def collect_plans(db_path, statements):
+    """{normalized statement: [full scan details]} for the planned statements"""
+    plans = {}
+    conn = sqlite3.connect(db_path)
+    for sql in statements:
+        if not PLANNED_STATEMENT.match(sql):
+            continue
+        key = normalize(sql)
+        if key in plans:
+            continue
+        try:
+            plans[key] = full_scans(conn, sql)
+        except sqlite3.Error as e:
+            print(f"Could not explain: {key}\n  {e}")
+    conn.close()
+    return plans
+
+
+def main(args):
+    update = '--update' in args
+    args = [arg for arg in args if arg != '--update']
+
+    from config import Config
+    source = args[0] if args else Config.DATABASE_PATH
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'kuttiapp.db')
+        shutil.copy(source, db_path)
+        upload_folder = os.path.join(tmp_dir, 'uploads')
+        os.makedirs(upload_folder)
+
+        statements = record_statements(db_path, upload_folder)
+        plans = collect_plans(db_path, statements)
+
+    if update:
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(dict(sorted(plans.items())), f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"Baseline updated: {len(plans)} statements, "
+              f"{sum(1 for scans in plans.values() if scans)} with accepted full scans")
+        return 0
+
+    try:
+        with open(BASELINE_PATH, encoding='utf-8') as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = {}
+
+    regressions = []
+    for sql, scans in sorted(plans.items()):
+        new_scans = [scan for scan in scans if scan not in baseline.get(sql, [])]
+        if new_scans:
+            regressions.append((sql, new_scans))
+
+    print(f"Checked {len(plans)} statements ({len(statements)} executions)")
+    for sql, scans in regressions:
+        print(f"\nFULL SCAN {', '.join(scans)}\n  {sql}")
+    if regressions:
+        print(f"\n{len(regressions)} statements regressed to a full scan "
+              f"(run with --update once a scan has been reviewed and accepted)")
+        return 1
+    print("No query plan regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
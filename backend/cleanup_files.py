@@ -8,64 +8,75 @@ import sqlite3
 import os
 from datetime import datetime
 
+import media
+from media_store import MediaStore
+from video_queue import VideoQueue
+
 def cleanup_orphaned_files():
-    """Find and optionally remove orphaned media files"""
-    
-    print("🧹 Scanning for orphaned media files...")
+    """Find and optionally remove orphaned media files
     
-    # Connect to database
-    conn = sqlite3.connect('kuttiapp.db')
-    cursor = conn.cursor()
+    Stored files are found from the media store mapping (no directory scan);
+    flat files from before the store are compared with the database references.
+    Video jobs of videos no longer referenced are deleted along with their
+    renditions, so enqueueing the video again cannot hand the released names out.
+    """
     
-    # Get all media files referenced in database
-    cursor.execute('''
-        SELECT DISTINCT media_path FROM news_media
-        UNION
-        SELECT DISTINCT photo FROM children WHERE photo IS NOT NULL AND photo != ''
-        UNION  
-        SELECT DISTINCT photo FROM missions WHERE photo IS NOT NULL AND photo != ''
-        UNION
-        SELECT DISTINCT photo FROM users WHERE photo IS NOT NULL AND photo != ''
-    ''')
-    
-    db_files = {row[0] for row in cursor.fetchall()}
-    conn.close()
+    print("🧹 Scanning for orphaned media files...")
     
-    # Get all files in uploads directory
     uploads_dir = 'uploads'
     if not os.path.exists(uploads_dir):
         print("❌ Uploads directory not found!")
         return
     
-    disk_files = set(os.listdir(uploads_dir))
-    
-    # Find orphaned files (on disk but not in database)
-    orphaned_files = disk_files - db_files
+    store = MediaStore('kuttiapp.db', uploads_dir)
+    db_files = store.referenced_filenames()
+    orphaned_stored = store.unreferenced_files()
+    orphaned_legacy = sorted(set(store.legacy_files()) - db_files)
+    video_queue = VideoQueue('kuttiapp.db')
+    stale_jobs = video_queue.unreferenced_jobs()
+    
+    # A blob is only freed when all of its filenames are orphaned
+    orphaned_names = {entry['filename'] for entry in orphaned_stored}
+    freed_blobs = {}
+    for entry in orphaned_stored:
+        freed_blobs.setdefault(entry['blob_hash'], []).append(entry)
+    total_size = sum(
+        entries[0]['size'] for entries in freed_blobs.values()
+        if len(entries) >= entries[0]['refcount']
+    )
     
     print(f"📊 Scan Results:")
-    print(f"   📁 Files on disk: {len(disk_files)}")
     print(f"   🗄️  Files in database: {len(db_files)}")
-    print(f"   🗑️  Orphaned files: {len(orphaned_files)}")
+    print(f"   📦 Stored files: {store.get_stats()['files']} ({store.get_stats()['blobs']} unique blobs)")
+    print(f"   🗑️  Orphaned stored files: {len(orphaned_names)}")
+    print(f"   🗑️  Orphaned flat files: {len(orphaned_legacy)}")
+    print(f"   🎬 Video jobs of removed videos: {len(stale_jobs)}")
     
-    if orphaned_files:
+    if orphaned_names or orphaned_legacy or stale_jobs:
         print(f"\n🗑️  Orphaned files found:")
-        total_size = 0
-        for filename in sorted(orphaned_files):
-            filepath = os.path.join(uploads_dir, filename)
-            if os.path.isfile(filepath):
-                size = os.path.getsize(filepath)
-                total_size += size
-                print(f"   📄 {filename} ({size:,} bytes)")
+        for entry in orphaned_stored:
+            print(f"   📄 {entry['filename']} ({entry['size']:,} bytes, blob {entry['blob_hash'][:12]})")
+        for filename in orphaned_legacy:
+            size = os.path.getsize(os.path.join(uploads_dir, filename))
+            total_size += size
+            print(f"   📄 {filename} ({size:,} bytes)")
+        for job in stale_jobs:
+            print(f"   🎬 Video job {job['id']} of {job['media_path']} ({job['status']})")
         
-        print(f"\n💾 Total space: {total_size:,} bytes ({total_size/1024/1024:.2f} MB)")
+        print(f"\n💾 Space to free: {total_size:,} bytes ({total_size/1024/1024:.2f} MB)")
         
         response = input("\n❓ Delete these orphaned files? (y/N): ").lower().strip()
         if response == 'y':
+            # Jobs first, so a concurrent upload of the same video cannot pick up
+            # the renditions released below
+            dropped_jobs = video_queue.drop_unreferenced_jobs()
+            if dropped_jobs:
+                print(f"   ✅ Deleted {dropped_jobs} video jobs of removed videos")
             deleted_count = 0
-            for filename in orphaned_files:
-                filepath = os.path.join(uploads_dir, filename)
+            for filename in sorted(orphaned_names) + orphaned_legacy:
                 try:
-                    os.remove(filepath)
+                    store.release(filename)
+                    media.delete_variants(uploads_dir, filename)
                     deleted_count += 1
                     print(f"   ✅ Deleted: {filename}")
                 except OSError as e:
@@ -77,6 +88,25 @@ def cleanup_orphaned_files():
     else:
         print("   ✅ No orphaned files found!")
 
+def migrate_to_store(move=False):
+    """Copy (or with move=True, move) flat files of the uploads directory into the media store
+    
+    Copying leaves the flat files in place, so a checkout's tracked demo uploads
+    stay untouched; only moving frees the space of duplicates.
+    """
+    
+    print(f"📦 {'Moving' if move else 'Copying'} uploads into the media store...")
+    store = MediaStore('kuttiapp.db', 'uploads')
+    stats = store.import_legacy_files(move=move)
+    store_stats = store.get_stats()
+    print(f"   ✅ Imported {stats['imported']} files, {stats['deduplicated']} were duplicates")
+    if move:
+        print(f"   💾 Saved {stats['bytes_saved']:,} bytes ({stats['bytes_saved']/1024/1024:.2f} MB)")
+    else:
+        print("   ℹ️  Flat files left in place (run 'migrate --move' to remove them)")
+    print(f"   📦 Store: {store_stats['files']} files in {store_stats['blobs']} blobs, "
+          f"{store_stats['stored_bytes']/1024/1024:.2f} MB on disk")
+
 def list_file_usage():
     """Show detailed file usage statistics"""
     
@@ -111,16 +141,21 @@ def list_file_usage():
     # Disk usage
     uploads_dir = 'uploads'
     if os.path.exists(uploads_dir):
-        files = os.listdir(uploads_dir)
-        total_size = sum(os.path.getsize(os.path.join(uploads_dir, f)) 
-                        for f in files if os.path.isfile(os.path.join(uploads_dir, f)))
+        files = [f for f in os.listdir(uploads_dir) if os.path.isfile(os.path.join(uploads_dir, f))]
+        total_size = sum(os.path.getsize(os.path.join(uploads_dir, f)) for f in files)
+        store_stats = MediaStore('kuttiapp.db', uploads_dir).get_stats()
+        total_size += store_stats['stored_bytes']
         print(f"💾 Total disk usage: {total_size:,} bytes ({total_size/1024/1024:.2f} MB)")
-        print(f"📁 Files on disk: {len(files)}")
+        print(f"📁 Flat files on disk: {len(files)}")
+        print(f"📦 Stored files: {store_stats['files']} in {store_stats['blobs']} blobs "
+              f"({(store_stats['logical_bytes'] - store_stats['stored_bytes'])/1024/1024:.2f} MB saved by deduplication)")
 
 if __name__ == "__main__":
     import sys
     
     if len(sys.argv) > 1 and sys.argv[1] == 'stats':
         list_file_usage()
+    elif len(sys.argv) > 1 and sys.argv[1] == 'migrate':
+        migrate_to_store(move='--move' in sys.argv[2:])
     else:
         cleanup_orphaned_files()
\ No newline at end of file
@@ -10,3 +10,40 @@ load_dotenv(dotenv_path=Path(__file__).parent / '.env')
 class Config:
     SECRET_KEY = os.getenv('FLASK_SECRET_KEY', 'default_secret')
     DATABASE_PATH = os.getenv('DATABASE_PATH', str(Path(__file__).parent / 'kuttiapp.db'))
+    # SQLite connection pool: idle connections kept per database, and per-connection tuning
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '8'))
+    DB_BUSY_TIMEOUT_MS = int(os.getenv('DB_BUSY_TIMEOUT_MS', '5000'))
+    DB_CACHE_SIZE_KB = int(os.getenv('DB_CACHE_SIZE_KB', '20000'))
+    DB_MMAP_SIZE = int(os.getenv('DB_MMAP_SIZE', str(256 * 1024 * 1024)))
+    # Background translation queue
+    TRANSLATION_WORKERS = int(os.getenv('TRANSLATION_WORKERS', '2'))
+    TRANSLATION_MAX_ATTEMPTS = int(os.getenv('TRANSLATION_MAX_ATTEMPTS', '5'))
+    TRANSLATION_RETRY_BASE_SECONDS = float(os.getenv('TRANSLATION_RETRY_BASE_SECONDS', '5'))
+    # In-memory cache in front of the translations table
+    TRANSLATION_CACHE_SIZE = int(os.getenv('TRANSLATION_CACHE_SIZE', '10000'))
+    TRANSLATION_CACHE_TTL_SECONDS = float(os.getenv('TRANSLATION_CACHE_TTL_SECONDS', '600'))
+    # Remote translation calls: global concurrency limit and per-call timeout
+    TRANSLATION_MAX_CONCURRENCY = int(os.getenv('TRANSLATION_MAX_CONCURRENCY', '4'))
+    TRANSLATION_CALL_TIMEOUT_SECONDS = float(os.getenv('TRANSLATION_CALL_TIMEOUT_SECONDS', '15'))
+    # Translation backend: google, local (offline stand-in) or model (on-box hook)
+    TRANSLATION_BACKEND = os.getenv('TRANSLATION_BACKEND', 'google')
+    TRANSLATION_LOCAL_LATENCY_MS = float(os.getenv('TRANSLATION_LOCAL_LATENCY_MS', '0'))
+    TRANSLATION_MODEL_HOOK = os.getenv('TRANSLATION_MODEL_HOOK', '')
+    # Resized image variants served by /uploads/<name>?w=<width>
+    IMAGE_VARIANT_WIDTHS = [int(w) for w in os.getenv('IMAGE_VARIANT_WIDTHS', '160,320,640,1280').split(',')]
+    IMAGE_VARIANT_QUALITY = int(os.getenv('IMAGE_VARIANT_QUALITY', '80'))
+    # Resumable chunked uploads
+    UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', str(5 * 1024 * 1024)))
+    UPLOAD_MAX_SIZE = int(os.getenv('UPLOAD_MAX_SIZE', str(2 * 1024 * 1024 * 1024)))
+    UPLOAD_SESSION_TTL_HOURS = float(os.getenv('UPLOAD_SESSION_TTL_HOURS', '24'))
+    # Background video transcoding (ffmpeg)
+    VIDEO_FFMPEG_PATH = os.getenv('VIDEO_FFMPEG_PATH', 'ffmpeg')
+    VIDEO_WORKERS = int(os.getenv('VIDEO_WORKERS', '1'))
+    VIDEO_MAX_ATTEMPTS = int(os.getenv('VIDEO_MAX_ATTEMPTS', '3'))
+    VIDEO_RETRY_BASE_SECONDS = float(os.getenv('VIDEO_RETRY_BASE_SECONDS', '30'))
+    VIDEO_MAX_HEIGHT = int(os.getenv('VIDEO_MAX_HEIGHT', '720'))
+    VIDEO_MAX_BITRATE_KBPS = int(os.getenv('VIDEO_MAX_BITRATE_KBPS', '1500'))
+    VIDEO_TRANSCODE_TIMEOUT_SECONDS = float(os.getenv('VIDEO_TRANSCODE_TIMEOUT_SECONDS', '1800'))
+    # Compressed snapshots written by export_demo_data.py snapshot
+    SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', 'snapshots')
+    SNAPSHOT_KEEP = int(os.getenv('SNAPSHOT_KEEP', '7'))
@@ -2,14 +2,49 @@
 """
 Export demo data script for KuttiApp
 Creates a complete backup of database and uploads for demo purposes
+
+Usage:
+  python export_demo_data.py             export demo_data/ (JSON + uploads copy)
+  python export_demo_data.py snapshot    write a compressed, incremental snapshot
+
+A snapshot is taken from a consistent copy of the database made with SQLite's
+online backup API, so the app can keep writing meanwhile. Each table is
+streamed to a gzip-compressed newline-delimited JSON file. Media go into a pool
+shared by all snapshots and keyed by content hash; they are hard-linked (or
+copied) only when a hash is new, so a nightly snapshot of a growing database
+costs the compressed tables plus the new media:
+
+  snapshots/media/<aa>/<sha256>              shared media pool
+  snapshots/<timestamp>/manifest.json        tables, row counts, schema version
+  snapshots/<timestamp>/tables/<table>.ndjson.gz
+  snapshots/<timestamp>/media.ndjson.gz      media hashes (and legacy file names)
+
+Only the newest SNAPSHOT_KEEP snapshots are kept; pooled media no longer listed
+by any of them are removed.
 """
 
+import gzip
 import sqlite3
 import json
 import os
 import shutil
+import time
 from datetime import datetime
 
+from config import Config
+from media import file_sha256
+from media_store import MediaStore, link_or_copy
+from migrations import SEARCH_INDEX_TABLES
+
+GZIP_LEVEL = 6
+MEDIA_POOL = 'media'
+# Start time to the microsecond; the first 15 characters are the second
+SNAPSHOT_NAME_FORMAT = '%Y%m%dT%H%M%S.%f'
+# Snapshots are written under <name>.tmp and renamed once complete
+WORK_SUFFIX = '.tmp'
+# SQLite statistics tables and the full-text search indexes are rebuilt, not restored
+SKIPPED_TABLES = {'sqlite_stat1', 'sqlite_stat4'} | SEARCH_INDEX_TABLES
+
 def export_demo_data():
     """Export current database content and uploads as demo data"""
     
@@ -28,7 +63,7 @@ def export_demo_data():
     
     # Get all tables
     cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    tables = [table[0] for table in cursor.fetchall()]
+    tables = [table[0] for table in cursor.fetchall() if table[0] not in SKIPPED_TABLES]
     
     demo_data = {}
     
@@ -55,10 +90,12 @@ def export_demo_data():
     
     if os.path.exists(uploads_src):
         print(f"  📁 Copying uploads directory...")
-        shutil.copytree(uploads_src, uploads_dest)
+        # Deduplicated blobs are copied as they are; variants and unfinished uploads are skipped
+        shutil.copytree(uploads_src, uploads_dest, ignore=shutil.ignore_patterns('.variants', '.partial', '*.tmp'))
         
         # Count files
         file_count = len([f for f in os.listdir(uploads_dest) if os.path.isfile(os.path.join(uploads_dest, f))])
+        file_count += sum(len(files) for _, _, files in os.walk(os.path.join(uploads_dest, '.blobs')))
         print(f"    ✅ Copied {file_count} media files")
     else:
         print("  ⚠️  No uploads directory found")
@@ -81,5 +118,212 @@ def export_demo_data():
     print(f"   📁 Data saved in: {demo_dir}/")
     print(f"   🕒 Export time: {metadata['export_date']}")
 
+def snapshot_pool_path(snapshot_dir, blob_hash):
+    return os.path.join(snapshot_dir, MEDIA_POOL, blob_hash[:2], blob_hash)
+
+
+def write_ndjson(path, rows):
+    """Stream rows (dicts) to a gzip-compressed newline-delimited JSON file; returns the row count"""
+    count = 0
+    with gzip.open(path, 'wt', encoding='utf-8', compresslevel=GZIP_LEVEL) as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False, default=str))
+            f.write('\n')
+            count += 1
+    return count
+
+
+def read_ndjson(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_table_rows(conn, table):
+    cursor = conn.execute(f'SELECT * FROM "{table}"')
+    columns = [column[0] for column in cursor.description]
+    for row in cursor:
+        yield dict(zip(columns, row))
+
+
+def snapshot_media(conn, store, snapshot_dir, stats):
+    """Yield the media entries of the snapshot, adding new content to the pool"""
+    def add_to_pool(source, blob_hash):
+        target = snapshot_pool_path(snapshot_dir, blob_hash)
+        if os.path.exists(target):
+            stats['existing'] += 1
+        elif link_or_copy(source, target):
+            stats['linked'] += 1
+        else:
+            stats['copied'] += 1
+
+    # Blobs of the media store, as listed in the backup copy
+    for row in conn.execute('SELECT hash, size FROM media_blobs ORDER BY hash'):
+        source = store.blob_path(row[0])
+        if not os.path.isfile(source):
+            print(f"  ⚠️  Blob {row[0][:12]} is missing from the media store, skipping")
+            continue
+        add_to_pool(source, row[0])
+        yield {'hash': row[0], 'size': row[1]}
+
+    # Flat files from before the media store are hashed and pooled too
+    for name in store.legacy_files():
+        source = os.path.join(store.upload_folder, name)
+        blob_hash = file_sha256(source)
+        add_to_pool(source, blob_hash)
+        yield {'filename': name, 'hash': blob_hash, 'size': os.path.getsize(source)}
+
+
+def export_snapshot(snapshot_dir=None, db_path='kuttiapp.db', upload_folder='uploads'):
+    """Write a compressed snapshot of the database and media; returns its directory"""
+    snapshot_dir = snapshot_dir or Config.SNAPSHOT_DIR
+    started = time.perf_counter()
+    name, target, work_dir = create_work_dir(snapshot_dir)
+
+    print(f"🔄 Writing snapshot {name}...")
+    try:
+        manifest = write_snapshot(work_dir, snapshot_dir, db_path, upload_folder)
+        os.replace(work_dir, target)
+    except Exception:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise
+
+    size = sum(os.path.getsize(os.path.join(dirpath, f)) for dirpath, _, files in os.walk(target) for f in files)
+    print(f"\n✅ Snapshot written to {target} ({size / 1024:.0f} KB without media, "
+          f"{manifest['media']['count']} media files) in {time.perf_counter() - started:.1f} s")
+
+    prune_snapshots(snapshot_dir)
+    return target
+
+
+def create_work_dir(snapshot_dir):
+    """Reserve a snapshot name and create its work directory; returns (name, target, work_dir)
+
+    Names are the start time, so they sort in creation order. Creating the work
+    directory is the reservation: when the name is taken, by a finished snapshot
+    or a concurrent export, a new one is drawn.
+    """
+    os.makedirs(snapshot_dir, exist_ok=True)
+    while True:
+        name = datetime.now().strftime(SNAPSHOT_NAME_FORMAT)
+        target = os.path.join(snapshot_dir, name)
+        work_dir = target + WORK_SUFFIX
+        if os.path.exists(target):
+            continue
+        try:
+            os.mkdir(work_dir)
+        except FileExistsError:
+            continue
+        if os.path.exists(target):  # finished and renamed just before the mkdir
+            os.rmdir(work_dir)
+            continue
+        os.mkdir(os.path.join(work_dir, 'tables'))
+        return name, target, work_dir
+
+
+def write_snapshot(work_dir, snapshot_dir, db_path, upload_folder):
+    """Write tables, media list and manifest into work_dir; returns the manifest"""
+
+    # Consistent copy of the database through the online backup API
+    backup_path = os.path.join(work_dir, 'backup.db')
+    source = sqlite3.connect(db_path)
+    backup = sqlite3.connect(backup_path)
+    source.backup(backup)
+    source.close()
+
+    manifest = {
+        'created_at': datetime.now().isoformat(),
+        'schema_version': backup.execute('PRAGMA user_version').fetchone()[0],
+        'tables': {},
+    }
+    tables = [row[0] for row in backup.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
+    ).fetchall() if row[0] not in SKIPPED_TABLES]
+
+    for table in tables:
+        filename = f'tables/{table}.ndjson.gz'
+        rows = write_ndjson(os.path.join(work_dir, filename), iter_table_rows(backup, table))
+        manifest['tables'][table] = {'file': filename, 'rows': rows}
+        print(f"  📋 {table}: {rows} rows")
+
+    media_stats = {'linked': 0, 'copied': 0, 'existing': 0}
+    store = MediaStore(db_path, upload_folder)
+    manifest['media'] = {
+        'file': 'media.ndjson.gz',
+        'count': write_ndjson(os.path.join(work_dir, 'media.ndjson.gz'),
+                              snapshot_media(backup, store, snapshot_dir, media_stats)),
+    }
+    backup.close()
+    os.remove(backup_path)
+
+    print(f"  📁 Media: {manifest['media']['count']} files, {media_stats['linked']} linked, "
+          f"{media_stats['copied']} copied, {media_stats['existing']} already in the pool")
+
+    with open(os.path.join(work_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def list_snapshots(snapshot_dir):
+    if not os.path.isdir(snapshot_dir):
+        return []
+    return sorted(
+        name for name in os.listdir(snapshot_dir)
+        if not name.endswith(WORK_SUFFIX)
+        and os.path.isfile(os.path.join(snapshot_dir, name, 'manifest.json'))
+    )
+
+
+def oldest_export_in_progress(snapshot_dir):
+    """Start time (epoch seconds) of the oldest snapshot still being written, or None"""
+    started = [
+        datetime.strptime(name[:15], '%Y%m%dT%H%M%S').timestamp()
+        for name in os.listdir(snapshot_dir)
+        if name.endswith(WORK_SUFFIX) and os.path.isdir(os.path.join(snapshot_dir, name))
+    ]
+    return min(started) if started else None
+
+
+def prune_snapshots(snapshot_dir, keep=None):
+    """Keep the newest snapshots and drop pooled media that none of them lists
+
+    Media pooled since the oldest export still in progress are kept: that
+    export may list them, but its media list is not readable until it finishes.
+    """
+    keep = Config.SNAPSHOT_KEEP if keep is None else keep
+    snapshots = list_snapshots(snapshot_dir)
+    removed = snapshots[:-keep] if keep > 0 else []
+    for name in removed:
+        shutil.rmtree(os.path.join(snapshot_dir, name))
+
+    referenced = set()
+    for name in snapshots[len(removed):]:
+        for entry in read_ndjson(os.path.join(snapshot_dir, name, 'media.ndjson.gz')):
+            referenced.add(entry['hash'])
+
+    # Linking or copying a blob into the pool sets its ctime; start times are
+    # read to the second, hence the one-second margin
+    in_progress = oldest_export_in_progress(snapshot_dir)
+    freed = 0
+    for dirpath, _, files in os.walk(os.path.join(snapshot_dir, MEDIA_POOL)):
+        for blob_hash in files:
+            if blob_hash in referenced:
+                continue
+            path = os.path.join(dirpath, blob_hash)
+            stat = os.stat(path)
+            if in_progress is not None and stat.st_ctime >= in_progress - 1:
+                continue
+            freed += stat.st_size
+            os.remove(path)
+    if removed or freed:
+        print(f"  🧹 Removed {len(removed)} old snapshots, freed {freed / 1024 / 1024:.1f} MB of media")
+
+
 if __name__ == "__main__":
-    export_demo_data()
\ No newline at end of file
+    import sys
+    
+    if len(sys.argv) > 1 and sys.argv[1] == 'snapshot':
+        export_snapshot(sys.argv[2] if len(sys.argv) > 2 else None)
+    else:
+        export_demo_data()
\ No newline at end of file
@@ -2,26 +2,315 @@
 """
 Import demo data script for KuttiApp
 Restores demo database and uploads from exported data
+
+database_demo.json is read as a stream, one record at a time, and rows are
+written with batched executemany calls while foreign key checks are off, so
+memory stays bounded and large datasets load in seconds. The whole load is a
+single transaction: if it fails, the previous data is left as it was. For that
+reason journaling and synchronous writes stay at SQLite's defaults instead of
+being relaxed for speed: the rollback journal is what makes the load atomic.
+
+Uploads are synced incrementally: only media whose content changed since the
+last import are copied.
+
+Usage:
+  python import_demo_data.py                    import demo_data/
+  python import_demo_data.py snapshot [path]    restore a snapshot (default: the newest)
 """
 
 import sqlite3
 import json
 import os
 import shutil
-from datetime import datetime
+import time
+
+import media
+from config import Config
+from export_demo_data import list_snapshots, read_ndjson, snapshot_pool_path
+from media_store import BLOBS_DIR, MediaStore, link_or_copy
+from migrations import (LATEST_VERSION, SEARCH_INDEX_TABLES, drop_search_triggers, migrate,
+                        rebuild_search_index)
+
+READ_CHUNK_SIZE = 1024 * 1024
+IMPORT_BATCH_SIZE = 10000
+
+# SQLite internal tables: sqlite_sequence is restored at the end, statistics are rebuilt.
+# The search indexes are rebuilt from their content tables after the load.
+SKIPPED_TABLES = {'sqlite_stat1', 'sqlite_stat4'} | SEARCH_INDEX_TABLES
+
+
+class JsonStream:
+    """Incremental reader for a JSON document of the form {"table": [record, ...], ...}
+
+    Only the record being decoded and one read chunk are held in memory.
+    """
+
+    def __init__(self, f, chunk_size=READ_CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+
+    def _fill(self):
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next character ('' at the end of the file)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Malformed demo data: expected one of {chars!r}, found {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number that ends the buffer may continue in the next chunk
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def items(self):
+        """Yield the values of the array that starts at the current position"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(',]') == ']':
+                return
+
+
+def iter_tables(path):
+    """Yield (table_name, records) for each table of an export
+
+    records is a generator over the rows of that table; it must be consumed
+    before moving to the next table (unconsumed rows are skipped).
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = JsonStream(f)
+        stream.expect('{')
+        if stream.peek() == '}':
+            return
+        while True:
+            table_name = stream.value()
+            stream.expect(':')
+            records = stream.items()
+            yield table_name, records
+            for _ in records:
+                pass
+            if stream.expect(',}') == '}':
+                return
+
+
+def load_table(conn, table_name, records, db_columns):
+    """Replace the content of a table with records, in batches of IMPORT_BATCH_SIZE rows
+
+    Keys of the records that the table does not have are ignored. Nothing is
+    committed here: the caller holds the transaction. Returns the number of
+    rows inserted.
+    """
+    conn.execute(f'DELETE FROM "{table_name}"')
+
+    columns, insert_sql = None, None
+    batch, count = [], 0
+    for record in records:
+        if columns is None:
+            columns = [column for column in record if column in db_columns]
+            ignored = [column for column in record if column not in db_columns]
+            if ignored:
+                print(f"  ⚠️  Ignoring columns missing from {table_name}: {', '.join(ignored)}")
+            placeholders = ','.join('?' for _ in columns)
+            quoted = ','.join(f'"{column}"' for column in columns)
+            insert_sql = f'INSERT INTO "{table_name}" ({quoted}) VALUES ({placeholders})'
+        batch.append([record.get(column) for column in columns])
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            conn.executemany(insert_sql, batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        conn.executemany(insert_sql, batch)
+        count += len(batch)
+    return count
+
+
+def load_database(db_path, table_records):
+    """Stream exported tables into the database
+
+    table_records yields (table_name, records), as iter_tables() does.
+
+    Returns:
+        (number of imported rows, names of the imported tables)
+    """
+    # Transactions are managed explicitly: the whole load is one of them
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    cursor = conn.cursor()
+
+    # No foreign key checks during the load (rows arrive table by table); the
+    # result is checked once at the end. One commit means a single fsync.
+    cursor.execute('PRAGMA foreign_keys = OFF')
+    cursor.execute('PRAGMA cache_size = -65536')
+
+    tables = {
+        row[0]: {column[1] for column in cursor.execute(f'PRAGMA table_info("{row[0]}")').fetchall()}
+        for row in cursor.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
+    }
+
+    total = 0
+    sequences = []
+    imported = set()
+    table_name = None
+    cursor.execute('BEGIN IMMEDIATE')
+    try:
+        # Indexing every row through the search triggers would dominate the load:
+        # the indexes are rebuilt in one pass at the end instead
+        drop_search_triggers(conn)
+        for table_name, records in table_records:
+            if table_name == 'sqlite_sequence':
+                sequences = list(records)  # one small row per table, applied last
+                continue
+            if table_name in SKIPPED_TABLES:
+                continue
+            if table_name not in tables:
+                print(f"  ⚠️  Table {table_name} does not exist, skipping...")
+                continue
+
+            started = time.perf_counter()
+            count = load_table(conn, table_name, records, tables[table_name])
+            total += count
+            imported.add(table_name)
+            print(f"  📋 Imported {count} records into {table_name} "
+                  f"({time.perf_counter() - started:.2f} s)")
+
+        # Reset sequences
+        if sequences:
+            cursor.execute("DELETE FROM sqlite_sequence")
+            cursor.executemany("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)",
+                               [(seq_record['name'], seq_record['seq']) for seq_record in sequences])
+
+        violations = cursor.execute('PRAGMA foreign_key_check').fetchall()
+        if violations:
+            tables_with_violations = sorted({row[0] for row in violations})
+            print(f"  ⚠️  {len(violations)} rows reference missing records "
+                  f"(in {', '.join(tables_with_violations)})")
+
+        table_name = None
+        started = time.perf_counter()
+        rebuild_search_index(conn)
+        print(f"  🔎 Rebuilt the search indexes ({time.perf_counter() - started:.2f} s)")
+        cursor.execute('COMMIT')
+    except (sqlite3.Error, ValueError) as e:
+        # The previous data, and the search triggers, come back with the rollback
+        cursor.execute('ROLLBACK')
+        print(f"❌ Error importing {table_name or 'the search indexes'}: {e}")
+        print("   The database was left unchanged")
+        raise
+    finally:
+        conn.close()
+
+    return total, imported
+
+
+def file_unchanged(source, target):
+    """Quick check by size and modification time, like rsync"""
+    try:
+        source_stat, target_stat = os.stat(source), os.stat(target)
+    except OSError:
+        return False
+    return source_stat.st_size == target_stat.st_size and target_stat.st_mtime >= source_stat.st_mtime
+
+
+def sync_uploads(store, source, reconcile):
+    """Bring the media store in line with exported uploads, copying only what changed
+
+    Exported blobs (source/.blobs) are content-addressed, so only missing ones
+    are copied. Flat files are compared with the blob stored under the same
+    name: first by size and mtime, then by content hash. With reconcile=True
+    (the export has no media store tables) filenames missing from the export
+    are released, so the store ends up holding exactly the exported files.
+    """
+    stats = {'copied': 0, 'deduplicated': 0, 'unchanged': 0, 'removed': 0}
+
+    for dirpath, _, files in os.walk(os.path.join(source, BLOBS_DIR)):
+        for name in files:
+            if name.endswith('.tmp'):
+                continue
+            target = store.blob_path(name)
+            if os.path.exists(target):
+                stats['unchanged'] += 1
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy2(os.path.join(dirpath, name), target)
+            stats['copied'] += 1
+
+    names = sorted(
+        name for name in os.listdir(source)
+        if not name.startswith('.') and os.path.isfile(os.path.join(source, name))
+    )
+    for name in names:
+        path = os.path.join(source, name)
+        current = store.resolve(name)
+        blob_hash = None
+        # Only stored files are replaced; a flat file of the same name is left in
+        # place and the stored copy is served instead
+        if current and current[1]:
+            if file_unchanged(path, current[0]):
+                stats['unchanged'] += 1
+                continue
+            blob_hash = media.file_sha256(path)
+            if blob_hash == current[1]:
+                stats['unchanged'] += 1
+                continue
+            store.release(name)
+            media.delete_variants(store.upload_folder, name)
+        _, deduplicated = store.put_file(path, name, blob_hash, move=False)
+        stats['deduplicated' if deduplicated else 'copied'] += 1
+
+    if reconcile:
+        for name in sorted(store.filenames() - set(names)):
+            store.release(name)
+            media.delete_variants(store.upload_folder, name)
+            stats['removed'] += 1
+    return stats
+
 
 def import_demo_data():
     """Import demo data into database and restore uploads"""
-    
+
     demo_dir = "demo_data"
-    
+
     if not os.path.exists(demo_dir):
         print("❌ No demo_data directory found!")
         print("   Run export_demo_data.py first to create demo data")
         return False
-    
+
     print("🔄 Importing demo data...")
-    
+    started = time.perf_counter()
+
     # Load metadata
     metadata_file = os.path.join(demo_dir, 'metadata.json')
     if os.path.exists(metadata_file):
@@ -29,123 +318,109 @@ def import_demo_data():
             metadata = json.load(f)
         print(f"  📋 Demo data from: {metadata['export_date']}")
         print(f"  📊 {metadata['database_tables']} tables, {metadata['total_records']} records")
-    
-    # Connect to database
-    conn = sqlite3.connect('kuttiapp.db')
-    cursor = conn.cursor()
-    
-    # Verify database schema exists
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    tables = [row[0] for row in cursor.fetchall()]
-    if not tables:
-        print("❌ Database appears to be empty! Run reset_db.py first.")
-        conn.close()
-        return False
-    
-    print(f"  📊 Found {len(tables)} tables in database: {', '.join(tables)}")
-    
-    # Check and fix database schema to match demo data
-    cursor.execute("PRAGMA table_info(users)")
-    user_columns = [row[1] for row in cursor.fetchall()]
-    missing_user_cols = []
-    if 'full_name' not in user_columns:
-        missing_user_cols.append('full_name TEXT')
-    if 'bio' not in user_columns:
-        missing_user_cols.append('bio TEXT')
-    if 'ui_language' not in user_columns:
-        missing_user_cols.append('ui_language TEXT DEFAULT "it"')
-    
-    for col_def in missing_user_cols:
-        try:
-            cursor.execute(f"ALTER TABLE users ADD COLUMN {col_def}")
-            print(f"  🔧 Added missing column {col_def.split()[0]} to users table")
-        except sqlite3.Error as e:
-            print(f"  ⚠️  Could not add column to users: {e}")
-    
-    cursor.execute("PRAGMA table_info(children)")
-    child_columns = [row[1] for row in cursor.fetchall()]
-    if 'sponsor_id' not in child_columns:
-        try:
-            cursor.execute("ALTER TABLE children ADD COLUMN sponsor_id INTEGER")
-            print("  🔧 Added missing sponsor_id column to children table")
-        except sqlite3.Error as e:
-            print(f"  ⚠️  Could not add sponsor_id to children: {e}")
-    
+
+    # Bring the schema up to date, so the demo data finds every table and column
+    version = migrate('kuttiapp.db')
+    print(f"  📊 Database schema at version {version}")
+
     # Load demo data
     demo_data_file = os.path.join(demo_dir, 'database_demo.json')
-    with open(demo_data_file, 'r', encoding='utf-8') as f:
-        demo_data = json.load(f)
-    
-    # Clear existing data and import demo data
-    for table_name, records in demo_data.items():
-        if table_name == 'sqlite_sequence':
-            continue  # Skip sequence table
-            
-        print(f"  📋 Importing {len(records)} records into {table_name}")
-        
-        # Check if table exists before trying to delete from it
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
-        if not cursor.fetchone():
-            print(f"  ⚠️  Table {table_name} does not exist, skipping...")
-            continue
-        
-        # Clear existing data
-        cursor.execute(f"DELETE FROM {table_name}")
-        
-        if records:
-            # Get column names from first record
-            columns = list(records[0].keys())
-            placeholders = ','.join(['?' for _ in columns])
-            
-            # Insert demo data
-            insert_sql = f"INSERT INTO {table_name} ({','.join(columns)}) VALUES ({placeholders})"
-            
-            try:
-                for record in records:
-                    values = [record[col] for col in columns]
-                    cursor.execute(insert_sql, values)
-            except sqlite3.OperationalError as e:
-                print(f"❌ Error inserting into {table_name}: {e}")
-                print(f"   Columns in data: {columns}")
-                cursor.execute(f"PRAGMA table_info({table_name})")
-                db_columns = [row[1] for row in cursor.fetchall()]
-                print(f"   Columns in database: {db_columns}")
-                conn.rollback()
-                conn.close()
-                return False
-    
-    # Reset sequences
-    if 'sqlite_sequence' in demo_data:
-        cursor.execute("DELETE FROM sqlite_sequence")
-        for seq_record in demo_data['sqlite_sequence']:
-            cursor.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", 
-                         (seq_record['name'], seq_record['seq']))
-    
-    conn.commit()
-    conn.close()
-    
+    try:
+        total, imported = load_database('kuttiapp.db', iter_tables(demo_data_file))
+    except (sqlite3.Error, ValueError):
+        return False
+    print(f"  ✅ {total} records imported")
+
     # Restore uploads directory
     uploads_src = os.path.join(demo_dir, "uploads")
-    uploads_dest = "uploads"
-    
+
     if os.path.exists(uploads_src):
-        print(f"  📁 Restoring uploads directory...")
-        
-        # Remove existing uploads
-        if os.path.exists(uploads_dest):
-            shutil.rmtree(uploads_dest)
-        
-        # Copy demo uploads
-        shutil.copytree(uploads_src, uploads_dest)
-        
-        file_count = len([f for f in os.listdir(uploads_dest) if os.path.isfile(os.path.join(uploads_dest, f))])
-        print(f"    ✅ Restored {file_count} media files")
+        print(f"  📁 Syncing uploads directory...")
+        store = MediaStore('kuttiapp.db', 'uploads')
+
+        # Flat files already in uploads/ (the tracked demo files) are left alone:
+        # the restored copies go into the store and are served in their place.
+        # Without media store tables in the export, the store is rebuilt from its files
+        stats = sync_uploads(store, uploads_src, reconcile='media_files' not in imported)
+        store_stats = store.get_stats()
+        print(f"    ✅ {store_stats['files']} media files ({store_stats['blobs']} unique): "
+              f"{stats['copied']} copied, {stats['deduplicated']} deduplicated, "
+              f"{stats['unchanged']} unchanged, {stats['removed']} removed")
     else:
         print("  ⚠️  No demo uploads found")
-    
-    print(f"\n✅ Demo data imported successfully!")
+
+    print(f"\n✅ Demo data imported successfully in {time.perf_counter() - started:.1f} s!")
     print(f"   🚀 KuttiApp is ready with sample data!")
     return True
 
+def restore_snapshot_media(store, snapshot_root, media_file):
+    """Place the media of a snapshot in the store, linking or copying only missing content"""
+    stats = {'restored': 0, 'unchanged': 0}
+    for entry in read_ndjson(media_file):
+        pooled = snapshot_pool_path(snapshot_root, entry['hash'])
+        name = entry.get('filename')
+        if name is None:
+            # Blob listed by the restored media_blobs table
+            if os.path.exists(store.blob_path(entry['hash'])):
+                stats['unchanged'] += 1
+                continue
+            link_or_copy(pooled, store.blob_path(entry['hash']))
+        else:
+            # Flat file from before the media store
+            current = store.resolve(name)
+            if current and current[1] == entry['hash']:
+                stats['unchanged'] += 1
+                continue
+            if current and current[1]:
+                store.release(name)
+                media.delete_variants(store.upload_folder, name)
+            store.put_file(pooled, name, entry['hash'], entry['size'], move=False)
+        stats['restored'] += 1
+    return stats
+
+
+def import_snapshot(snapshot_path=None):
+    """Restore a snapshot written by export_demo_data.py snapshot (default: the newest)"""
+    if snapshot_path is None:
+        snapshots = list_snapshots(Config.SNAPSHOT_DIR)
+        if not snapshots:
+            print(f"❌ No snapshots found in {Config.SNAPSHOT_DIR}/")
+            return False
+        snapshot_path = os.path.join(Config.SNAPSHOT_DIR, snapshots[-1])
+
+    with open(os.path.join(snapshot_path, 'manifest.json'), 'r') as f:
+        manifest = json.load(f)
+    if manifest['schema_version'] > LATEST_VERSION:
+        print(f"❌ Snapshot schema version {manifest['schema_version']} is newer than this code ({LATEST_VERSION})")
+        return False
+
+    print(f"🔄 Restoring snapshot from {manifest['created_at']}...")
+    started = time.perf_counter()
+    version = migrate('kuttiapp.db')
+    print(f"  📊 Database schema at version {version}")
+
+    table_records = (
+        (table, read_ndjson(os.path.join(snapshot_path, entry['file'])))
+        for table, entry in manifest['tables'].items()
+    )
+    try:
+        total, _ = load_database('kuttiapp.db', table_records)
+    except (sqlite3.Error, ValueError):
+        return False
+    print(f"  ✅ {total} records imported")
+
+    store = MediaStore('kuttiapp.db', 'uploads')
+    stats = restore_snapshot_media(store, os.path.dirname(os.path.abspath(snapshot_path)),
+                                   os.path.join(snapshot_path, manifest['media']['file']))
+    print(f"  📁 Media: {stats['restored']} restored, {stats['unchanged']} unchanged")
+
+    print(f"\n✅ Snapshot restored in {time.perf_counter() - started:.1f} s!")
+    return True
+
 if __name__ == "__main__":
-    import_demo_data()
+    import sys
+    
+    if len(sys.argv) > 1 and sys.argv[1] == 'snapshot':
+        import_snapshot(sys.argv[2] if len(sys.argv) > 2 else None)
+    else:
+        import_demo_data()
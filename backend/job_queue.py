@@ -0,0 +1,198 @@
+"""
+KUTTIAPP - Durable Job Queue
+SQLite-backed job queue with a pool of worker threads, shared by the
+translation and video queues
+
+- Jobs are rows of a jobs table (id, status, attempts, last_error, run_after,
+  created_at, updated_at plus the subclass's own columns), so pending work
+  survives restarts
+- Workers claim the oldest runnable job in a write transaction, so a job is
+  never run twice at the same time
+- Failed jobs are retried with exponential backoff up to a maximum number of attempts
+
+Subclasses set the table, the worker name and the statuses, implement
+process_job() and enqueue their own jobs, then call _wake_worker().
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from migrations import ensure_schema
+from models import get_db_connection
+
+MAX_RETRY_DELAY_SECONDS = 3600
+
+
+class JobQueue:
+    """
+    Base class of the durable background queues
+    """
+
+    # Jobs table and the name used for worker threads and log messages
+    table = ''
+    name = ''
+    STATUSES = ('pending', 'running', 'done', 'failed')
+    # Columns returned by get_job()
+    JOB_COLUMNS = '*'
+    # Extra SQL condition on the candidate job 'j' when claiming
+    CLAIM_CONDITION = ''
+
+    def __init__(self, db_path: str, workers: int, max_attempts: int,
+                 retry_base_seconds: float, poll_interval: float):
+        self.db_path = db_path
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.poll_interval = poll_interval
+
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._stop = threading.Event()
+        # Log under the subclass's module, e.g. translation_queue
+        self.logger = logging.getLogger(type(self).__module__)
+
+        ensure_schema(self.db_path)
+
+    def process_job(self, job: Dict):
+        """
+        Run one claimed job and mark it done; an exception schedules a retry
+        """
+        raise NotImplementedError
+
+    def can_start(self) -> bool:
+        """
+        Whether workers can run at all (e.g. a required binary is installed)
+        """
+        return True
+
+    def get_job(self, job_id: int) -> Optional[Dict]:
+        """
+        Return the status of a job, or None if it does not exist
+        """
+        conn = get_db_connection(self.db_path)
+        row = conn.execute(f'SELECT {self.JOB_COLUMNS} FROM {self.table} WHERE id = ?', (job_id,)).fetchone()
+        conn.close()
+        return dict(row) if row else None
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Return the number of jobs in each status
+        """
+        conn = get_db_connection(self.db_path)
+        counts = dict(conn.execute(f'SELECT status, COUNT(*) FROM {self.table} GROUP BY status').fetchall())
+        conn.close()
+        return {status: counts.get(status, 0) for status in self.STATUSES}
+
+    def start(self):
+        """
+        Start the worker threads (idempotent)
+
+        Jobs left 'running' by a previous process are put back to 'pending'.
+        """
+        with self._start_lock:
+            if self._threads or not self.can_start():
+                return
+            conn = get_db_connection(self.db_path)
+            conn.execute(f'''
+                UPDATE {self.table} SET status = 'pending', updated_at = ? WHERE status = 'running'
+            ''', (datetime.now().isoformat(),))
+            conn.commit()
+            conn.close()
+
+            self._stop.clear()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f'{self.name}-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            self.logger.info(f"Started {self.workers} {self.name} workers")
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Ask the workers to exit once their current job is finished
+        """
+        self._stop.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _wake_worker(self):
+        """
+        Start the workers if needed and wake one up for a newly queued job
+        """
+        self.start()
+        with self._wakeup:
+            self._wakeup.notify()
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            try:
+                job = self._claim_next_job()
+            except Exception as e:
+                self.logger.error(f"Error claiming {self.name} job: {e}")
+                job = None
+
+            if job is None:
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_interval)
+                continue
+
+            self._run_job(job)
+
+    def _claim_next_job(self) -> Optional[Dict]:
+        """
+        Atomically mark the oldest runnable job as running and return it
+        """
+        now = datetime.now().isoformat()
+        conn = get_db_connection(self.db_path)
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            job = conn.execute(f'''
+                SELECT * FROM {self.table} j
+                WHERE j.status = 'pending' AND j.run_after <= ?
+                {self.CLAIM_CONDITION}
+                ORDER BY j.id
+                LIMIT 1
+            ''', (now,)).fetchone()
+            if job is None:
+                conn.rollback()
+                return None
+            conn.execute(f'''
+                UPDATE {self.table} SET status = 'running', attempts = attempts + 1, updated_at = ?
+                WHERE id = ?
+            ''', (now, job['id']))
+            conn.commit()
+            job = dict(job)
+            job['attempts'] += 1
+            return job
+        finally:
+            conn.close()
+
+    def _run_job(self, job: Dict):
+        label = f"{self.name.capitalize()} job {job['id']}"
+        try:
+            self.process_job(job)
+        except Exception as e:
+            if job['attempts'] >= self.max_attempts:
+                self._finish_job(job['id'], 'failed', str(e))
+                self.logger.error(f"{label} failed after {job['attempts']} attempts: {e}")
+            else:
+                delay = min(self.retry_base_seconds * 2 ** (job['attempts'] - 1), MAX_RETRY_DELAY_SECONDS)
+                self._finish_job(job['id'], 'pending', str(e), datetime.now() + timedelta(seconds=delay))
+                self.logger.warning(f"{label} attempt {job['attempts']} failed, retrying in {delay:g}s: {e}")
+
+    def _finish_job(self, job_id: int, status: str, error: Optional[str] = None,
+                    run_after: Optional[datetime] = None):
+        now = datetime.now()
+        conn = get_db_connection(self.db_path)
+        conn.execute(f'''
+            UPDATE {self.table}
+            SET status = ?, last_error = ?, run_after = ?, updated_at = ?
+            WHERE id = ?
+        ''', (status, error, (run_after or now).isoformat(), now.isoformat(), job_id))
+        conn.commit()
+        conn.close()
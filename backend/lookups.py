@@ -0,0 +1,67 @@
+"""
+KUTTIAPP - Reference data for form dropdowns
+Compact id/label pairs for users (grouped by role), missions and children
+
+The payload is built with three small queries and kept in process memory until
+a write to users, missions or children invalidates it, so opening a form costs
+one cached response. Its version is a hash of the content: it is stable across
+restarts and worker processes and doubles as the HTTP ETag.
+
+- Labels are the original texts (full name or username for users)
+- Writes made outside the app (imports, scripts) are picked up after a restart
+"""
+
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from models import get_db_connection
+
+USER_ROLES = ('admin', 'sponsor', 'referent', 'local_referent')
+
+_cache: Optional[Tuple[str, Dict[str, Any]]] = None
+_generation = 0
+_cache_lock = threading.Lock()
+
+
+def _build_lookups() -> Dict[str, Any]:
+    conn = get_db_connection()
+    try:
+        users = {role: [] for role in USER_ROLES}
+        for row in conn.execute('SELECT id, role, full_name, username FROM users ORDER BY id'):
+            users.setdefault(row['role'], []).append([row['id'], row['full_name'] or row['username']])
+        missions = [[row['id'], row['name']] for row in conn.execute('SELECT id, name FROM missions ORDER BY id')]
+        children = [[row['id'], row['name']] for row in conn.execute('SELECT id, name FROM children ORDER BY id')]
+    finally:
+        conn.close()
+    return {'users': users, 'missions': missions, 'children': children}
+
+
+def get_lookups() -> Tuple[str, Dict[str, Any]]:
+    """Return (version, payload), rebuilding the payload if a write invalidated it"""
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            return _cache
+        generation = _generation
+
+    lookups = _build_lookups()
+    body = json.dumps(lookups, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    version = hashlib.sha1(body).hexdigest()[:16]
+    payload = {'version': version, **lookups}
+
+    with _cache_lock:
+        # A write committed while the queries ran makes this payload stale: serve it
+        # to this request only and let the next one rebuild
+        if generation == _generation:
+            _cache = (version, payload)
+    return version, payload
+
+
+def invalidate_lookups() -> None:
+    """Drop the cached payload; call after committing a write to users, missions or children"""
+    global _cache, _generation
+    with _cache_lock:
+        _cache = None
+        _generation += 1
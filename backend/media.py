@@ -0,0 +1,220 @@
+"""
+KUTTIAPP - Media helpers
+MIME types, content-hash ETags and resized/WebP variants of uploaded images
+
+Variants are generated lazily on first request and cached on disk next to the
+uploads, in a hidden directory (uploads/.variants). A variant is regenerated
+when the original is newer than the cached file.
+
+Requires Pillow; without it the original files are served unchanged.
+"""
+
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import threading
+import uuid
+from collections import OrderedDict
+
+from config import Config
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional: variants are simply not generated
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_DIR = '.variants'
+
+# Formats that can be resized; animated GIFs and videos are always served as uploaded
+RESIZABLE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'bmp', 'webp'}
+
+# Pillow format and MIME type for each variant extension
+VARIANT_FORMATS = {
+    'jpg': ('JPEG', 'image/jpeg'),
+    'png': ('PNG', 'image/png'),
+    'webp': ('WEBP', 'image/webp'),
+}
+
+# Explicit types for the allowed upload extensions; anything else goes through mimetypes
+MIME_TYPES = {
+    'png': 'image/png',
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'gif': 'image/gif',
+    'bmp': 'image/bmp',
+    'webp': 'image/webp',
+    'mp4': 'video/mp4',
+    'avi': 'video/x-msvideo',
+    'mov': 'video/quicktime',
+    'mkv': 'video/x-matroska',
+    'webm': 'video/webm',
+}
+
+# upload_file names files '<name>_<8 hex chars>.<ext>': their content never changes
+IMMUTABLE_NAME = re.compile(r'_[0-9a-f]{8}(\.[A-Za-z0-9]+\.w\d+)?\.[A-Za-z0-9]+$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+ETAG_CACHE_SIZE = 4096
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+_etags = OrderedDict()
+_etags_lock = threading.Lock()
+
+
+def mimetype_for(filename):
+    ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    return MIME_TYPES.get(ext) or mimetypes.guess_type(filename)[0]
+
+
+def is_immutable(filename):
+    """True for uuid-suffixed upload names (and their variants), which are never overwritten"""
+    return bool(IMMUTABLE_NAME.search(filename))
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def content_etag(path):
+    """Strong ETag from the SHA-256 of the file content
+
+    Hashes are remembered per path while size and mtime are unchanged, so a
+    file is read in full only once per process.
+    """
+    stat = os.stat(path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    with _etags_lock:
+        cached = _etags.get(path)
+        if cached and cached[0] == signature:
+            _etags.move_to_end(path)
+            return cached[1]
+
+    etag = file_sha256(path)
+    with _etags_lock:
+        _etags[path] = (signature, etag)
+        _etags.move_to_end(path)
+        while len(_etags) > ETAG_CACHE_SIZE:
+            _etags.popitem(last=False)
+    return etag
+
+
+def variant_width(requested):
+    """Snap a requested width to the smallest configured width that covers it"""
+    widths = sorted(Config.IMAGE_VARIANT_WIDTHS)
+    for width in widths:
+        if width >= requested:
+            return width
+    return widths[-1]
+
+
+def variant_extension(filename, webp):
+    """Extension of the variant: webp when accepted, otherwise the original format"""
+    ext = filename.rsplit('.', 1)[-1].lower()
+    if webp:
+        return 'webp'
+    if ext in ('jpg', 'jpeg'):
+        return 'jpg'
+    if ext == 'webp':
+        return 'webp'
+    return 'png'
+
+
+def variants_folder(upload_folder):
+    return os.path.join(upload_folder, VARIANTS_DIR)
+
+
+def variant_name(filename, width, variant_ext):
+    """'<filename>.w<width>.<ext>': the full original name, so a.jpg and a.png never share variants"""
+    return f'{filename}.w{width}.{variant_ext}'
+
+
+def image_variant(upload_folder, filename, source, width, webp=False):
+    """Return (variant_path, mimetype) for a resized copy of an uploaded image
+
+    source is the path holding the bytes of filename. Returns None when no variant
+    applies (not a resizable image or Pillow missing), in which case the original
+    should be served.
+    """
+    ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if Image is None or ext not in RESIZABLE_EXTENSIONS:
+        return None
+
+    width = variant_width(width)
+    variant_ext = variant_extension(filename, webp)
+    variant = os.path.join(variants_folder(upload_folder), variant_name(filename, width, variant_ext))
+    mimetype = VARIANT_FORMATS[variant_ext][1]
+
+    if _is_fresh(variant, source):
+        return variant, mimetype
+
+    # One generation per variant at a time; concurrent requests wait for it
+    with _locks_guard:
+        lock = _locks.setdefault(variant, threading.Lock())
+    with lock:
+        if not _is_fresh(variant, source):
+            try:
+                _render_variant(source, variant, width, variant_ext)
+            except Exception as e:
+                logger.error(f"Could not create variant {variant}: {e}")
+                return None
+    return variant, mimetype
+
+
+def delete_variants(upload_folder, filename):
+    """Remove the cached variants of an uploaded file"""
+    folder = variants_folder(upload_folder)
+    if not os.path.isdir(folder):
+        return 0
+    pattern = re.compile(re.escape(filename) + r'\.w\d+\.(?:' + '|'.join(VARIANT_FORMATS) + ')')
+    deleted = 0
+    for name in os.listdir(folder):
+        if pattern.fullmatch(name):
+            try:
+                os.remove(os.path.join(folder, name))
+                deleted += 1
+            except OSError as e:
+                logger.warning(f"Could not delete variant {name}: {e}")
+    return deleted
+
+
+def _is_fresh(variant, source):
+    try:
+        return os.path.getmtime(variant) >= os.path.getmtime(source)
+    except OSError:
+        return False
+
+
+def _render_variant(source, variant, width, variant_ext):
+    os.makedirs(os.path.dirname(variant), exist_ok=True)
+    pil_format = VARIANT_FORMATS[variant_ext][0]
+
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.LANCZOS)
+        if pil_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        elif image.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+            image = image.convert('RGBA')
+
+        # Write to a temporary name first so readers never see a partial file
+        temp_path = f'{variant}.{uuid.uuid4().hex[:8]}.tmp'
+        try:
+            image.save(temp_path, pil_format, quality=Config.IMAGE_VARIANT_QUALITY, optimize=True)
+            os.replace(temp_path, variant)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    logger.info(f"Created variant {variant}")
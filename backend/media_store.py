@@ -0,0 +1,328 @@
+"""
+KUTTIAPP - Media Store
+Content-addressed, deduplicating storage for uploaded files
+
+Each upload keeps its logical filename (the name stored in news_media, children,
+missions and users), but its bytes are stored once per distinct content:
+
+- uploads/.blobs/<aa>/<bb>/<sha256>  one blob per content hash (sharded by prefix)
+- media_blobs                        blob hash, size and reference count
+- media_files                        logical filename -> blob hash
+
+Uploading identical bytes again only adds a mapping row. Releasing the last
+filename that points at a blob deletes the blob. Files written before the store
+existed (flat files in uploads/) are still served and can be copied or moved
+into the store with import_legacy_files(); once a name is in the store, the
+stored copy is the one served.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from config import Config
+from media import file_sha256
+from migrations import ensure_schema
+from models import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+BLOBS_DIR = '.blobs'
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class MediaStore:
+    """
+    Blob storage under upload_folder/.blobs with refcounts in SQLite
+    """
+
+    def __init__(self, db_path: Optional[str] = None, upload_folder: Optional[str] = None):
+        self.db_path = db_path or Config.DATABASE_PATH
+        self.upload_folder = upload_folder or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
+        self.blobs_folder = os.path.join(self.upload_folder, BLOBS_DIR)
+        ensure_schema(self.db_path)
+
+    def blob_path(self, blob_hash: str) -> str:
+        return os.path.join(self.blobs_folder, blob_hash[:2], blob_hash[2:4], blob_hash)
+
+    def put(self, stream: BinaryIO, filename: str) -> Tuple[str, bool]:
+        """
+        Store the content of stream under a new logical filename
+
+        The stream is copied to a temporary file while it is hashed, so memory
+        use stays bounded whatever the file size.
+
+        Returns:
+            (blob_hash, deduplicated) - deduplicated is True when the content was already stored
+        """
+        os.makedirs(self.blobs_folder, exist_ok=True)
+        temp_path = os.path.join(self.blobs_folder, f'upload_{uuid.uuid4().hex}.tmp')
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(temp_path, 'wb') as temp_file:
+                for block in iter(lambda: stream.read(COPY_BUFFER_SIZE), b''):
+                    digest.update(block)
+                    size += len(block)
+                    temp_file.write(block)
+            return self.put_file(temp_path, filename, digest.hexdigest(), size)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def put_file(self, path: str, filename: str, blob_hash: Optional[str] = None,
+                 size: Optional[int] = None, move: bool = True) -> Tuple[str, bool]:
+        """
+        Store an existing file under a logical filename
+
+        With move=True the file is moved into the store when its content is new
+        (and left in place otherwise, for the caller to delete).
+
+        Returns:
+            (blob_hash, deduplicated)
+        """
+        if blob_hash is None:
+            blob_hash = file_sha256(path)
+        if size is None:
+            size = os.path.getsize(path)
+        now = datetime.now().isoformat()
+
+        conn = get_db_connection(self.db_path)
+        try:
+            # File operations happen inside the write transaction, so a concurrent
+            # release() can never delete a blob that is being referenced again
+            conn.execute('BEGIN IMMEDIATE')
+            if conn.execute('SELECT 1 FROM media_files WHERE filename = ?', (filename,)).fetchone():
+                raise ValueError(f'Media file {filename} already exists')
+
+            blob = conn.execute('SELECT refcount FROM media_blobs WHERE hash = ?', (blob_hash,)).fetchone()
+            deduplicated = blob is not None and os.path.exists(self.blob_path(blob_hash))
+            if not deduplicated:
+                target = self.blob_path(blob_hash)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                if move:
+                    os.replace(path, target)
+                else:
+                    _copy_file(path, target)
+            if blob is None:
+                conn.execute('''
+                    INSERT INTO media_blobs (hash, size, refcount, created_at) VALUES (?, ?, 1, ?)
+                ''', (blob_hash, size, now))
+            else:
+                conn.execute('UPDATE media_blobs SET refcount = refcount + 1 WHERE hash = ?', (blob_hash,))
+            conn.execute('''
+                INSERT INTO media_files (filename, blob_hash, created_at) VALUES (?, ?, ?)
+            ''', (filename, blob_hash, now))
+            conn.commit()
+        finally:
+            conn.close()
+
+        if deduplicated:
+            logger.info(f"Media {filename}: content already stored as {blob_hash[:12]}")
+        return blob_hash, deduplicated
+
+    def resolve(self, filename: str) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Return (path, blob_hash) for a logical filename, or None if it does not exist
+
+        Flat files written before the store existed are returned with blob_hash None.
+        """
+        conn = get_db_connection(self.db_path)
+        row = conn.execute('SELECT blob_hash FROM media_files WHERE filename = ?', (filename,)).fetchone()
+        conn.close()
+        if row:
+            path = self.blob_path(row['blob_hash'])
+            return (path, row['blob_hash']) if os.path.isfile(path) else None
+
+        legacy_path = os.path.join(self.upload_folder, filename)
+        if os.path.isfile(legacy_path):
+            return legacy_path, None
+        return None
+
+    def release(self, filename: str) -> bool:
+        """
+        Drop a logical filename; its blob is deleted when no other filename uses it
+
+        Flat legacy files are deleted directly. Returns True if something was removed.
+        """
+        conn = get_db_connection(self.db_path)
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT blob_hash FROM media_files WHERE filename = ?', (filename,)).fetchone()
+            if row is None:
+                conn.rollback()
+                legacy_path = os.path.join(self.upload_folder, filename)
+                if os.path.isfile(legacy_path):
+                    os.remove(legacy_path)
+                    return True
+                return False
+
+            blob_hash = row['blob_hash']
+            conn.execute('DELETE FROM media_files WHERE filename = ?', (filename,))
+            conn.execute('UPDATE media_blobs SET refcount = refcount - 1 WHERE hash = ?', (blob_hash,))
+            refcount = conn.execute('SELECT refcount FROM media_blobs WHERE hash = ?', (blob_hash,)).fetchone()
+            if refcount is None or refcount['refcount'] <= 0:
+                conn.execute('DELETE FROM media_blobs WHERE hash = ?', (blob_hash,))
+                try:
+                    os.remove(self.blob_path(blob_hash))
+                except FileNotFoundError:
+                    pass
+            conn.commit()
+            return True
+        finally:
+            conn.close()
+
+    def filenames(self) -> set:
+        """
+        All logical filenames held by the store
+        """
+        conn = get_db_connection(self.db_path)
+        rows = conn.execute('SELECT filename FROM media_files').fetchall()
+        conn.close()
+        return {row[0] for row in rows}
+
+    def referenced_filenames(self) -> set:
+        """
+        Logical filenames referenced by the application tables
+        """
+        conn = get_db_connection(self.db_path)
+        rows = conn.execute('''
+            SELECT media_path FROM news_media WHERE media_path IS NOT NULL
+            UNION
+            SELECT web_path FROM news_media WHERE web_path IS NOT NULL
+            UNION
+            SELECT poster_path FROM news_media WHERE poster_path IS NOT NULL
+            UNION
+            SELECT photo FROM children WHERE photo IS NOT NULL AND photo != ''
+            UNION
+            SELECT photo FROM missions WHERE photo IS NOT NULL AND photo != ''
+            UNION
+            SELECT photo FROM users WHERE photo IS NOT NULL AND photo != ''
+        ''').fetchall()
+        conn.close()
+        return {row[0] for row in rows}
+
+    def unreferenced_files(self) -> List[Dict]:
+        """
+        Store entries whose filename is no longer referenced by any application row
+        """
+        referenced = self.referenced_filenames()
+        conn = get_db_connection(self.db_path)
+        rows = conn.execute('''
+            SELECT f.filename, f.blob_hash, b.size, b.refcount
+            FROM media_files f
+            JOIN media_blobs b ON b.hash = f.blob_hash
+            ORDER BY f.filename
+        ''').fetchall()
+        conn.close()
+        return [dict(row) for row in rows if row['filename'] not in referenced]
+
+    def legacy_files(self) -> List[str]:
+        """
+        Flat files in the upload folder that are not yet in the store
+        """
+        if not os.path.isdir(self.upload_folder):
+            return []
+        stored = self.filenames()
+        return sorted(
+            name for name in os.listdir(self.upload_folder)
+            if not name.startswith('.') and name not in stored
+            and os.path.isfile(os.path.join(self.upload_folder, name))
+        )
+
+    def import_legacy_files(self, move: bool = False) -> Dict[str, int]:
+        """
+        Add the flat files of the upload folder to the store, deduplicating them
+
+        By default the files are copied and the flat originals are left in place
+        (the demo uploads are tracked by git). With move=True they are moved into
+        the store, and duplicates are deleted, which is what frees disk space.
+
+        Returns:
+            Counters: imported files, deduplicated files and bytes saved
+        """
+        stats = {'imported': 0, 'deduplicated': 0, 'bytes_saved': 0}
+        for name in self.legacy_files():
+            path = os.path.join(self.upload_folder, name)
+            size = os.path.getsize(path)
+            _, deduplicated = self.put_file(path, name, size=size, move=move)
+            if deduplicated:
+                stats['deduplicated'] += 1
+                if move:
+                    os.remove(path)
+                    stats['bytes_saved'] += size
+            stats['imported'] += 1
+
+        if move:
+            # Flat copies left by an earlier copy import only take space: the stored
+            # copy is the one served
+            for name in sorted(self.filenames()):
+                path = os.path.join(self.upload_folder, name)
+                stored = self.resolve(name)
+                if os.path.isfile(path) and stored and file_sha256(path) == stored[1]:
+                    stats['bytes_saved'] += os.path.getsize(path)
+                    os.remove(path)
+        return stats
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Number of logical files and blobs, and bytes stored versus bytes referenced
+        """
+        conn = get_db_connection(self.db_path)
+        row = conn.execute('''
+            SELECT COUNT(*) AS blobs,
+                   COALESCE(SUM(size), 0) AS stored_bytes,
+                   COALESCE(SUM(size * refcount), 0) AS logical_bytes,
+                   COALESCE(SUM(refcount), 0) AS files
+            FROM media_blobs
+        ''').fetchone()
+        conn.close()
+        return dict(row)
+
+
+def link_or_copy(source: str, target: str) -> bool:
+    """
+    Hard-link source to target, copying when linking is not possible
+
+    Blobs are never modified in place, so a link is as safe as a copy. Returns
+    True when the file was linked.
+    """
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        os.link(source, target)
+        return True
+    except FileExistsError:
+        return False
+    except OSError:  # different filesystem or no hard link support
+        _copy_file(source, target)
+        return False
+
+
+def _copy_file(source: str, target: str):
+    # Copy through a temporary name so a partial blob is never visible
+    temp_path = f'{target}.{uuid.uuid4().hex[:8]}.tmp'
+    with open(source, 'rb') as src, open(temp_path, 'wb') as dst:
+        for block in iter(lambda: src.read(COPY_BUFFER_SIZE), b''):
+            dst.write(block)
+    os.replace(temp_path, target)
+
+
+# Singleton shared by the whole process
+_media_store_instance = None
+_media_store_lock = threading.Lock()
+
+def get_media_store() -> MediaStore:
+    """
+    Return the process-wide media store
+    """
+    global _media_store_instance
+
+    with _media_store_lock:
+        if _media_store_instance is None:
+            _media_store_instance = MediaStore()
+
+    return _media_store_instance
@@ -0,0 +1,537 @@
+"""
+KUTTIAPP - Schema migrations
+Versioned, run-once schema changes tracked with PRAGMA user_version
+
+Every schema change (tables, columns, indexes, constraints) is a numbered
+migration in MIGRATIONS. migrate() reads user_version and applies the missing
+migrations in order, each one in its own transaction together with the
+user_version bump, so a failed migration leaves the database at the previous
+version. An up-to-date database costs a single PRAGMA read.
+
+Version 1 also brings databases created before the migrations existed (at
+user_version 0, with any subset of the old ad-hoc columns) up to the common
+baseline, which is why the early migrations use IF NOT EXISTS and add columns
+only when they are missing.
+
+To change the schema, append a migration with the next version number; never
+edit one that has already shipped.
+"""
+
+import logging
+import threading
+from typing import Optional
+
+from config import Config
+from models import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+
+def _add_missing_columns(conn, table, columns):
+    """Add the columns of {name: definition} that table lacks; returns the added names"""
+    existing = {row[1] for row in conn.execute(f'PRAGMA table_info({table})').fetchall()}
+    added = []
+    for name, definition in columns.items():
+        if name not in existing:
+            conn.execute(f'ALTER TABLE {table} ADD COLUMN {name} {definition}')
+            added.append(name)
+            logger.info(f"Added {name} column to {table} table")
+    return added
+
+
+def initial_schema(conn):
+    """Core tables, plus the columns older databases may lack"""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        password TEXT NOT NULL,
+        role VARCHAR(20) NOT NULL CHECK (role IN ('admin', 'sponsor', 'referent', 'local_referent')),
+        photo TEXT,
+        email TEXT,
+        phone TEXT,
+        full_name TEXT,
+        bio TEXT,
+        ui_language TEXT DEFAULT 'en'
+    )''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS missions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        description TEXT,
+        photo TEXT,
+        referent_id INTEGER,
+        FOREIGN KEY (referent_id) REFERENCES users(id)
+    )''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS referents (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER UNIQUE,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS children (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT,
+        photo TEXT,
+        birth DATE,
+        gender TEXT,
+        description TEXT,
+        mission_id INTEGER,
+        sponsor_id INTEGER,
+        FOREIGN KEY (mission_id) REFERENCES missions(id),
+        FOREIGN KEY (sponsor_id) REFERENCES sponsors(id)
+    )''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS sponsors (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT,
+        surname TEXT,
+        email TEXT,
+        phone TEXT
+    )''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS sponsor_children (
+        sponsor_id INTEGER,
+        child_id INTEGER,
+        PRIMARY KEY (sponsor_id, child_id),
+        FOREIGN KEY (sponsor_id) REFERENCES sponsors(id),
+        FOREIGN KEY (child_id) REFERENCES children(id)
+    )''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS news (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        referent_id INTEGER,
+        child_id INTEGER,
+        date DATE,
+        title TEXT,
+        content TEXT,
+        created_by INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_by INTEGER,
+        updated_at TIMESTAMP,
+        FOREIGN KEY (referent_id) REFERENCES referents(id),
+        FOREIGN KEY (child_id) REFERENCES children(id),
+        FOREIGN KEY (created_by) REFERENCES users(id),
+        FOREIGN KEY (updated_by) REFERENCES users(id)
+    )''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS news_media (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        news_id INTEGER,
+        media_type TEXT CHECK(media_type IN ('photo', 'video')),
+        media_path TEXT,
+        description TEXT,
+        media_order INTEGER DEFAULT 0,
+        FOREIGN KEY (news_id) REFERENCES news(id)
+    )''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS translations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        entity_type TEXT NOT NULL,
+        entity_id INTEGER NOT NULL,
+        field_name TEXT NOT NULL,
+        language TEXT NOT NULL,
+        translated_text TEXT NOT NULL,
+        source_language TEXT,
+        is_original INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(entity_type, entity_id, field_name, language)
+    )''')
+
+    # Columns added over time by init_db, update_db.py and import_demo_data.py
+    _add_missing_columns(conn, 'users', {
+        'full_name': 'TEXT',
+        'bio': 'TEXT',
+        'ui_language': "TEXT DEFAULT 'en'",
+    })
+    if _add_missing_columns(conn, 'missions', {'description': 'TEXT'}):
+        conn.execute('''
+            UPDATE missions
+            SET description = 'The ' || name || ' mission is dedicated to supporting children and families in this beautiful region of Tamil Nadu. Through education, healthcare, and community programs, we work together to create lasting positive change in the lives of those we serve.'
+            WHERE description IS NULL
+        ''')
+        conn.execute('''
+            UPDATE missions
+            SET description = 'The Wellington mission is located in the heart of Tamil Nadu, where we work closely with local families to provide educational opportunities and healthcare support. Our dedicated team focuses on creating sustainable programs that empower children and strengthen community bonds through collaborative efforts.'
+            WHERE name = 'Wellington'
+        ''')
+        conn.execute('''
+            UPDATE missions
+            SET description = 'Our Orissa mission serves rural communities with comprehensive support programs including education, nutrition, and healthcare initiatives. We believe in building lasting relationships with families while preserving local traditions and fostering economic development through skill-building programs.'
+            WHERE name = 'Orissa'
+        ''')
+    _add_missing_columns(conn, 'children', {
+        'description': 'TEXT',
+        'sponsor_id': 'INTEGER REFERENCES sponsors(id)',
+    })
+    _add_missing_columns(conn, 'news', {
+        'created_by': 'INTEGER',
+        'created_at': 'TIMESTAMP',
+        'updated_by': 'INTEGER',
+        'updated_at': 'TIMESTAMP',
+    })
+    _add_missing_columns(conn, 'news_media', {
+        'description': 'TEXT',
+        'media_order': 'INTEGER DEFAULT 0',
+    })
+
+
+def translation_tables(conn):
+    """Translation memory and the background translation job queue"""
+    # Identical (normalized) source texts are translated only once
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS translation_memory (
+            source_hash TEXT NOT NULL,
+            source_language TEXT NOT NULL,
+            target_language TEXT NOT NULL,
+            source_text TEXT NOT NULL,
+            translated_text TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (source_hash, source_language, target_language)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS translation_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            entity_type TEXT NOT NULL,
+            entity_id INTEGER NOT NULL,
+            payload TEXT NOT NULL,
+            source_language TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            run_after TIMESTAMP NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_translation_jobs_status
+        ON translation_jobs(status, run_after)
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_translation_jobs_entity
+        ON translation_jobs(entity_type, entity_id, status)
+    ''')
+
+
+# Secondary indexes on the join and filter columns used by app.py
+INDEXES = {
+    'idx_children_mission': 'children(mission_id)',
+    'idx_children_sponsor': 'children(sponsor_id)',
+    'idx_missions_referent': 'missions(referent_id)',
+    'idx_news_child': 'news(child_id)',
+    # Keyset pagination of GET /news (ORDER BY created_at DESC, id DESC)
+    'idx_news_created_at': 'news(created_at, id)',
+    'idx_news_media_news': 'news_media(news_id, media_order)',
+    'idx_news_media_path': 'news_media(media_path)',
+    'idx_sponsor_children_child': 'sponsor_children(child_id)',
+}
+
+def secondary_indexes(conn):
+    """Indexes on the hot join and filter columns and the translations unique key"""
+    for name, target in INDEXES.items():
+        conn.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {target}')
+
+    # translator.py saves with an upsert (ON CONFLICT), which needs a unique key on
+    # (entity_type, entity_id, field_name, language). Tables created before it
+    # existed may hold duplicates: keep the most recent row of each key.
+    unique_keys = [
+        [column[2] for column in conn.execute(f'PRAGMA index_info("{index[1]}")').fetchall()]
+        for index in conn.execute('PRAGMA index_list(translations)').fetchall() if index[2]
+    ]
+    if ['entity_type', 'entity_id', 'field_name', 'language'] not in unique_keys:
+        removed = conn.execute('''
+            DELETE FROM translations WHERE id NOT IN (
+                SELECT MAX(id) FROM translations
+                GROUP BY entity_type, entity_id, field_name, language
+            )
+        ''').rowcount
+        if removed > 0:
+            logger.info(f"Removed {removed} duplicate translations")
+        conn.execute('''
+            CREATE UNIQUE INDEX idx_translations_unique
+            ON translations(entity_type, entity_id, field_name, language)
+        ''')
+    # The unique key serves the same lookups (both were created by older versions)
+    conn.execute('DROP INDEX IF EXISTS idx_translations_lookup')
+    conn.execute('DROP INDEX IF EXISTS idx_translations_entity')
+
+
+def media_store_tables(conn):
+    """Content-addressed media store: blobs with refcounts and logical filenames"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS media_blobs (
+            hash TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            refcount INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS media_files (
+            filename TEXT PRIMARY KEY,
+            blob_hash TEXT NOT NULL REFERENCES media_blobs(hash),
+            created_at TIMESTAMP NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_media_files_blob ON media_files(blob_hash)')
+
+
+def upload_sessions_table(conn):
+    """Resumable upload sessions"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS upload_sessions (
+            id TEXT PRIMARY KEY,
+            filename TEXT NOT NULL,
+            total_size INTEGER,
+            created_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_upload_sessions_updated ON upload_sessions(updated_at)')
+
+
+def video_tables(conn):
+    """Video processing jobs and the web rendition / poster columns of news_media"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS video_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            media_path TEXT NOT NULL UNIQUE,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            web_path TEXT,
+            poster_path TEXT,
+            run_after TIMESTAMP NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_video_jobs_status ON video_jobs(status, run_after)')
+    _add_missing_columns(conn, 'news_media', {
+        'web_path': 'TEXT',
+        'poster_path': 'TEXT',
+    })
+
+
+# Full-text search: external-content FTS5 tables over the searchable columns,
+# kept in sync by triggers. unicode61 alone splits Tamil words at every vowel
+# sign and virama (category M); adding M* to the token characters keeps each
+# Tamil word whole, while remove_diacritics still folds Latin accents
+SEARCH_TOKENIZER = "unicode61 remove_diacritics 2 categories 'L* N* Co M*'"
+
+# fts table: (content table, indexed columns, unindexed columns)
+SEARCH_TABLES = {
+    'news_fts': ('news', ('title', 'content'), ()),
+    'children_fts': ('children', ('name', 'description'), ()),
+    'missions_fts': ('missions', ('name', 'description'), ()),
+    'translations_fts': ('translations', ('translated_text',),
+                         ('entity_type', 'entity_id', 'field_name', 'language')),
+}
+
+def search_tables(conn):
+    """FTS5 indexes over news, children, missions and translations, with their sync triggers"""
+    for fts, (table, indexed, unindexed) in SEARCH_TABLES.items():
+        columns = list(indexed) + list(unindexed)
+        definition = ', '.join(list(indexed) + [f'{column} UNINDEXED' for column in unindexed])
+        tokenizer = SEARCH_TOKENIZER.replace("'", "''")
+        conn.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {definition}, content='{table}', content_rowid='id',
+                tokenize='{tokenizer}', prefix='2 3'
+            )
+        """)
+        names = ', '.join(columns)
+        new_values = ', '.join(f'new.{column}' for column in columns)
+        old_values = ', '.join(f'old.{column}' for column in columns)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {names} ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values});
+                INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});
+            END
+        """)
+        conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+# The FTS tables and their shadow tables: derived data, left out of exports
+SEARCH_INDEX_TABLES = frozenset(
+    name for fts in SEARCH_TABLES
+    for name in (fts, f'{fts}_data', f'{fts}_idx', f'{fts}_docsize', f'{fts}_config')
+)
+
+def drop_search_triggers(conn):
+    """Stop maintaining the search indexes row by row, before a bulk load
+    
+    rebuild_search_index() must be called once the load is done.
+    """
+    for fts in SEARCH_TABLES:
+        for event in ('insert', 'delete', 'update'):
+            conn.execute(f'DROP TRIGGER IF EXISTS {fts}_{event}')
+
+def rebuild_search_index(conn):
+    """Recreate the sync triggers and reindex every search table from its content table"""
+    search_tables(conn)
+
+
+# Filter and sort columns of the list endpoints (?mission_id=, ?age_min=,
+# ?sort=name, ...); ORDER BY <column>, id is served by the index since the
+# rowid is part of every index entry
+LIST_INDEXES = {
+    'idx_children_name': 'children(name)',
+    'idx_children_birth': 'children(birth)',
+    'idx_news_date': 'news(date)',
+    'idx_news_created_by': 'news(created_by)',
+    'idx_users_role': 'users(role)',
+    'idx_users_full_name': 'users(full_name)',
+}
+
+def list_indexes(conn):
+    """Indexes for the whitelisted filters and sort keys of GET /children, /news and /users"""
+    for name, target in LIST_INDEXES.items():
+        conn.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {target}')
+
+
+# Age in whole years from the 'YYYY-MM-DD' birth date, on the local date like
+# the rest of the app; 0 when the birth date is missing or malformed.
+# (YYYYMMDD today - YYYYMMDD birth) / 10000 drops a year until the birthday.
+CHILD_AGE = '''
+    COALESCE(MAX(0, (CAST(strftime('%Y%m%d', 'now', 'localtime') AS INTEGER)
+                     - CAST(strftime('%Y%m%d', c.birth) AS INTEGER)) / 10000), 0)
+'''
+
+def enrichment_views(conn):
+    """children_enriched and news_enriched: the list rows with their joins and computed fields
+    
+    Views rather than generated columns, since the age depends on the current
+    date. Both select the base table with *, so columns added later show up.
+    """
+    conn.execute(f'''
+        CREATE VIEW IF NOT EXISTS children_enriched AS
+        SELECT c.*,
+               m.name as mission_name,
+               m.referent_id as referent_id,
+               u.username as referent_username,
+               u.email as referent_email,
+               s.username as sponsor_username,
+               s.email as sponsor_email,
+               {CHILD_AGE} as age,
+               c.sponsor_id IS NOT NULL as is_sponsored
+        FROM children c
+        LEFT JOIN missions m ON c.mission_id = m.id
+        LEFT JOIN users u ON m.referent_id = u.id
+        LEFT JOIN users s ON c.sponsor_id = s.id
+    ''')
+    # The referent comes from the child -> mission -> referent chain; news.referent_id
+    # is the column stored on the news row and is left as is
+    conn.execute('''
+        CREATE VIEW IF NOT EXISTS news_enriched AS
+        SELECT n.*,
+               ref.username as referent_username,
+               ref.email as referent_email,
+               c.name as child_name,
+               c.mission_id as mission_id,
+               m.name as mission_name,
+               m.referent_id as mission_referent_id,
+               creator.username as created_by_username,
+               creator.email as created_by_email,
+               creator.role as created_by_role,
+               updater.username as updated_by_username,
+               updater.email as updated_by_email,
+               updater.role as updated_by_role
+        FROM news n
+        LEFT JOIN children c ON n.child_id = c.id
+        LEFT JOIN missions m ON c.mission_id = m.id
+        LEFT JOIN users ref ON m.referent_id = ref.id
+        LEFT JOIN users creator ON n.created_by = creator.id
+        LEFT JOIN users updater ON n.updated_by = updater.id
+    ''')
+
+
+# (version, migration) in the order they are applied
+MIGRATIONS = [
+    (1, initial_schema),
+    (2, translation_tables),
+    (3, secondary_indexes),
+    (4, media_store_tables),
+    (5, upload_sessions_table),
+    (6, video_tables),
+    (7, search_tables),
+    (8, list_indexes),
+    (9, enrichment_views),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(db_path: Optional[str] = None) -> int:
+    conn = get_db_connection(db_path)
+    try:
+        return conn.execute('PRAGMA user_version').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def migrate(db_path: Optional[str] = None) -> int:
+    """
+    Apply the pending migrations to the database and return its version
+
+    Each migration runs in its own write transaction (BEGIN IMMEDIATE) that also
+    sets user_version, and the version is re-read inside it, so concurrent
+    processes never apply the same migration twice.
+    """
+    db_path = db_path or Config.DATABASE_PATH
+    conn = get_db_connection(db_path)
+    try:
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version > LATEST_VERSION:
+            raise RuntimeError(f'Database {db_path} is at schema version {version}, '
+                               f'newer than this code ({LATEST_VERSION})')
+
+        for target, migration in MIGRATIONS:
+            if target <= version:
+                continue
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                version = conn.execute('PRAGMA user_version').fetchone()[0]
+                if target <= version:
+                    conn.rollback()
+                    continue
+                migration(conn)
+                conn.execute(f'PRAGMA user_version = {int(target)}')
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                logger.error(f"Migration {target} ({migration.__name__}) failed on {db_path}")
+                raise
+            version = target
+            logger.info(f"Applied migration {target}: {migration.__name__}")
+        return version
+    finally:
+        conn.close()
+
+
+# Databases already migrated by this process
+_migrated = set()
+_migrated_lock = threading.Lock()
+
+def ensure_schema(db_path: Optional[str] = None):
+    """
+    Migrate the database once per process; later calls cost nothing
+    """
+    db_path = db_path or Config.DATABASE_PATH
+    with _migrated_lock:
+        if db_path not in _migrated:
+            migrate(db_path)
+            _migrated.add(db_path)
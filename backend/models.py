@@ -3,185 +3,92 @@
 
 
 import sqlite3
+import threading
+from queue import LifoQueue, Empty, Full
 from config import Config
 
 
-def get_db_connection():
-    try:
-        conn = sqlite3.connect(Config.DATABASE_PATH)
+class PooledConnection(sqlite3.Connection):
+    """SQLite connection whose close() hands it back to its pool instead of closing it"""
+    pool = None
+    idle = False
+
+    def close(self):
+        if self.pool is None:
+            super().close()
+        else:
+            self.pool.release(self)
+
+
+class ConnectionPool:
+    """Process-wide pool of configured SQLite connections for one database file"""
+
+    def __init__(self, db_path, size):
+        self.db_path = db_path
+        self._idle = LifoQueue(maxsize=size)
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=Config.DB_BUSY_TIMEOUT_MS / 1000,
+            factory=PooledConnection,
+            check_same_thread=False  # a connection is only used by one thread at a time
+        )
         conn.row_factory = sqlite3.Row
-        # Enable foreign key support
+        # Configured once per connection instead of once per request
+        conn.execute('PRAGMA journal_mode = WAL')  # readers no longer block behind writers
+        conn.execute('PRAGMA synchronous = NORMAL')
         conn.execute('PRAGMA foreign_keys = ON')
+        conn.execute(f'PRAGMA busy_timeout = {int(Config.DB_BUSY_TIMEOUT_MS)}')
+        conn.execute(f'PRAGMA cache_size = -{int(Config.DB_CACHE_SIZE_KB)}')
+        conn.execute(f'PRAGMA mmap_size = {int(Config.DB_MMAP_SIZE)}')
+        conn.pool = self
+        return conn
+
+    def acquire(self):
+        try:
+            conn = self._idle.get_nowait()
+        except Empty:
+            conn = self._connect()
+        conn.idle = False
         return conn
+
+    def release(self, conn):
+        if conn.idle:
+            return  # already returned (double close)
+        try:
+            # Discard anything the caller left uncommitted, like a real close() would
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+            conn.set_trace_callback(None)
+            conn.idle = True
+            self._idle.put_nowait(conn)
+        except (sqlite3.Error, Full):
+            conn.idle = True
+            sqlite3.Connection.close(conn)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_db_connection(db_path=None):
+    """Borrow a pooled connection; call close() to give it back"""
+    db_path = db_path or Config.DATABASE_PATH
+    try:
+        with _pools_lock:
+            pool = _pools.get(db_path)
+            if pool is None:
+                pool = _pools[db_path] = ConnectionPool(db_path, Config.DB_POOL_SIZE)
+        return pool.acquire()
     except sqlite3.Error as e:
         print(f"Database connection error: {str(e)}")
         raise
 
 def init_db():
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Users table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        username TEXT UNIQUE NOT NULL,
-        password TEXT NOT NULL,
-        role VARCHAR(20) NOT NULL CHECK (role IN ('admin', 'sponsor', 'referent', 'local_referent')),
-        photo TEXT,
-        email TEXT,
-        phone TEXT,
-        full_name TEXT,
-        bio TEXT,
-        ui_language TEXT DEFAULT 'en'
-    )''')
-    # Missions table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS missions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT NOT NULL,
-        description TEXT,
-        photo TEXT,
-        referent_id INTEGER,
-        FOREIGN KEY (referent_id) REFERENCES users(id)
-    )''')
-    # Referents table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS referents (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER UNIQUE,
-        FOREIGN KEY (user_id) REFERENCES users(id)
-    )''')
-    # Children table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS children (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT,
-        photo TEXT,
-        birth DATE,
-        gender TEXT,
-        description TEXT,
-        mission_id INTEGER,
-        sponsor_id INTEGER,
-        FOREIGN KEY (mission_id) REFERENCES missions(id),
-        FOREIGN KEY (sponsor_id) REFERENCES sponsors(id)
-    )''')
-    # Sponsors table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS sponsors (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT,
-        surname TEXT,
-        email TEXT,
-        phone TEXT
-    )''')
-    # Sponsor-children relationship
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS sponsor_children (
-        sponsor_id INTEGER,
-        child_id INTEGER,
-        PRIMARY KEY (sponsor_id, child_id),
-        FOREIGN KEY (sponsor_id) REFERENCES sponsors(id),
-        FOREIGN KEY (child_id) REFERENCES children(id)
-    )''')
-    # News table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS news (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        referent_id INTEGER,
-        child_id INTEGER,
-        date DATE,
-        title TEXT,
-        content TEXT,
-        created_by INTEGER,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        updated_by INTEGER,
-        updated_at TIMESTAMP,
-        FOREIGN KEY (referent_id) REFERENCES referents(id),
-        FOREIGN KEY (child_id) REFERENCES children(id),
-        FOREIGN KEY (created_by) REFERENCES users(id),
-        FOREIGN KEY (updated_by) REFERENCES users(id)
-    )''')
-    # News media table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS news_media (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        news_id INTEGER,
-        media_type TEXT CHECK(media_type IN ('photo', 'video')),
-        media_path TEXT,
-        description TEXT,
-        media_order INTEGER DEFAULT 0,
-        FOREIGN KEY (news_id) REFERENCES news(id)
-    )''')
-    
-    # Translations table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS translations (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        entity_type TEXT NOT NULL,
-        entity_id INTEGER NOT NULL,
-        field_name TEXT NOT NULL,
-        language TEXT NOT NULL,
-        translated_text TEXT NOT NULL,
-        source_language TEXT,
-        is_original INTEGER DEFAULT 0,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )''')
-    
-    # Check and add missing columns to existing tables after creation
-    try:
-        cursor.execute("PRAGMA table_info(children)")
-        columns = [column[1] for column in cursor.fetchall()]
-        if 'description' not in columns:
-            cursor.execute('ALTER TABLE children ADD COLUMN description TEXT')
-            print("Added description column to children table")
-        if 'sponsor_id' not in columns:
-            cursor.execute('ALTER TABLE children ADD COLUMN sponsor_id INTEGER REFERENCES sponsors(id)')
-            print("Added sponsor_id column to children table")
-    except sqlite3.Error as e:
-        print(f"Error checking/adding children columns: {e}")
-    
-    try:
-        cursor.execute("PRAGMA table_info(news)")
-        news_columns = [column[1] for column in cursor.fetchall()]
-        
-        if 'created_by' not in news_columns:
-            cursor.execute('ALTER TABLE news ADD COLUMN created_by INTEGER')
-            print("Added created_by column to news table")
-            
-        if 'created_at' not in news_columns:
-            cursor.execute('ALTER TABLE news ADD COLUMN created_at TIMESTAMP')
-            print("Added created_at column to news table")
-            
-        if 'updated_by' not in news_columns:
-            cursor.execute('ALTER TABLE news ADD COLUMN updated_by INTEGER')
-            print("Added updated_by column to news table")
-            
-        if 'updated_at' not in news_columns:
-            cursor.execute('ALTER TABLE news ADD COLUMN updated_at TIMESTAMP')
-            print("Added updated_at column to news table")
-            
-    except sqlite3.Error as e:
-        print(f"Error checking/adding news columns: {e}")
-    
-    try:
-        cursor.execute("PRAGMA table_info(news_media)")
-        media_columns = [column[1] for column in cursor.fetchall()]
-        
-        if 'description' not in media_columns:
-            cursor.execute('ALTER TABLE news_media ADD COLUMN description TEXT')
-            print("Added description column to news_media table")
-            
-        if 'media_order' not in media_columns:
-            cursor.execute('ALTER TABLE news_media ADD COLUMN media_order INTEGER DEFAULT 0')
-            print("Added media_order column to news_media table")
-            
-    except sqlite3.Error as e:
-        print(f"Error checking/adding news_media columns: {e}")
-    
-    conn.commit()
-    conn.close()
+    """Create or upgrade the schema by applying the pending migrations (see migrations.py)"""
+    from migrations import migrate  # migrations imports this module
+    return migrate()
 
 if __name__ == '__main__':
     init_db()
@@ -0,0 +1,196 @@
+"""
+KUTTIAPP - Translation Backends
+Backend di traduzione intercambiabili per TranslationService
+
+Backend disponibili (Config.TRANSLATION_BACKEND):
+- google: Google Translate, pagina mobile via requests (richiede rete)
+- local:  sostituto locale deterministico con latenza configurabile, per test e benchmark
+- model:  aggancio a un modello installato sulla macchina (Config.TRANSLATION_MODEL_HOOK)
+
+I codici lingua sono quelli di TranslationService.SUPPORTED_LANGUAGES (en/it/ta).
+"""
+
+import importlib
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Type
+
+from config import Config
+
+
+class BatchSplitError(ValueError):
+    """
+    Il risultato di una chiamata batch non corrisponde ai segmenti inviati
+    """
+
+
+class TranslationBackend:
+    """
+    Interfaccia comune dei backend di traduzione
+    """
+
+    name = 'base'
+
+    # Caratteri massimi per chiamata batch (None = nessun limite)
+    max_batch_chars: Optional[int] = None
+    # Caratteri aggiunti tra due segmenti di un batch (delimitatore), contati nel limite
+    batch_delimiter_chars = 0
+
+    def translate(self, text: str, source_language: str, target_language: str) -> str:
+        """
+        Traduce un singolo testo
+        """
+        raise NotImplementedError
+
+    def translate_batch(self, texts: List[str], source_language: str, target_language: str) -> List[str]:
+        """
+        Traduce più testi con una sola chiamata; deve restituire una lista della stessa
+        lunghezza oppure sollevare BatchSplitError (il servizio ritenterà testo per testo)
+        """
+        return [self.translate(text, source_language, target_language) for text in texts]
+
+    def detect(self, text: str) -> Optional[str]:
+        """
+        Rileva la lingua di un testo; None lascia decidere all'euristica del servizio
+        """
+        return None
+
+
+class GoogleBackend(TranslationBackend):
+    """
+    Google Translate tramite la pagina mobile (la stessa richiesta di deep-translator)
+
+    Ogni richiesta ha un timeout di rete (Config.TRANSLATION_CALL_TIMEOUT_SECONDS): una
+    connessione bloccata fallisce e libera il suo posto tra le TRANSLATION_MAX_CONCURRENCY
+    chiamate remote. deep-translator non permette di impostarlo, quindi la richiesta è
+    fatta qui, con una sessione HTTP per thread.
+    Il batch concatena i segmenti con un delimitatore che il traduttore lascia intatto.
+    """
+
+    name = 'google'
+    max_batch_chars = 4500
+
+    URL = 'https://translate.google.com/m'
+    RESULT_QUERIES = ({'class': 't0'}, {'class': 'result-container'})
+
+    BATCH_DELIMITER = '\n@@@\n'
+    BATCH_DELIMITER_PATTERN = re.compile(r'\s*@@@\s*')
+    batch_delimiter_chars = len(BATCH_DELIMITER)
+
+    def __init__(self, timeout: float = Config.TRANSLATION_CALL_TIMEOUT_SECONDS):
+        # Importati qui: servono solo per questo backend
+        import requests
+        from bs4 import BeautifulSoup
+        self._session_class = requests.Session
+        self._parser = BeautifulSoup
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._session_class()
+        return session
+
+    def translate(self, text: str, source_language: str, target_language: str) -> str:
+        text = text.strip()
+        if not text or source_language == target_language:
+            return text
+        response = self._session().get(self.URL, params={'sl': source_language, 'tl': target_language, 'q': text},
+                                       timeout=self.timeout)
+        response.raise_for_status()
+        page = self._parser(response.text, 'html.parser')
+        for query in self.RESULT_QUERIES:
+            element = page.find('div', query)
+            if element:
+                return element.get_text(strip=True)
+        raise ValueError('Translation not found in the response')
+
+    def translate_batch(self, texts: List[str], source_language: str, target_language: str) -> List[str]:
+        if len(texts) == 1:
+            return [self.translate(texts[0], source_language, target_language)]
+        if any(self.BATCH_DELIMITER_PATTERN.search(text) for text in texts):
+            raise BatchSplitError('Segment contains the batch delimiter')
+
+        joined = self.translate(self.BATCH_DELIMITER.join(texts), source_language, target_language)
+        segments = self.BATCH_DELIMITER_PATTERN.split(joined.strip()) if joined else []
+        if len(segments) != len(texts):
+            raise BatchSplitError(f'Expected {len(texts)} segments, got {len(segments)}')
+        return segments
+
+
+class LocalBackend(TranslationBackend):
+    """
+    Sostituto locale deterministico: '[<lingua>] <testo>' dopo una latenza fissa per chiamata
+
+    Non usa la rete; conta le chiamate per i benchmark.
+    """
+
+    name = 'local'
+
+    def __init__(self, latency_ms: float = Config.TRANSLATION_LOCAL_LATENCY_MS):
+        self.latency = latency_ms / 1000
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _call(self):
+        with self._lock:
+            self.calls += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def translate(self, text: str, source_language: str, target_language: str) -> str:
+        self._call()
+        return f'[{target_language}] {text}'
+
+    def translate_batch(self, texts: List[str], source_language: str, target_language: str) -> List[str]:
+        self._call()
+        return [f'[{target_language}] {text}' for text in texts]
+
+
+class ModelBackend(TranslationBackend):
+    """
+    Aggancio a un modello di traduzione installato sulla macchina
+
+    Config.TRANSLATION_MODEL_HOOK indica una funzione 'modulo:funzione' con firma
+    fn(texts: List[str], source_language: str, target_language: str) -> List[str]
+    """
+
+    name = 'model'
+
+    def __init__(self, hook: Optional[Callable] = None):
+        if hook is None:
+            if not Config.TRANSLATION_MODEL_HOOK:
+                raise ValueError('TRANSLATION_MODEL_HOOK must be set to use the model backend')
+            module_name, _, function_name = Config.TRANSLATION_MODEL_HOOK.partition(':')
+            hook = getattr(importlib.import_module(module_name), function_name)
+        self.hook = hook
+
+    def translate(self, text: str, source_language: str, target_language: str) -> str:
+        return self.translate_batch([text], source_language, target_language)[0]
+
+    def translate_batch(self, texts: List[str], source_language: str, target_language: str) -> List[str]:
+        return list(self.hook(texts, source_language, target_language))
+
+
+BACKENDS: Dict[str, Type[TranslationBackend]] = {
+    GoogleBackend.name: GoogleBackend,
+    LocalBackend.name: LocalBackend,
+    ModelBackend.name: ModelBackend,
+}
+
+def register_backend(name: str, backend_class: Type[TranslationBackend]):
+    """
+    Registra un backend aggiuntivo selezionabile da Config.TRANSLATION_BACKEND
+    """
+    BACKENDS[name] = backend_class
+
+def create_backend(name: Optional[str] = None) -> TranslationBackend:
+    """
+    Crea il backend indicato (default: Config.TRANSLATION_BACKEND)
+    """
+    name = name or Config.TRANSLATION_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown translation backend '{name}' (available: {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
@@ -0,0 +1,125 @@
+"""
+KUTTIAPP - Translation Job Queue
+Durable background queue for entity pre-translation
+
+Write endpoints enqueue a job after their own commit and return immediately;
+a small pool of worker threads runs pre_translate_entity in the background.
+
+- Jobs are stored in the translation_jobs table, so pending work survives restarts
+- Failed jobs are retried with exponential backoff up to a maximum number of attempts
+- Jobs for the same entity run strictly in the order they were enqueued
+"""
+
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from config import Config
+from job_queue import JobQueue
+from models import get_db_connection
+from translator import get_translation_service
+
+logger = logging.getLogger(__name__)
+
+
+class TranslationQueue(JobQueue):
+    """
+    Durable queue of entity pre-translations (translation_jobs table)
+    """
+
+    table = 'translation_jobs'
+    name = 'translation'
+    STATUSES = ('pending', 'running', 'done', 'failed', 'superseded')
+    JOB_COLUMNS = '''id, entity_type, entity_id, source_language, status, attempts,
+                     last_error, run_after, created_at, updated_at'''
+    # A job is skipped while an older job for the same entity is still pending
+    # or running, so translations of one entity are never applied out of order
+    CLAIM_CONDITION = '''
+                AND NOT EXISTS (
+                    SELECT 1 FROM translation_jobs o
+                    WHERE o.entity_type = j.entity_type AND o.entity_id = j.entity_id
+                    AND o.status IN ('pending', 'running') AND o.id < j.id
+                )'''
+
+    def __init__(self, db_path: Optional[str] = None, workers: int = Config.TRANSLATION_WORKERS,
+                 max_attempts: int = Config.TRANSLATION_MAX_ATTEMPTS,
+                 retry_base_seconds: float = Config.TRANSLATION_RETRY_BASE_SECONDS,
+                 poll_interval: float = 1.0):
+        super().__init__(db_path or Config.DATABASE_PATH, workers, max_attempts, retry_base_seconds, poll_interval)
+
+    def enqueue(self, entity_type: str, entity_id: int, data: Dict[str, str], source_language: str) -> int:
+        """
+        Queue the pre-translation of an entity and wake up a worker
+
+        A pending job for the same entity and source language is merged into the
+        new one, so a burst of edits only translates the latest text once.
+
+        Returns:
+            ID of the new job
+        """
+        now = datetime.now().isoformat()
+        payload = dict(data)
+
+        conn = get_db_connection(self.db_path)
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            older = conn.execute('''
+                SELECT id, payload FROM translation_jobs
+                WHERE entity_type = ? AND entity_id = ? AND source_language = ?
+                AND status = 'pending' AND attempts = 0
+                ORDER BY id
+            ''', (entity_type, entity_id, source_language)).fetchall()
+            for job in older:
+                payload = {**json.loads(job['payload']), **payload}
+                conn.execute('''
+                    UPDATE translation_jobs SET status = 'superseded', updated_at = ? WHERE id = ?
+                ''', (now, job['id']))
+
+            cursor = conn.execute('''
+                INSERT INTO translation_jobs
+                (entity_type, entity_id, payload, source_language, status, run_after, created_at, updated_at)
+                VALUES (?, ?, ?, ?, 'pending', ?, ?, ?)
+            ''', (entity_type, entity_id, json.dumps(payload, ensure_ascii=False), source_language, now, now, now))
+            job_id = cursor.lastrowid
+            conn.commit()
+        finally:
+            conn.close()
+
+        logger.info(f"Translation job {job_id} queued for {entity_type}.{entity_id}")
+        self._wake_worker()
+        return job_id
+
+    def process_job(self, job: Dict):
+        service = get_translation_service(self.db_path)
+        service.pre_translate_entity(
+            job['entity_type'], job['entity_id'], json.loads(job['payload']),
+            job['source_language'], strict=True
+        )
+        self._finish_job(job['id'], 'done')
+        logger.info(f"Translation job {job['id']} completed")
+
+
+# Singleton shared by the whole process
+_translation_queue_instance = None
+_translation_queue_lock = threading.Lock()
+
+def get_translation_queue() -> TranslationQueue:
+    """
+    Return the process-wide translation queue
+    """
+    global _translation_queue_instance
+
+    with _translation_queue_lock:
+        if _translation_queue_instance is None:
+            _translation_queue_instance = TranslationQueue()
+
+    return _translation_queue_instance
+
+
+def enqueue_translation(entity_type: str, entity_id: int, data: Dict[str, str], source_language: str) -> int:
+    """
+    Utility function: queue the pre-translation of all fields of an entity
+    """
+    return get_translation_queue().enqueue(entity_type, entity_id, data, source_language)
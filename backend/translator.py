@@ -13,16 +13,110 @@ Target Fields:
 - missions.description
 """
 
-from deep_translator import GoogleTranslator
-import sqlite3
+import hashlib
+import json
 import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
 from typing import Optional, Dict, List, Tuple
 
+from config import Config
+from migrations import ensure_schema
+from models import get_db_connection
+from translation_backends import BatchSplitError, TranslationBackend, create_backend
+
 # Configurazione logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Spazi e tabulazioni consecutivi all'interno di una riga
+INLINE_WHITESPACE = re.compile(r'[ \t]+')
+
+# Salvataggio di una traduzione: aggiorna la riga esistente con la stessa chiave
+# (entity_type, entity_id, field_name, language) invece di sostituirla
+TRANSLATION_UPSERT = '''
+    INSERT INTO translations 
+    (entity_type, entity_id, field_name, language, translated_text, 
+     source_language, is_original, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(entity_type, entity_id, field_name, language) DO UPDATE SET
+        translated_text = excluded.translated_text,
+        source_language = excluded.source_language,
+        is_original = excluded.is_original,
+        updated_at = excluded.updated_at
+'''
+
+class TranslationCache:
+    """
+    Cache LRU in memoria con scadenza (TTL) davanti alla tabella translations
+    
+    Chiave: (entity_type, entity_id, field_name, language). Memorizza anche i
+    risultati mancanti (None), invalidati da save_translation.
+    """
+    
+    def __init__(self, max_size: int = Config.TRANSLATION_CACHE_SIZE,
+                 ttl_seconds: float = Config.TRANSLATION_CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Tuple):
+        """
+        Restituisce (True, valore) se la chiave è in cache e non scaduta, altrimenti (False, None)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+    
+    def set(self, key: Tuple, value: Optional[str]):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, key: Tuple):
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def invalidate_entity(self, entity_type: str, entity_id: int):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == entity_type and k[1] == entity_id]:
+                del self._entries[key]
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
 class TranslationService:
     """
     Servizio di traduzione riusabile e DRY per KUTTIAPP
@@ -43,60 +137,35 @@ class TranslationService:
         'user': ['bio']
     }
     
-    def __init__(self, db_path: str = 'kuttiapp.db'):
+    def __init__(self, db_path: Optional[str] = None, backend: Optional[TranslationBackend] = None):
         """
         Inizializza il servizio di traduzione
         
         Args:
-            db_path: Percorso al database SQLite
+            db_path: Percorso al database SQLite (default: Config.DATABASE_PATH)
+            backend: Backend di traduzione (default: quello scelto da Config.TRANSLATION_BACKEND)
         """
-        self.db_path = db_path
-        self.translator = GoogleTranslator()
+        self.db_path = db_path or Config.DATABASE_PATH
+        self.backend = backend or create_backend()
+        self.cache = TranslationCache()
+        self.memory_hits = 0
+        self.memory_misses = 0
+        
+        # Tutte le chiamate remote passano da questo pool: limita la concorrenza globale
+        # e permette un timeout per singola chiamata
+        self._remote_executor = ThreadPoolExecutor(
+            max_workers=Config.TRANSLATION_MAX_CONCURRENCY, thread_name_prefix='translation-remote'
+        )
+        # Pool per tradurre in parallelo verso le diverse lingue target
+        self._fanout_executor = ThreadPoolExecutor(
+            max_workers=Config.TRANSLATION_MAX_CONCURRENCY, thread_name_prefix='translation-fanout'
+        )
         
-        # Crea tabella translations se non esiste
-        self._ensure_translations_table()
+        # Applica le migrazioni dello schema (tabelle translations e translation_memory)
+        ensure_schema(self.db_path)
         
         logger.info("TranslationService inizializzato")
     
-    def _ensure_translations_table(self):
-        """
-        Crea la tabella translations se non esiste
-        """
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS translations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    entity_type TEXT NOT NULL,
-                    entity_id INTEGER NOT NULL,
-                    field_name TEXT NOT NULL,
-                    language TEXT NOT NULL,
-                    translated_text TEXT NOT NULL,
-                    source_language TEXT,
-                    is_original BOOLEAN DEFAULT FALSE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(entity_type, entity_id, field_name, language)
-                )
-            ''')
-            
-            # Indici per performance
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_translations_lookup 
-                ON translations(entity_type, entity_id, field_name, language)
-            ''')
-            
-            conn.commit()
-            conn.close()
-            
-            logger.info("Tabella translations verificata/creata")
-            
-        except Exception as e:
-            logger.error(f"Errore creazione tabella translations: {e}")
-            raise
-    
     def detect_language(self, text: str) -> str:
         """
         Rileva la lingua di un testo
@@ -111,6 +180,11 @@ class TranslationService:
             return 'en'
         
         try:
+            # Il backend può avere un rilevatore proprio (es. un modello locale)
+            detected = self.backend.detect(text)
+            if detected in self.SUPPORTED_LANGUAGES:
+                return detected
+            
             # Strategia semplificata: analizza caratteri per rilevare lingua
             # Tamil: caratteri Unicode nel range Tamil
             tamil_chars = sum(1 for char in text if '\u0b80' <= char <= '\u0bff')
@@ -138,7 +212,81 @@ class TranslationService:
             logger.warning(f"Errore rilevamento lingua, fallback a 'en': {e}")
             return 'en'
     
-    def translate_text(self, text: str, target_language: str, source_language: Optional[str] = None) -> str:
+    @staticmethod
+    def normalize_source_text(text: str) -> str:
+        """
+        Normalizza un testo sorgente per la memoria di traduzione (NFC, spazi compattati)
+        
+        Compatta solo spazi e tabulazioni dentro ogni riga: gli a capo separano
+        paragrafi ed elenchi e vanno conservati, perché la traduzione li riporta.
+        """
+        lines = unicodedata.normalize('NFC', text).splitlines()
+        return '\n'.join(INLINE_WHITESPACE.sub(' ', line).strip(' \t') for line in lines).strip()
+    
+    @classmethod
+    def source_text_hash(cls, text: str) -> str:
+        return hashlib.sha256(cls.normalize_source_text(text).encode('utf-8')).hexdigest()
+    
+    def lookup_translation_memory(self, text: str, source_language: str, target_language: str) -> Optional[str]:
+        """
+        Cerca una traduzione già eseguita dello stesso testo sorgente
+        
+        Returns:
+            Testo tradotto o None se il testo non è mai stato tradotto
+        """
+        try:
+            conn = get_db_connection(self.db_path)
+            row = conn.execute('''
+                SELECT translated_text FROM translation_memory
+                WHERE source_hash = ? AND source_language = ? AND target_language = ?
+            ''', (self.source_text_hash(text), source_language, target_language)).fetchone()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Errore lettura memoria di traduzione: {e}")
+            return None
+        
+        if row:
+            self.memory_hits += 1
+            return row[0]
+        self.memory_misses += 1
+        return None
+    
+    def save_translation_memory(self, text: str, source_language: str, target_language: str, translated_text: str):
+        """
+        Registra una traduzione remota nella memoria di traduzione
+        """
+        try:
+            conn = get_db_connection(self.db_path)
+            conn.execute('''
+                INSERT OR REPLACE INTO translation_memory
+                (source_hash, source_language, target_language, source_text, translated_text)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (self.source_text_hash(text), source_language, target_language,
+                  self.normalize_source_text(text), translated_text))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Errore salvataggio memoria di traduzione: {e}")
+    
+    def _remote_call(self, method, *args):
+        """
+        Esegue una chiamata al backend di traduzione rispettando il limite di concorrenza
+        
+        Il timeout qui smette solo di aspettare: il posto nel pool si libera quando la
+        chiamata termina, perciò i backend di rete applicano lo stesso timeout al socket.
+        
+        Raises:
+            TimeoutError: se la chiamata supera TRANSLATION_CALL_TIMEOUT_SECONDS
+        """
+        future = self._remote_executor.submit(method, *args)
+        try:
+            return future.result(timeout=Config.TRANSLATION_CALL_TIMEOUT_SECONDS)
+        # Prima di Python 3.11 il timeout dei future non è il TimeoutError builtin
+        except FutureTimeoutError:
+            raise TimeoutError(f"Timeout dopo {Config.TRANSLATION_CALL_TIMEOUT_SECONDS}s")
+    
+    def translate_text(self, text: str, target_language: str, source_language: Optional[str] = None,
+                       strict: bool = False) -> str:
         """
         Traduce un testo nella lingua target
         
@@ -146,6 +294,7 @@ class TranslationService:
             text: Testo da tradurre
             target_language: Lingua di destinazione (en/it/ta)
             source_language: Lingua sorgente (opzionale, auto-rilevata)
+            strict: Se True rilancia gli errori invece di restituire l'originale
             
         Returns:
             Testo tradotto o originale in caso di errore
@@ -166,22 +315,148 @@ class TranslationService:
         if source_language == target_language:
             return text
         
+        # Testo già tradotto in passato: nessuna chiamata remota
+        remembered = self.lookup_translation_memory(text, source_language, target_language)
+        if remembered is not None:
+            return remembered
+        
         try:
-            # Traduzione usando deep-translator
-            translator = GoogleTranslator(
-                source=self.SUPPORTED_LANGUAGES[source_language],
-                target=self.SUPPORTED_LANGUAGES[target_language]
-            )
-            
-            translated = translator.translate(text.strip())
+            # Traduzione tramite il backend configurato
+            translated = self._remote_call(self.backend.translate, text.strip(), source_language, target_language)
             
             logger.info(f"Traduzione {source_language}->{target_language}: '{text[:50]}...' -> '{translated[:50]}...'")
+            if translated:
+                self.save_translation_memory(text, source_language, target_language, translated)
             return translated
             
         except Exception as e:
             logger.error(f"Errore traduzione {source_language}->{target_language}: {e}")
+            if strict:
+                raise
             return text  # Fallback all'originale
     
+    def translate_batch(self, texts: List[str], target_language: str, source_language: str,
+                        strict: bool = False) -> List[str]:
+        """
+        Traduce molti testi della stessa coppia di lingue con il minor numero di chiamate remote
+        
+        I testi già presenti nella memoria di traduzione non vengono inviati; gli altri
+        (senza duplicati) sono raggruppati in blocchi da backend.max_batch_chars caratteri,
+        una chiamata batch del backend per blocco. Se il backend non riesce a restituire
+        i segmenti di un blocco, quei testi vengono tradotti singolarmente.
+        
+        Args:
+            texts: Testi da tradurre
+            target_language: Lingua di destinazione (en/it/ta)
+            source_language: Lingua sorgente
+            strict: Se True rilancia gli errori invece di restituire gli originali
+            
+        Returns:
+            Testi tradotti, nello stesso ordine di texts
+        """
+        results = list(texts)
+        if target_language not in self.SUPPORTED_LANGUAGES or source_language == target_language:
+            return results
+        
+        pending = {}
+        for text in texts:
+            if text and text.strip():
+                pending.setdefault(text.strip(), None)
+        
+        # Memoria di traduzione: una sola lettura per tutto il batch
+        if pending:
+            hashes = {self.source_text_hash(text): text for text in pending}
+            try:
+                conn = get_db_connection(self.db_path)
+                rows = conn.execute('''
+                    SELECT source_hash, translated_text FROM translation_memory
+                    WHERE source_hash IN (SELECT value FROM json_each(?))
+                    AND source_language = ? AND target_language = ?
+                ''', (json.dumps(list(hashes)), source_language, target_language)).fetchall()
+                conn.close()
+                for row in rows:
+                    pending[hashes[row['source_hash']]] = row['translated_text']
+                self.memory_hits += len(rows)
+            except Exception as e:
+                logger.error(f"Errore lettura memoria di traduzione: {e}")
+        
+        to_translate = [text for text, translated in pending.items() if translated is None]
+        self.memory_misses += len(to_translate)
+        
+        # Blocchi entro il limite di caratteri del backend; i segmenti troppo lunghi vanno da soli
+        # (il testo inviato comprende un delimitatore tra segmenti consecutivi)
+        max_chars = self.backend.max_batch_chars
+        delimiter_chars = self.backend.batch_delimiter_chars
+        chunks, chunk, chunk_chars = [], [], 0
+        for text in to_translate:
+            if max_chars and len(text) > max_chars:
+                chunks.append([text])
+                continue
+            if chunk and max_chars and chunk_chars + delimiter_chars + len(text) > max_chars:
+                chunks.append(chunk)
+                chunk, chunk_chars = [], 0
+            chunk_chars += (delimiter_chars if chunk else 0) + len(text)
+            chunk.append(text)
+        if chunk:
+            chunks.append(chunk)
+        
+        remembered = []
+        for chunk in chunks:
+            if len(chunk) == 1:
+                translated = [self.translate_text(chunk[0], target_language, source_language, strict=strict)]
+            else:
+                translated = self._translate_chunk(chunk, target_language, source_language, strict)
+                remembered.extend(zip(chunk, translated))
+            pending.update(zip(chunk, translated))
+        
+        self._save_translation_memory_many(remembered, source_language, target_language)
+        logger.info(f"Batch {source_language}->{target_language}: {len(texts)} testi, "
+                    f"{len(to_translate)} da tradurre in {len(chunks)} chiamate")
+        
+        for i, text in enumerate(texts):
+            if text and text.strip():
+                results[i] = pending[text.strip()]
+        return results
+    
+    def _translate_chunk(self, chunk: List[str], target_language: str, source_language: str,
+                         strict: bool) -> List[str]:
+        """
+        Traduce un blocco di segmenti con una sola chiamata batch del backend
+        """
+        try:
+            segments = self._remote_call(self.backend.translate_batch, chunk, source_language, target_language)
+            if len(segments) != len(chunk):
+                raise BatchSplitError(f'Expected {len(chunk)} segments, got {len(segments)}')
+            return segments
+        except BatchSplitError as e:
+            logger.warning(f"Batch {source_language}->{target_language}: {e}, "
+                           f"traduzione singola di {len(chunk)} segmenti")
+        except Exception as e:
+            logger.error(f"Errore traduzione batch {source_language}->{target_language}: {e}")
+            if strict:
+                raise
+        
+        # translate_text registra da sé la memoria di traduzione
+        return [self.translate_text(text, target_language, source_language, strict=strict) for text in chunk]
+    
+    def _save_translation_memory_many(self, pairs: List[Tuple[str, str]], source_language: str,
+                                      target_language: str):
+        pairs = [(text, translated) for text, translated in pairs if translated and translated != text]
+        if not pairs:
+            return
+        try:
+            conn = get_db_connection(self.db_path)
+            conn.executemany('''
+                INSERT OR REPLACE INTO translation_memory
+                (source_hash, source_language, target_language, source_text, translated_text)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [(self.source_text_hash(text), source_language, target_language,
+                   self.normalize_source_text(text), translated) for text, translated in pairs])
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Errore salvataggio memoria di traduzione: {e}")
+    
     def get_cached_translation(self, entity_type: str, entity_id: int, field_name: str, language: str) -> Optional[str]:
         """
         Recupera una traduzione dalla cache
@@ -195,8 +470,13 @@ class TranslationService:
         Returns:
             Testo tradotto o None se non trovato
         """
+        key = (entity_type, entity_id, field_name, language)
+        found, cached = self.cache.get(key)
+        if found:
+            return cached
+        
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_db_connection(self.db_path)
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -209,15 +489,67 @@ class TranslationService:
             result = cursor.fetchone()
             conn.close()
             
-            if result:
-                logger.info(f"Traduzione trovata in cache: {entity_type}.{entity_id}.{field_name} -> {language}")
-                return result[0]
-            
-            return None
+            value = result[0] if result else None
+            self.cache.set(key, value)
+            if value:
+                logger.debug(f"Traduzione trovata in cache: {entity_type}.{entity_id}.{field_name} -> {language}")
+            return value
             
         except Exception as e:
             logger.error(f"Errore recupero cache: {e}")
             return None
+
+    def get_cached_translations_many(self, entity_type: str, entity_ids: List[int], field_names: List[str],
+                                     language: str) -> Dict[Tuple[int, str], str]:
+        """
+        Recupera dalla cache le traduzioni di più entità dello stesso tipo con una sola query
+
+        Non esegue traduzioni: i campi non ancora tradotti restano assenti dal risultato.
+
+        Args:
+            entity_type: Tipo entità (news/mission/children)
+            entity_ids: ID delle entità
+            field_names: Campi da localizzare
+            language: Lingua desiderata
+
+        Returns:
+            Dizionario {(entity_id, field_name): testo tradotto}
+        """
+        translations = {}
+        missing = []
+        for entity_id in entity_ids:
+            for field_name in field_names:
+                found, cached = self.cache.get((entity_type, entity_id, field_name, language))
+                if not found:
+                    missing.append((entity_id, field_name))
+                elif cached:
+                    translations[(entity_id, field_name)] = cached
+        if not missing:
+            return translations
+
+        try:
+            conn = get_db_connection(self.db_path)
+            rows = conn.execute('''
+                SELECT entity_id, field_name, translated_text
+                FROM translations
+                WHERE entity_type = ? AND language = ?
+                AND entity_id IN (SELECT value FROM json_each(?))
+                AND field_name IN (SELECT value FROM json_each(?))
+            ''', (entity_type, language,
+                  json.dumps(sorted({entity_id for entity_id, _ in missing})),
+                  json.dumps(sorted({field_name for _, field_name in missing})))).fetchall()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Errore recupero cache: {e}")
+            return translations
+
+        found = {(row['entity_id'], row['field_name']): row['translated_text'] for row in rows}
+        for key in missing:
+            value = found.get(key)
+            self.cache.set((entity_type,) + key + (language,), value)
+            if value:
+                translations[key] = value
+        return translations
     
     def save_translation(self, entity_type: str, entity_id: int, field_name: str, 
                         language: str, translated_text: str, source_language: str, 
@@ -235,26 +567,69 @@ class TranslationService:
             is_original: Se è il testo originale
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_db_connection(self.db_path)
             cursor = conn.cursor()
             
-            # INSERT OR REPLACE per aggiornare traduzioni esistenti
-            cursor.execute('''
-                INSERT OR REPLACE INTO translations 
-                (entity_type, entity_id, field_name, language, translated_text, 
-                 source_language, is_original, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (entity_type, entity_id, field_name, language, translated_text, 
-                  source_language, is_original, datetime.now().isoformat()))
+            # Upsert per aggiornare traduzioni esistenti (mantiene l'id della riga,
+            # così i trigger dell'indice di ricerca vedono un UPDATE)
+            cursor.execute(TRANSLATION_UPSERT, (entity_type, entity_id, field_name, language,
+                                                translated_text, source_language, is_original,
+                                                datetime.now().isoformat()))
             
             conn.commit()
             conn.close()
+            self.cache.invalidate((entity_type, entity_id, field_name, language))
             
             logger.info(f"Traduzione salvata: {entity_type}.{entity_id}.{field_name} -> {language}")
             
         except Exception as e:
             logger.error(f"Errore salvataggio traduzione: {e}")
     
+    def save_translations(self, rows: List[Tuple], strict: bool = False):
+        """
+        Salva più traduzioni nella cache in un'unica transazione
+        
+        Args:
+            rows: Tuple (entity_type, entity_id, field_name, language,
+                  translated_text, source_language, is_original)
+            strict: Se True rilancia gli errori del database
+        """
+        if not rows:
+            return
+        
+        try:
+            now = datetime.now().isoformat()
+            conn = get_db_connection(self.db_path)
+            conn.executemany(TRANSLATION_UPSERT, [tuple(row) + (now,) for row in rows])
+            conn.commit()
+            conn.close()
+            for row in rows:
+                self.cache.invalidate(tuple(row[:4]))
+            
+            logger.info(f"Salvate {len(rows)} traduzioni")
+            
+        except Exception as e:
+            logger.error(f"Errore salvataggio traduzioni: {e}")
+            if strict:
+                raise
+    
+    def delete_entity_translations(self, entity_type: str, entity_id: int):
+        """
+        Elimina tutte le traduzioni di un'entità (es. dopo una modifica del testo)
+        
+        Args:
+            entity_type: Tipo entità (news/mission/children/user)
+            entity_id: ID dell'entità
+        """
+        conn = get_db_connection(self.db_path)
+        conn.execute('''
+            DELETE FROM translations 
+            WHERE entity_type = ? AND entity_id = ?
+        ''', (entity_type, entity_id))
+        conn.commit()
+        conn.close()
+        self.cache.invalidate_entity(entity_type, entity_id)
+    
     def get_field_translation(self, entity_type: str, entity_id: int, 
                             field_name: str, target_language: str, 
                             original_text: str, source_language: str = 'en') -> str:
@@ -317,7 +692,110 @@ class TranslationService:
         
         return translated_text
     
-    def pre_translate_entity(self, entity_type: str, entity_id: int, data: Dict[str, str], source_language: str):
+    def get_field_translations_batch(self, items: List[Dict], target_language: str) -> List[Dict]:
+        """
+        Traduce molti campi in una sola chiamata
+        
+        I risultati in cache vengono letti con un'unica query; solo i campi mancanti
+        vengono tradotti (raggruppati per lingua sorgente) e salvati in una transazione.
+        
+        Args:
+            items: Dizionari con entity_type, entity_id, field_name e (opzionale) original_text
+            target_language: Lingua desiderata
+            
+        Returns:
+            Lista (nello stesso ordine di items) di dizionari con entity_type, entity_id,
+            field_name, translated_text e cached
+        """
+        results = [{
+            'entity_type': item.get('entity_type'),
+            'entity_id': item.get('entity_id'),
+            'field_name': item.get('field_name'),
+            'translated_text': item.get('original_text') or '',
+            'cached': False
+        } for item in items]
+        
+        keys = {
+            (r['entity_type'], r['entity_id'], r['field_name'])
+            for r in results
+            if r['field_name'] in self.SUPPORTED_FIELDS.get(r['entity_type'], [])
+        }
+        if not keys:
+            return results
+        
+        # Una sola query per tutte le chiavi: traduzioni nella lingua target e originali
+        conn = get_db_connection(self.db_path)
+        rows = conn.execute('''
+            SELECT t.entity_type, t.entity_id, t.field_name, t.language, t.translated_text, t.is_original
+            FROM json_each(?) k
+            JOIN translations t
+              ON t.entity_type = json_extract(k.value, '$[0]')
+             AND t.entity_id = json_extract(k.value, '$[1]')
+             AND t.field_name = json_extract(k.value, '$[2]')
+            WHERE t.language = ? OR t.is_original = 1
+        ''', (json.dumps([list(key) for key in keys]), target_language)).fetchall()
+        
+        # Per gli utenti la lingua sorgente è la ui_language
+        user_ids = [key[1] for key in keys if key[0] == 'user']
+        user_languages = {}
+        if user_ids:
+            user_languages = dict(conn.execute('''
+                SELECT id, ui_language FROM users WHERE id IN (SELECT value FROM json_each(?))
+            ''', (json.dumps(user_ids),)).fetchall())
+        conn.close()
+        
+        cached = {}
+        originals = {}
+        for row in rows:
+            key = (row['entity_type'], row['entity_id'], row['field_name'])
+            if row['language'] == target_language:
+                cached[key] = row['translated_text']
+            if row['is_original']:
+                originals[key] = (row['language'], row['translated_text'])
+        
+        # Campi mancanti raggruppati per lingua sorgente
+        misses: Dict[str, Dict[Tuple, str]] = {}
+        for result in results:
+            key = (result['entity_type'], result['entity_id'], result['field_name'])
+            if key not in keys:
+                continue
+            if key in cached:
+                result['translated_text'] = cached[key]
+                result['cached'] = True
+                continue
+            
+            original_language, original_text = originals.get(key, (None, None))
+            if key[0] == 'user':
+                source_language = user_languages.get(key[1]) or 'en'
+            else:
+                source_language = original_language or 'en'
+            text = result['translated_text'] or original_text
+            if text:
+                misses.setdefault(source_language, {})[key] = text
+        
+        translated = {}
+        to_save = []
+        for source_language, texts in misses.items():
+            keys_in_group = list(texts)
+            batch = self.translate_batch([texts[key] for key in keys_in_group], target_language, source_language)
+            for key, translated_text in zip(keys_in_group, batch):
+                text = texts[key]
+                translated[key] = translated_text
+                if key not in originals:
+                    to_save.append(key + (source_language, text, source_language, True))
+                to_save.append(key + (target_language, translated[key], source_language, False))
+        self.save_translations(to_save)
+        
+        for result in results:
+            key = (result['entity_type'], result['entity_id'], result['field_name'])
+            if key in translated:
+                result['translated_text'] = translated[key]
+        
+        logger.info(f"Batch traduzioni -> {target_language}: {len(cached)} in cache, {len(translated)} tradotte")
+        return results
+    
+    def pre_translate_entity(self, entity_type: str, entity_id: int, data: Dict[str, str], source_language: str,
+                             strict: bool = False):
         """
         Pre-traduce tutti i campi supportati di un'entità all'inserimento
         
@@ -326,32 +804,37 @@ class TranslationService:
             entity_id: ID dell'entità
             data: Dizionario con i dati dell'entità
             source_language: Lingua sorgente (lingua UI quando creato il contenuto)
+            strict: Se True un errore di traduzione interrompe la pre-traduzione (usato dalla coda per i retry)
         """
         if entity_type not in self.SUPPORTED_FIELDS:
             return
         
-        supported_fields = self.SUPPORTED_FIELDS[entity_type]
-        
-        for field_name in supported_fields:
-            if field_name in data and data[field_name]:
-                original_text = data[field_name]
-                
-                # Salva originale
-                self.save_translation(
-                    entity_type, entity_id, field_name, source_language,
-                    original_text, source_language, is_original=True
-                )
-                
-                # Pre-genera traduzioni per le altre lingue
-                for target_lang in self.SUPPORTED_LANGUAGES.keys():
-                    if target_lang != source_language:
-                        translated = self.translate_text(original_text, target_lang, source_language)
-                        self.save_translation(
-                            entity_type, entity_id, field_name, target_lang,
-                            translated, source_language, is_original=False
-                        )
-                
-                logger.info(f"Pre-traduzione completata per {entity_type}.{entity_id}.{field_name}")
+        fields = [field_name for field_name in self.SUPPORTED_FIELDS[entity_type]
+                  if field_name in data and data[field_name]]
+        if not fields:
+            return
+        
+        # Originali
+        rows = [
+            (entity_type, entity_id, field_name, source_language, data[field_name], source_language, True)
+            for field_name in fields
+        ]
+        
+        # Pre-genera traduzioni per le altre lingue in parallelo: un batch con tutti i campi per lingua
+        texts = [data[field_name] for field_name in fields]
+        futures = {
+            target_lang: self._fanout_executor.submit(self.translate_batch, texts, target_lang, source_language, strict)
+            for target_lang in self.SUPPORTED_LANGUAGES.keys()
+            if target_lang != source_language
+        }
+        for target_lang, future in futures.items():
+            for field_name, translated in zip(fields, future.result()):
+                rows.append((entity_type, entity_id, field_name, target_lang, translated, source_language, False))
+        
+        # Scrive originali e traduzioni in un'unica transazione
+        self.save_translations(rows, strict=strict)
+        
+        logger.info(f"Pre-traduzione completata per {entity_type}.{entity_id} ({', '.join(fields)})")
     
     def get_translation_stats(self) -> Dict:
         """
@@ -361,7 +844,7 @@ class TranslationService:
             Dizionario con statistiche
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_db_connection(self.db_path)
             cursor = conn.cursor()
             
             # Conteggi per entità
@@ -386,12 +869,21 @@ class TranslationService:
             cursor.execute('SELECT COUNT(*) FROM translations')
             total_translations = cursor.fetchone()[0]
             
+            cursor.execute('SELECT COUNT(*) FROM translation_memory')
+            memory_entries = cursor.fetchone()[0]
+            
             conn.close()
             
             return {
                 'total_translations': total_translations,
                 'by_entity': entity_counts,
-                'by_language': language_counts
+                'by_language': language_counts,
+                'cache': self.cache.stats(),
+                'translation_memory': {
+                    'entries': memory_entries,
+                    'hits': self.memory_hits,
+                    'misses': self.memory_misses
+                }
             }
             
         except Exception as e:
@@ -402,7 +894,7 @@ class TranslationService:
 # Factory function per creare istanza singleton
 _translation_service_instance = None
 
-def get_translation_service(db_path: str = 'kuttiapp.db') -> TranslationService:
+def get_translation_service(db_path: Optional[str] = None) -> TranslationService:
     """
     Factory function per ottenere istanza singleton del servizio di traduzione
     
@@ -431,6 +923,13 @@ def translate_field(entity_type: str, entity_id: int, field_name: str,
         entity_type, entity_id, field_name, target_language, original_text, source_language
     )
 
+def translate_fields_batch(items: List[Dict], target_language: str) -> List[Dict]:
+    """
+    Funzione di utilità per tradurre molti campi in una sola chiamata
+    """
+    service = get_translation_service()
+    return service.get_field_translations_batch(items, target_language)
+
 def pre_translate_all_fields(entity_type: str, entity_id: int, data: Dict[str, str], source_language: str):
     """
     Funzione di utilità per pre-tradurre tutti i campi di un'entità
@@ -0,0 +1,247 @@
+"""
+KUTTIAPP - Resumable Uploads
+Chunked upload sessions for large files (init / append / finalize)
+
+A client opens a session, then sends the file in chunks, each one at an explicit
+byte offset. Chunks are streamed straight to a partial file with a bounded
+buffer, so neither the request size limit nor memory limit the file size.
+After a dropped connection the client asks for the current offset and resumes
+from there. On finalize the whole file is checked against the client's SHA-256
+and moved into the media store.
+
+- Sessions are stored in the upload_sessions table, partial files under uploads/.partial
+- The partial file size is the source of truth for the offset
+- Sessions idle for more than UPLOAD_SESSION_TTL_HOURS are removed
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import BinaryIO, Dict, Optional, Tuple
+
+from config import Config
+from media import file_sha256
+from media_store import COPY_BUFFER_SIZE, MediaStore, get_media_store
+from migrations import ensure_schema
+from models import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+PARTIAL_DIR = '.partial'
+
+
+class UploadSessionError(ValueError):
+    """Invalid operation on an upload session; status is the HTTP status to answer with"""
+
+    def __init__(self, message: str, status: int = 400, offset: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+class UploadSessions:
+    """
+    Resumable upload sessions backed by SQLite and partial files on disk
+    """
+
+    def __init__(self, db_path: Optional[str] = None, store: Optional[MediaStore] = None,
+                 max_size: int = Config.UPLOAD_MAX_SIZE,
+                 ttl_hours: float = Config.UPLOAD_SESSION_TTL_HOURS):
+        self.db_path = db_path or Config.DATABASE_PATH
+        self.store = store or get_media_store()
+        self.partial_folder = os.path.join(self.store.upload_folder, PARTIAL_DIR)
+        self.max_size = max_size
+        self.ttl_hours = ttl_hours
+
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+        ensure_schema(self.db_path)
+
+    def _partial_path(self, upload_id: str) -> str:
+        return os.path.join(self.partial_folder, upload_id)
+
+    def _lock(self, upload_id: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(upload_id, threading.Lock())
+
+    def create(self, filename: str, total_size: Optional[int] = None) -> Dict:
+        """
+        Open a new upload session
+
+        Args:
+            filename: Original file name (already sanitized by the caller)
+            total_size: Expected size in bytes, checked on finalize when given
+        """
+        if total_size is not None and (total_size < 0 or total_size > self.max_size):
+            raise UploadSessionError(f'File too large. Maximum size is {self.max_size // (1024 * 1024)}MB', 413)
+
+        self.expire_stale()
+
+        upload_id = uuid.uuid4().hex
+        now = datetime.now().isoformat()
+        os.makedirs(self.partial_folder, exist_ok=True)
+        open(self._partial_path(upload_id), 'wb').close()
+
+        conn = get_db_connection(self.db_path)
+        conn.execute('''
+            INSERT INTO upload_sessions (id, filename, total_size, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (upload_id, filename, total_size, now, now))
+        conn.commit()
+        conn.close()
+
+        logger.info(f"Upload session {upload_id} opened for {filename}")
+        return self.get(upload_id)
+
+    def get(self, upload_id: str) -> Optional[Dict]:
+        """
+        Return the session with its current offset, or None if it does not exist
+        """
+        conn = get_db_connection(self.db_path)
+        row = conn.execute('SELECT * FROM upload_sessions WHERE id = ?', (upload_id,)).fetchone()
+        conn.close()
+        if row is None:
+            return None
+        session = dict(row)
+        try:
+            session['offset'] = os.path.getsize(self._partial_path(upload_id))
+        except OSError:
+            return None
+        return session
+
+    def _require(self, upload_id: str) -> Dict:
+        session = self.get(upload_id)
+        if session is None:
+            raise UploadSessionError('Upload session not found', 404)
+        return session
+
+    def append(self, upload_id: str, offset: int, stream: BinaryIO, checksum: Optional[str] = None) -> int:
+        """
+        Write one chunk at offset and return the new offset
+
+        The chunk is read from stream with a bounded buffer. If checksum (hex SHA-256
+        of the chunk) is given and does not match, or the stream breaks, the chunk
+        is discarded and the offset stays where it was.
+
+        Raises:
+            UploadSessionError: unknown session (404), wrong offset (409), too large (413)
+                or checksum mismatch (400)
+        """
+        with self._lock(upload_id):
+            session = self._require(upload_id)
+            if offset != session['offset']:
+                raise UploadSessionError(f"Expected offset {session['offset']}", 409, session['offset'])
+
+            limit = session['total_size'] if session['total_size'] is not None else self.max_size
+            digest = hashlib.sha256()
+            written = 0
+            path = self._partial_path(upload_id)
+            with open(path, 'r+b') as partial:
+                partial.seek(offset)
+                try:
+                    for block in iter(lambda: stream.read(COPY_BUFFER_SIZE), b''):
+                        written += len(block)
+                        if offset + written > limit:
+                            raise UploadSessionError(f'Upload exceeds the declared size of {limit} bytes', 413, offset)
+                        digest.update(block)
+                        partial.write(block)
+                    if checksum and digest.hexdigest() != checksum.lower():
+                        raise UploadSessionError('Chunk checksum mismatch', 400, offset)
+                except Exception:
+                    partial.truncate(offset)
+                    raise
+
+            conn = get_db_connection(self.db_path)
+            conn.execute('UPDATE upload_sessions SET updated_at = ? WHERE id = ?',
+                         (datetime.now().isoformat(), upload_id))
+            conn.commit()
+            conn.close()
+            return offset + written
+
+    def finalize(self, upload_id: str, stored_name: str, sha256: Optional[str] = None) -> Tuple[str, bool, int]:
+        """
+        Verify the complete file and move it into the media store under stored_name
+
+        Returns:
+            (blob_hash, deduplicated, size)
+
+        Raises:
+            UploadSessionError: unknown session (404), incomplete upload (409) or checksum mismatch (400)
+        """
+        with self._lock(upload_id):
+            session = self._require(upload_id)
+            size = session['offset']
+            if session['total_size'] is not None and size != session['total_size']:
+                raise UploadSessionError(f"Upload incomplete: {size} of {session['total_size']} bytes", 409, size)
+
+            path = self._partial_path(upload_id)
+            blob_hash = file_sha256(path)
+            if sha256 and blob_hash != sha256.lower():
+                raise UploadSessionError('File checksum mismatch', 400, size)
+
+            _, deduplicated = self.store.put_file(path, stored_name, blob_hash, size)
+            self._delete(upload_id)
+
+        with self._locks_guard:
+            self._locks.pop(upload_id, None)
+        logger.info(f"Upload session {upload_id} finalized as {stored_name} ({size} bytes)")
+        return blob_hash, deduplicated, size
+
+    def abort(self, upload_id: str) -> bool:
+        """
+        Drop a session and its partial file
+        """
+        with self._lock(upload_id):
+            if self.get(upload_id) is None:
+                return False
+            self._delete(upload_id)
+        with self._locks_guard:
+            self._locks.pop(upload_id, None)
+        return True
+
+    def expire_stale(self) -> int:
+        """
+        Remove sessions idle for longer than the TTL
+        """
+        cutoff = (datetime.now() - timedelta(hours=self.ttl_hours)).isoformat()
+        conn = get_db_connection(self.db_path)
+        stale = [row['id'] for row in conn.execute(
+            'SELECT id FROM upload_sessions WHERE updated_at < ?', (cutoff,)
+        ).fetchall()]
+        conn.close()
+        for upload_id in stale:
+            self._delete(upload_id)
+        if stale:
+            logger.info(f"Removed {len(stale)} stale upload sessions")
+        return len(stale)
+
+    def _delete(self, upload_id: str):
+        try:
+            os.remove(self._partial_path(upload_id))
+        except FileNotFoundError:
+            pass
+        conn = get_db_connection(self.db_path)
+        conn.execute('DELETE FROM upload_sessions WHERE id = ?', (upload_id,))
+        conn.commit()
+        conn.close()
+
+
+# Singleton shared by the whole process
+_upload_sessions_instance = None
+_upload_sessions_lock = threading.Lock()
+
+def get_upload_sessions() -> UploadSessions:
+    """
+    Return the process-wide upload session manager
+    """
+    global _upload_sessions_instance
+
+    with _upload_sessions_lock:
+        if _upload_sessions_instance is None:
+            _upload_sessions_instance = UploadSessions()
+
+    return _upload_sessions_instance
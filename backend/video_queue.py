@@ -0,0 +1,279 @@
+"""
+KUTTIAPP - Video Processing Queue
+Background transcoding of uploaded videos and poster-frame extraction
+
+Uploaded videos (avi, mov, mkv, large mp4...) are converted by a small pool of
+worker threads into a web-friendly rendition and a poster JPEG:
+
+- H.264/AAC MP4 with +faststart, height capped at VIDEO_MAX_HEIGHT and bitrate
+  capped at VIDEO_MAX_BITRATE_KBPS, so any browser can stream it
+- A JPEG frame taken one second in (or the first frame for very short clips)
+
+Both files go into the media store, and every news_media row with the same
+media_path gets web_path and poster_path, so the news feed can reference the
+light rendition. The only external dependency is a local ffmpeg binary
+(VIDEO_FFMPEG_PATH); without it jobs stay pending and the originals are served.
+
+Jobs are stored in the video_jobs table and retried with exponential backoff
+by the same JobQueue base as the translation queue.
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config import Config
+from job_queue import JobQueue
+from media_store import get_media_store
+from models import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = {'mp4', 'avi', 'mov', 'mkv', 'webm'}
+
+
+def is_video(filename: str) -> bool:
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in VIDEO_EXTENSIONS
+
+
+def ffmpeg_available() -> bool:
+    return shutil.which(Config.VIDEO_FFMPEG_PATH) is not None
+
+
+def _run_ffmpeg(args):
+    result = subprocess.run(
+        [Config.VIDEO_FFMPEG_PATH, '-hide_banner', '-loglevel', 'error', '-y'] + args,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        timeout=Config.VIDEO_TRANSCODE_TIMEOUT_SECONDS
+    )
+    if result.returncode != 0:
+        message = result.stderr.decode('utf-8', 'replace').strip().splitlines()
+        raise RuntimeError(f"ffmpeg failed: {message[-1] if message else result.returncode}")
+
+
+def transcode_video(source: str, target: str):
+    """
+    Write a bitrate-capped H.264/AAC MP4 rendition of source to target
+    """
+    max_height = Config.VIDEO_MAX_HEIGHT
+    bitrate = Config.VIDEO_MAX_BITRATE_KBPS
+    _run_ffmpeg([
+        '-i', source,
+        '-map', '0:v:0', '-map', '0:a:0?',
+        '-vf', f"scale=-2:'min({max_height},ih)'",
+        '-c:v', 'libx264', '-preset', 'veryfast', '-profile:v', 'main', '-pix_fmt', 'yuv420p',
+        '-crf', '26', '-maxrate', f'{bitrate}k', '-bufsize', f'{2 * bitrate}k',
+        '-c:a', 'aac', '-b:a', '96k', '-ac', '2',
+        '-movflags', '+faststart',
+        '-f', 'mp4', target
+    ])
+
+
+def extract_poster(source: str, target: str):
+    """
+    Write a JPEG poster frame of source to target
+    """
+    scale = f"scale=-2:'min({Config.VIDEO_MAX_HEIGHT},ih)'"
+    try:
+        _run_ffmpeg(['-ss', '1', '-i', source, '-frames:v', '1', '-vf', scale, '-q:v', '3', '-f', 'mjpeg', target])
+        if os.path.getsize(target) > 0:
+            return
+    except RuntimeError:
+        pass
+    # Clips shorter than a second: take the first frame
+    _run_ffmpeg(['-i', source, '-frames:v', '1', '-vf', scale, '-q:v', '3', '-f', 'mjpeg', target])
+
+
+class VideoQueue(JobQueue):
+    """
+    Durable queue of video transcoding jobs (video_jobs table)
+    """
+
+    table = 'video_jobs'
+    name = 'video'
+    STATUSES = ('pending', 'running', 'done', 'failed')
+
+    def __init__(self, db_path: Optional[str] = None, workers: int = Config.VIDEO_WORKERS,
+                 max_attempts: int = Config.VIDEO_MAX_ATTEMPTS,
+                 retry_base_seconds: float = Config.VIDEO_RETRY_BASE_SECONDS,
+                 poll_interval: float = 5.0):
+        super().__init__(db_path or Config.DATABASE_PATH, workers, max_attempts, retry_base_seconds, poll_interval)
+
+    def enqueue(self, media_path: str) -> Optional[int]:
+        """
+        Queue the processing of an uploaded video (once per file)
+
+        If the file was already processed, its renditions are applied right away
+        to the news_media rows that reference it.
+
+        Returns:
+            ID of the job, or None if media_path is not a video
+        """
+        if not is_video(media_path):
+            return None
+        now = datetime.now().isoformat()
+
+        conn = get_db_connection(self.db_path)
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            job = conn.execute('SELECT * FROM video_jobs WHERE media_path = ?', (media_path,)).fetchone()
+            if job is None:
+                cursor = conn.execute('''
+                    INSERT INTO video_jobs (media_path, status, run_after, created_at, updated_at)
+                    VALUES (?, 'pending', ?, ?, ?)
+                ''', (media_path, now, now, now))
+                job_id = cursor.lastrowid
+            else:
+                job_id = job['id']
+                if job['status'] == 'done':
+                    self._apply_renditions(conn, media_path, job['web_path'], job['poster_path'])
+            conn.commit()
+        finally:
+            conn.close()
+
+        if job is None:
+            logger.info(f"Video job {job_id} queued for {media_path}")
+            self._wake_worker()
+        return job_id
+
+    def can_start(self) -> bool:
+        # Without ffmpeg no worker is started and jobs wait in 'pending'
+        if not ffmpeg_available():
+            logger.warning(f"ffmpeg not found ({Config.VIDEO_FFMPEG_PATH}): video jobs stay pending")
+            return False
+        return True
+
+    def process_job(self, job: Dict):
+        web_path, poster_path = self._process(job['media_path'])
+        conn = get_db_connection(self.db_path)
+        conn.execute('''
+            UPDATE video_jobs
+            SET status = 'done', last_error = NULL, web_path = ?, poster_path = ?, updated_at = ?
+            WHERE id = ?
+        ''', (web_path, poster_path, datetime.now().isoformat(), job['id']))
+        self._apply_renditions(conn, job['media_path'], web_path, poster_path)
+        conn.commit()
+        conn.close()
+        logger.info(f"Video job {job['id']} completed: {web_path}, {poster_path}")
+
+    def _process(self, media_path: str):
+        """
+        Transcode media_path and extract its poster; returns the stored file names
+        """
+        store = get_media_store()
+        stored = store.resolve(media_path)
+        if stored is None:
+            raise FileNotFoundError(f"Video {media_path} not found")
+        source = stored[0]
+
+        stem = media_path.rsplit('.', 1)[0]
+        web_path = f"{stem}_web_{uuid.uuid4().hex[:8]}.mp4"
+        poster_path = f"{stem}_poster_{uuid.uuid4().hex[:8]}.jpg"
+
+        with tempfile.TemporaryDirectory(dir=store.blobs_folder if os.path.isdir(store.blobs_folder) else None) as tmp_dir:
+            web_file = os.path.join(tmp_dir, 'web.mp4')
+            poster_file = os.path.join(tmp_dir, 'poster.jpg')
+            transcode_video(source, web_file)
+            extract_poster(web_file, poster_file)
+            store.put_file(web_file, web_path)
+            try:
+                store.put_file(poster_file, poster_path)
+            except Exception:
+                # No job row points at the rendition yet: release it, or every
+                # retry would leave another orphaned copy in the store
+                store.release(web_path)
+                raise
+        return web_path, poster_path
+
+    def release_renditions(self, media_path: str) -> bool:
+        """
+        Drop the renditions of a video that no news_media row references any more
+        """
+        conn = get_db_connection(self.db_path)
+        try:
+            if conn.execute('SELECT 1 FROM news_media WHERE media_path = ?', (media_path,)).fetchone():
+                return False
+            job = conn.execute('SELECT * FROM video_jobs WHERE media_path = ?', (media_path,)).fetchone()
+            if job is None or job['status'] == 'running':
+                return False
+            conn.execute('DELETE FROM video_jobs WHERE id = ?', (job['id'],))
+            conn.commit()
+        finally:
+            conn.close()
+
+        store = get_media_store()
+        for rendition in (job['web_path'], job['poster_path']):
+            if rendition:
+                store.release(rendition)
+        return True
+
+    # Jobs whose video no news_media row references any more; running jobs are left alone
+    UNREFERENCED_JOBS = '''
+        SELECT * FROM video_jobs j
+        WHERE j.status != 'running'
+        AND NOT EXISTS (SELECT 1 FROM news_media m WHERE m.media_path = j.media_path)
+        ORDER BY j.id
+    '''
+
+    def unreferenced_jobs(self) -> List[Dict]:
+        """
+        Jobs of videos that were removed from every news item
+        """
+        conn = get_db_connection(self.db_path)
+        rows = conn.execute(self.UNREFERENCED_JOBS).fetchall()
+        conn.close()
+        return [dict(row) for row in rows]
+
+    def drop_unreferenced_jobs(self) -> int:
+        """
+        Delete the jobs of videos that were removed from every news item
+
+        Used by the orphaned-files cleanup, which releases their renditions: without
+        the job row, enqueueing the same media_path again cannot copy the released
+        names back into news_media. Returns the number of deleted jobs.
+        """
+        conn = get_db_connection(self.db_path)
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            jobs = conn.execute(self.UNREFERENCED_JOBS).fetchall()
+            conn.executemany('DELETE FROM video_jobs WHERE id = ?', [(job['id'],) for job in jobs])
+            conn.commit()
+        finally:
+            conn.close()
+        return len(jobs)
+
+    @staticmethod
+    def _apply_renditions(conn, media_path: str, web_path: str, poster_path: str):
+        conn.execute('''
+            UPDATE news_media SET web_path = ?, poster_path = ? WHERE media_path = ?
+        ''', (web_path, poster_path, media_path))
+
+
+# Singleton shared by the whole process
+_video_queue_instance = None
+_video_queue_lock = threading.Lock()
+
+def get_video_queue() -> VideoQueue:
+    """
+    Return the process-wide video queue
+    """
+    global _video_queue_instance
+
+    with _video_queue_lock:
+        if _video_queue_instance is None:
+            _video_queue_instance = VideoQueue()
+
+    return _video_queue_instance
+
+
+def enqueue_video(media_path: str) -> Optional[int]:
+    """
+    Utility function: queue transcoding and poster extraction of an uploaded video
+    """
+    return get_video_queue().enqueue(media_path)
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useTranslation } from 'react-i18next';
 import DynamicForm from './DynamicForm';
-import { api } from '../utils/api';
+import { api, getLookups, lookupOptions } from '../utils/api';
 
 /**
  * CreateRecordForm - A DRY reusable component for creating new records in any database table
@@ -228,28 +228,18 @@ const CreateRecordForm = ({
 
       // Load different options based on table type
       switch (tableName) {
-        case 'news':
-          const [childrenRes, missionsRes] = await Promise.all([
-            api.get('/children?user_role=admin'),
-            api.get('/missions')
-          ]);
-          options.children = childrenRes.data.map(child => ({
-            value: child.id,
-            label: child.name
-          }));
-          options.missions = missionsRes.data.map(mission => ({
-            value: mission.id,
-            label: mission.name
-          }));
+        case 'news': {
+          const { data } = await getLookups();
+          options.children = lookupOptions(data.children);
+          options.missions = lookupOptions(data.missions);
           break;
+        }
 
-        case 'children':
-          const missionsResponse = await api.get('/missions');
-          options.missions = missionsResponse.data.map(mission => ({
-            value: mission.id,
-            label: mission.name
-          }));
+        case 'children': {
+          const { data } = await getLookups();
+          options.missions = lookupOptions(data.missions);
           break;
+        }
 
         case 'users':
           // Users typically don't need dropdown options, but can be extended
@@ -1,9 +1,11 @@
 import React, { useState, useRef } from 'react';
 import { useTranslation } from 'react-i18next';
 import { useTheme } from '../contexts/ThemeContext';
-import { api } from '../utils/api';
+import { api, uploadFileResumable } from '../utils/api';
 import { PlusIcon, XMarkIcon, PhotoIcon, VideoCameraIcon, ArrowUpIcon, ArrowDownIcon } from '@heroicons/react/24/outline';
 
+const RESUMABLE_UPLOAD_THRESHOLD = 5 * 1024 * 1024;
+
 export default function MediaUploadField({ 
   value = [], 
   onChange, 
@@ -34,15 +36,21 @@ export default function MediaUploadField({
       const uploadPromises = filesToProcess.map(async (file) => {
         console.log('Uploading file:', file.name, 'Size:', file.size, 'Type:', file.type);
         
-        const formData = new FormData();
-        formData.append('file', file);
-        
-        const response = await api.post('/upload', formData, {
-          headers: {
-            'Content-Type': 'multipart/form-data',
-          },
-          timeout: 60000, // 60 second timeout for large files
-        });
+        let response;
+        if (file.size > RESUMABLE_UPLOAD_THRESHOLD) {
+          // Large files (videos) go in resumable chunks
+          response = await uploadFileResumable(file);
+        } else {
+          const formData = new FormData();
+          formData.append('file', file);
+          
+          response = await api.post('/upload', formData, {
+            headers: {
+              'Content-Type': 'multipart/form-data',
+            },
+            timeout: 60000, // 60 second timeout for large files
+          });
+        }
 
         const fileType = file.type.startsWith('video/') ? 'video' : 'photo';
         console.log('Upload successful:', response.data);
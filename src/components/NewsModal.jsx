@@ -152,7 +152,8 @@ export default function NewsModal({ news, isOpen, onClose }) {
                         />
                       ) : (
                         <video
-                          src={`http://localhost:5001/uploads/${currentMedia.media_path}`}
+                          src={`http://localhost:5001/uploads/${currentMedia.web_path || currentMedia.media_path}`}
+                          poster={currentMedia.poster_path ? `http://localhost:5001/uploads/${currentMedia.poster_path}?w=640` : undefined}
                           controls
                           className="w-full h-auto max-h-96"
                           preload="metadata"
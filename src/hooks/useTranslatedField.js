@@ -13,7 +13,7 @@
 
 import { useState, useEffect } from 'react';
 import { useTranslation } from 'react-i18next';
-import { translateField } from '../utils/api';
+import { translateFieldBatched } from '../utils/api';
 
 /**
  * Hook per gestire la traduzione automatica di un campo
@@ -59,7 +59,7 @@ export const useTranslatedField = (
       });
       
       try {
-        const response = await translateField({
+        const response = await translateFieldBatched({
           entity_type: entityType,
           entity_id: entityId,
           field_name: fieldName,
@@ -29,7 +29,6 @@ export default function ChildDetail() {
   const { isDark } = useTheme();
   const { user } = useSelector(state => state.auth);
   const [child, setChild] = useState(null);
-  const [allChildren, setAllChildren] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [fullscreenPhoto, setFullscreenPhoto] = useState(null);
@@ -85,24 +84,16 @@ export default function ChildDetail() {
   }, [child, translatedDescription, i18n.language]);
 
   useEffect(() => {
-    const fetchChildrenData = async () => {
+    const fetchChild = async () => {
       try {
         setLoading(true);
-        // Get all children to enable carousel navigation
-        const response = await api.get('/children');
-        const children = response.data;
-        setAllChildren(children);
-        
-        const childItem = children.find(item => item.id === parseInt(id));
-        
-        if (!childItem) {
-          setError('Child not found');
-          return;
-        }
-        
-        setChild(childItem);
+        setError(null);
+        // Single child with mission, referent, sponsor, media and previous/next ids
+        const response = await api.get(`/children/${id}`);
+        setChild(response.data);
       } catch (err) {
-        setError('Failed to load child information');
+        // 404 responses carry { error: 'Child not found' }
+        setError(err?.error === 'Child not found' ? err.error : 'Failed to load child information');
         console.error('Error fetching child:', err);
       } finally {
         setLoading(false);
@@ -110,14 +101,13 @@ export default function ChildDetail() {
     };
 
     if (id) {
-      fetchChildrenData();
+      fetchChild();
     }
   }, [id]);
 
-  // Get current child index for carousel navigation
-  const currentChildIndex = allChildren.findIndex(c => c.id === parseInt(id));
-  const previousChild = currentChildIndex > 0 ? allChildren[currentChildIndex - 1] : null;
-  const nextChild = currentChildIndex < allChildren.length - 1 ? allChildren[currentChildIndex + 1] : null;
+  // Neighbouring children for carousel navigation, resolved by the backend
+  const previousChildId = child?.previous_id ?? null;
+  const nextChildId = child?.next_id ?? null;
 
   // Handle carousel navigation
   const navigateToChild = (childId) => {
@@ -218,9 +208,9 @@ export default function ChildDetail() {
 
           {/* Child Navigation Carousel */}
           <div className="flex items-center space-x-4">
-            {previousChild && (
+            {previousChildId && (
               <button
-                onClick={() => navigateToChild(previousChild.id)}
+                onClick={() => navigateToChild(previousChildId)}
                 className={`flex items-center px-4 py-2 rounded-lg transition-colors ${
                   isDark 
                     ? 'bg-gray-800 hover:bg-gray-700 text-white' 
@@ -232,14 +222,10 @@ export default function ChildDetail() {
                 <span className="text-sm">{t('children.previousChild')}</span>
               </button>
             )}
-            
-            <span className={`text-sm ${isDark ? 'text-gray-400' : 'text-gray-600'}`}>
-              {currentChildIndex + 1} {t('pagination.of')} {allChildren.length}
-            </span>
 
-            {nextChild && (
+            {nextChildId && (
               <button
-                onClick={() => navigateToChild(nextChild.id)}
+                onClick={() => navigateToChild(nextChildId)}
                 className={`flex items-center px-4 py-2 rounded-lg transition-colors ${
                   isDark 
                     ? 'bg-gray-800 hover:bg-gray-700 text-white' 
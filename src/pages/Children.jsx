@@ -3,7 +3,7 @@ import { useTranslation } from 'react-i18next';
 import i18n from '../i18n/i18n';
 import { useNavigate } from 'react-router-dom';
 import { useTheme } from '../contexts/ThemeContext';
-import { getChildren, translateField } from '../utils/api';
+import { getChildren, getLookups, lookupOptions, translateField } from '../utils/api';
 import SimpleDataTable from '../components/SimpleDataTable';
 import DynamicForm from '../components/DynamicForm';
 import CreateRecordForm from '../components/CreateRecordForm';
@@ -37,33 +37,16 @@ export default function Children({ user }) {
   useEffect(() => {
     console.log('Children component mounted with user:', user);
     fetchChildren();
-    fetchMissions();
-    fetchSponsors();
+    fetchFormOptions();
   }, [user]);
 
-  const fetchMissions = async () => {
+  const fetchFormOptions = async () => {
     try {
-      const response = await api.get('/missions');
-      setMissions(response.data.map(mission => ({
-        value: mission.id,
-        label: mission.name
-      })));
+      const { data } = await getLookups();
+      setMissions(lookupOptions(data.missions));
+      setSponsors(lookupOptions(data.users.sponsor));
     } catch (error) {
-      console.error('Error fetching missions:', error);
-    }
-  };
-
-  const fetchSponsors = async () => {
-    try {
-      const response = await api.get('/users');
-      // Filter only sponsors
-      const sponsorUsers = response.data.filter(user => user.role === 'sponsor');
-      setSponsors(sponsorUsers.map(sponsor => ({
-        value: sponsor.id,
-        label: sponsor.full_name || sponsor.username
-      })));
-    } catch (error) {
-      console.error('Error fetching sponsors:', error);
+      console.error('Error fetching form options:', error);
     }
   };
 
@@ -111,7 +111,7 @@ export default function EnhancedChildren({ user }) {
         <div className="flex items-center justify-center">
           {photo ? (
             <img
-              src={`${API_BASE}/uploads/${photo}`}
+              src={`${API_BASE}/uploads/${photo}?w=160`}
               alt={row.name}
               className="h-12 w-12 rounded-full object-cover border-2 border-gray-200 dark:border-gray-600"
               onError={(e) => {
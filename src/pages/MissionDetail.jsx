@@ -41,18 +41,12 @@ export default function MissionDetail() {
     const fetchMission = async () => {
       try {
         setLoading(true);
-        // Get single mission from list (simulate API call)
-        const response = await api.get('/missions');
-        const missionItem = response.data.find(item => item.id === parseInt(id));
-        
-        if (!missionItem) {
-          setError('Mission not found');
-          return;
-        }
-        
-        setMission(missionItem);
+        setError(null);
+        const response = await api.get(`/missions/${id}`);
+        setMission(response.data);
       } catch (err) {
-        setError('Failed to load mission');
+        // 404 responses carry { error: 'Mission not found' }
+        setError(err?.error === 'Mission not found' ? err.error : 'Failed to load mission');
         console.error('Error fetching mission:', err);
       } finally {
         setLoading(false);
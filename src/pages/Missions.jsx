@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react';
 import { useTranslation } from 'react-i18next';
 import { useNavigate } from 'react-router-dom';
 import { useTheme } from '../contexts/ThemeContext';
-import { getMissions, getChildren } from '../utils/api';
+import { getMissions, getChildren, getLookups, lookupOptions } from '../utils/api';
 import DynamicForm from '../components/DynamicForm';
 import { api } from '../utils/api';
 import { useTranslatedField } from '../hooks/useTranslatedField';
@@ -94,17 +94,9 @@ export default function Missions({ user }) {
 
   const fetchUsers = async () => {
     try {
-      const response = await api.get('/users');
-      console.log('Users response:', response.data); // Debug log
-      // Try both 'localReferent' and 'referent' since role names might vary
-      const referents = response.data.filter(user => 
-        user.role === 'localReferent' || user.role === 'referent'
-      );
-      console.log('Filtered referents:', referents); // Debug log
-      setUsers(referents.map(user => ({
-        value: user.id,
-        label: user.username
-      })));
+      const { data } = await getLookups();
+      // Missions can be assigned to referents and local referents
+      setUsers(lookupOptions([...data.users.referent, ...data.users.local_referent]));
     } catch (error) {
       console.error('Error fetching users:', error);
     }
@@ -3,7 +3,7 @@ import { useTranslation } from 'react-i18next';
 import { useTheme } from '../contexts/ThemeContext';
 import SimpleDataTable from '../components/SimpleDataTable';
 import DynamicForm from '../components/DynamicForm';
-import { api } from '../utils/api';
+import { api, getLookups, lookupOptions } from '../utils/api';
 
 export default function MissionsManagement({ user }) {
   const { t } = useTranslation();
@@ -44,17 +44,9 @@ export default function MissionsManagement({ user }) {
 
   const fetchUsers = async () => {
     try {
-      const response = await api.get('/users');
-      console.log('Users response:', response.data); // Debug log
-      // Try both 'localReferent' and 'referent' since role names might vary
-      const referents = response.data.filter(user => 
-        user.role === 'localReferent' || user.role === 'referent'
-      );
-      console.log('Filtered referents:', referents); // Debug log
-      setUsers(referents.map(user => ({
-        value: user.id,
-        label: `${user.username} (${user.email})`
-      })));
+      const { data } = await getLookups();
+      // Missions can be assigned to referents and local referents
+      setUsers(lookupOptions([...data.users.referent, ...data.users.local_referent]));
     } catch (error) {
       console.error('Error fetching users:', error);
     }
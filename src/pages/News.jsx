@@ -7,7 +7,7 @@ import SimpleDataTable from '../components/SimpleDataTable';
 import DynamicForm from '../components/DynamicForm';
 import NewsModal from '../components/NewsModal';
 import CreateRecordForm from '../components/CreateRecordForm';
-import { api } from '../utils/api';
+import { api, getLookups, lookupOptions } from '../utils/api';
 import { PlusIcon, FunnelIcon, XMarkIcon, EyeIcon, PencilIcon, TrashIcon } from '@heroicons/react/24/outline';
 
 export default function News() {
@@ -99,20 +99,9 @@ export default function News() {
 
   const fetchFormOptions = async () => {
     try {
-      const [childrenRes, missionsRes] = await Promise.all([
-        api.get('/children?user_role=admin'),
-        api.get('/missions')
-      ]);
-      
-      setChildren(childrenRes.data.map(child => ({
-        value: child.id,
-        label: child.name
-      })));
-      
-      setMissions(missionsRes.data.map(mission => ({
-        value: mission.id,
-        label: mission.name
-      })));
+      const { data } = await getLookups();
+      setChildren(lookupOptions(data.children));
+      setMissions(lookupOptions(data.missions));
     } catch (error) {
       console.error('Error fetching form options:', error);
     }
@@ -204,7 +193,7 @@ export default function News() {
             if (firstMedia.media_type === 'photo') {
               return (
                 <img
-                  src={`http://localhost:5001/uploads/${firstMedia.media_path}`}
+                  src={`http://localhost:5001/uploads/${firstMedia.media_path}?w=160`}
                   alt="News thumbnail"
                   className="h-12 w-12 object-cover rounded-lg"
                 />
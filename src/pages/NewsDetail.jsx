@@ -34,18 +34,12 @@ export default function NewsDetail() {
     const fetchNews = async () => {
       try {
         setLoading(true);
-        // Get single news item from list (simulate API call)
-        const response = await api.get('/news');
-        const newsItem = response.data.find(item => item.id === parseInt(id));
-        
-        if (!newsItem) {
-          setError('News not found');
-          return;
-        }
-        
-        setNews(newsItem);
+        setError(null);
+        const response = await api.get(`/news/${id}`);
+        setNews(response.data);
       } catch (err) {
-        setError('Failed to load news');
+        // 404 responses carry { error: 'News not found' }
+        setError(err?.error === 'News not found' ? err.error : 'Failed to load news');
         console.error('Error fetching news:', err);
       } finally {
         setLoading(false);
@@ -180,7 +174,8 @@ export default function NewsDetail() {
                     ) : (
                       <div className="relative">
                         <video 
-                          src={`/uploads/${media.media_path}`}
+                          src={`/uploads/${media.web_path || media.media_path}`}
+                          poster={media.poster_path ? `/uploads/${media.poster_path}?w=640` : undefined}
                           className="w-full h-64 object-cover rounded-lg shadow-md"
                           controls
                         />
@@ -1,4 +1,5 @@
 import axios from 'axios';
+import { createSha256 } from './sha256';
 
 const API_BASE = 'http://127.0.0.1:5001'; // Using exact IP instead of localhost
 
@@ -39,16 +40,33 @@ export function login(username, password) {
   });
 }
 
-export function getMissions() {
-  return api.get('/missions');
+export function getMissions(lang) {
+  return api.get('/missions', { params: lang ? { lang } : undefined });
 }
 
 export function getChildren(queryParams = '') {
   return api.get(`/children${queryParams}`);
 }
 
-export function getNews() {
-  return api.get('/news');
+export function getNews(lang) {
+  return api.get('/news', { params: lang ? { lang } : undefined });
+}
+
+// Reference data for form dropdowns: { version, users: { <role>: [[id, label]] },
+// missions: [[id, label]], children: [[id, label]] }. The server caches it and
+// answers revalidations with 304, so it is cheap to call on every form open.
+export function getLookups() {
+  return api.get('/lookups');
+}
+
+export function lookupOptions(pairs = []) {
+  return pairs.map(([value, label]) => ({ value, label }));
+}
+
+// Ranked full-text search over news, children and missions, in every stored
+// language. Pass the X-Next-Cursor response header as `after` for the next page.
+export function search(q, { types, lang, limit, after } = {}) {
+  return api.get('/search', { params: { q, types, lang, limit, after } });
 }
 
 // Translation API functions
@@ -64,6 +82,124 @@ export function translateField(params) {
   return api.post('/translate/field', params);
 }
 
+export function translateFieldsBatch(targetLanguage, items) {
+  return api.post('/translate/batch', {
+    target_language: targetLanguage,
+    items
+  });
+}
+
+// Field translations requested in the same tick are coalesced into
+// POST /translate/batch calls per target language, each within the server's
+// item limit (MAX_TRANSLATION_BATCH in app.py)
+const MAX_TRANSLATION_BATCH = 1000;
+const pendingFieldTranslations = new Map();
+
+export function translateFieldBatched(params) {
+  const targetLanguage = params.target_language || 'en';
+  return new Promise((resolve, reject) => {
+    if (!pendingFieldTranslations.has(targetLanguage)) {
+      pendingFieldTranslations.set(targetLanguage, []);
+      setTimeout(() => flushFieldTranslations(targetLanguage), 0);
+    }
+    pendingFieldTranslations.get(targetLanguage).push({ params, resolve, reject });
+  });
+}
+
+async function flushFieldTranslations(targetLanguage) {
+  const queued = pendingFieldTranslations.get(targetLanguage) || [];
+  pendingFieldTranslations.delete(targetLanguage);
+  const chunks = [];
+  for (let start = 0; start < queued.length; start += MAX_TRANSLATION_BATCH) {
+    chunks.push(queued.slice(start, start + MAX_TRANSLATION_BATCH));
+  }
+  await Promise.all(chunks.map(chunk => sendFieldTranslations(targetLanguage, chunk)));
+}
+
+async function sendFieldTranslations(targetLanguage, queued) {
+  try {
+    const response = await translateFieldsBatch(targetLanguage, queued.map(({ params }) => ({
+      entity_type: params.entity_type,
+      entity_id: params.entity_id,
+      field_name: params.field_name,
+      original_text: params.original_text
+    })));
+    const translations = response.data.translations || [];
+    // Resolve with the same shape as translateField() so callers are interchangeable
+    queued.forEach(({ resolve }, index) => resolve({ data: translations[index] || {} }));
+  } catch (error) {
+    queued.forEach(({ reject }) => reject(error));
+  }
+}
+
 export function getTranslationStats() {
   return api.get('/translate/stats');
 }
+
+// Resumable chunked upload for large files (videos on unstable connections).
+// Each chunk is retried from the offset the server reports, so a dropped
+// connection only costs the chunk in flight. The whole-file SHA-256 is built
+// from the chunks as the server acknowledges them and checked on finalize.
+const UPLOAD_CHUNK_RETRIES = 5;
+
+async function sha256Hex(buffer) {
+  if (!window.crypto?.subtle) return null;
+  const digest = await window.crypto.subtle.digest('SHA-256', buffer);
+  return Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('');
+}
+
+export async function uploadFileResumable(file, onProgress) {
+  const { data: session } = await api.post('/upload/sessions', { filename: file.name, size: file.size });
+  let offset = session.offset;
+  let failures = 0;
+  const fileHash = createSha256();
+  let hashed = 0; // file bytes fed to fileHash, a prefix of what the server has
+
+  // Bytes the server has but this loop did not see acknowledged (a chunk whose
+  // response was lost) are read back from the file
+  const hashUpTo = async (end) => {
+    if (end > hashed) {
+      fileHash.update(new Uint8Array(await file.slice(hashed, end).arrayBuffer()));
+      hashed = end;
+    }
+  };
+
+  while (offset < file.size) {
+    const chunk = await file.slice(offset, offset + session.chunk_size).arrayBuffer();
+    const checksum = await sha256Hex(chunk);
+    try {
+      const response = await api.put(`/upload/sessions/${session.upload_id}`, chunk, {
+        params: { offset },
+        headers: {
+          'Content-Type': 'application/octet-stream',
+          ...(checksum ? { 'X-Chunk-SHA256': checksum } : {})
+        }
+      });
+      await hashUpTo(offset);
+      const acked = response.data.offset;
+      if (acked > hashed) {
+        fileHash.update(new Uint8Array(chunk, hashed - offset, acked - hashed));
+        hashed = acked;
+      }
+      offset = acked;
+      failures = 0;
+      if (onProgress) onProgress(offset / file.size);
+    } catch (error) {
+      if (++failures > UPLOAD_CHUNK_RETRIES) throw error;
+      // Resume from what the server actually has
+      if (typeof error.offset === 'number') {
+        offset = error.offset;
+      } else {
+        await new Promise(resolve => setTimeout(resolve, 1000 * failures));
+        try {
+          offset = (await api.get(`/upload/sessions/${session.upload_id}`)).data.offset;
+        } catch {
+          // Keep the current offset and retry
+        }
+      }
+    }
+  }
+
+  await hashUpTo(file.size);
+  return api.post(`/upload/sessions/${session.upload_id}/finalize`, { sha256: fileHash.hex() });
+}